@@ -3,6 +3,7 @@
 from typing import List, Dict, Any, Optional, AsyncGenerator
 import asyncio
 from datetime import datetime
+from functools import cached_property
 
 # Keep original imports
 from .chat_agent import ChatAgent
@@ -65,27 +66,16 @@ class EnhancedChatAgent(ChatAgent):
         self.threads_enabled = enable_threads and THREADS_AVAILABLE
         
         # Memory components - always initialize if capability exists
+        # (transcript store and context manager are opened on first access)
+        self.memory_config = memory_config or {}
         if self.memory_capability:
-            self._init_memory(memory_config or {})
+            self._init_memory(self.memory_config)
             self.memory_enabled = False  # Start with memory disabled (can be toggled at runtime)
-            # Initialize transcript store
-            self.transcript_store = TranscriptStore(
-                storage_dir=(memory_config or {}).get("transcript_dir", "./data/memory/transcripts")
-            )
-            
-            # Initialize context manager
-            self.context_manager = ContextManager(
-                transcript_store=self.transcript_store,
-                episodic_store=self.episodic_memory if isinstance(self.episodic_memory, EpisodicStore) else None,
-                max_context_tokens=100000  # Conservative for Claude
-            )
         else:
             self.memory_enabled = False
             self.short_term_memory = None
             self.long_term_memory = None
             self.episodic_memory = None
-            self.transcript_store = None
-            self.context_manager = None
         
         # Workflow components
         if self.workflows_enabled:
@@ -103,6 +93,28 @@ class EnhancedChatAgent(ChatAgent):
         else:
             self.thread_manager = None
     
+    @cached_property
+    def transcript_store(self) -> Optional['TranscriptStore']:
+        """Transcript store, created once on first access"""
+        if not self.memory_capability:
+            return None
+        
+        return TranscriptStore(
+            storage_dir=self.memory_config.get("transcript_dir", "./data/memory/transcripts")
+        )
+    
+    @cached_property
+    def context_manager(self) -> Optional['ContextManager']:
+        """Context manager over the transcript and episode stores"""
+        if not self.memory_capability:
+            return None
+        
+        return ContextManager(
+            transcript_store=self.transcript_store,
+            episodic_store=self.episodic_memory if isinstance(self.episodic_memory, EpisodicStore) else None,
+            max_context_tokens=100000  # Conservative for Claude
+        )
+    
     def _init_memory(self, config: Dict[str, Any]):
         """Initialize memory components"""
         # Short-term memory
@@ -233,7 +245,7 @@ class EnhancedChatAgent(ChatAgent):
                 enhanced_message = "\n".join(context_additions) + "\n\n---\n\nUser Query: " + message
             
             # Accumulate response for memory storage
-            full_response = ""
+            response_parts = []
             
             # Override system prompt if memory is enabled
             original_prompt = None
@@ -246,7 +258,7 @@ class EnhancedChatAgent(ChatAgent):
             async for chunk in super().chat(enhanced_message, history, stream):
                 # Accumulate text chunks
                 if chunk.get("type") == "text":
-                    full_response += chunk.get("content", "")
+                    response_parts.append(chunk.get("content", ""))
                 
                 yield chunk
             
@@ -255,6 +267,7 @@ class EnhancedChatAgent(ChatAgent):
                 self.agent.agent.prompt.messages[0] = ("system", original_prompt)
             
             # Store complete conversation in memory after streaming is done
+            full_response = "".join(response_parts)
             if self.memory_enabled and use_memory and full_response:
                 self._update_memory(message, full_response)
                 
@@ -1,7 +1,7 @@
 """Simplified chat agent with core functionality only"""
 
 import os
-from typing import List, Dict, Any, Optional, AsyncGenerator
+from typing import List, Dict, Any, Optional, AsyncGenerator, Tuple
 from langchain_anthropic import ChatAnthropic
 from langchain_openai import ChatOpenAI
 from langchain_core.messages import HumanMessage, AIMessage, SystemMessage
@@ -9,6 +9,7 @@ import json
 
 from .tools.enhanced_telly_tool import get_enhanced_telly_tool
 from ..memory.transcript_store import TranscriptStore
+from ..workflows.llm_cache import LLMCache
 from ..models.schemas import Message, MessageRole
 
 
@@ -33,6 +34,53 @@ IMPORTANT: When you use the youtube_transcript tool, include the tool output in
 
 Be conversational and helpful. Use markdown formatting for clarity."""
 
+# Static summary instructions, kept apart from the video data so the prefix is
+# identical on every call and can be served from the provider's prompt cache
+SUMMARY_SYSTEM_MESSAGE = SystemMessage(
+    content="You are a helpful assistant that creates concise summaries. "
+            "Summarize the video below in 2-3 sentences."
+)
+
+# Summary saved by chat(), which stores transcripts without summarizing them
+PLACEHOLDER_SUMMARY_PREFIX = "Extracted from "
+
+# Section headers in telly tool output; generated content (tutorial guide,
+# news summary, ...) is stored as the action plan
+SECTION_MARKERS = {
+    "### 📹": "info",
+    "### 📝": "transcript",
+    "### 🎓": "action_plan",
+    "### 📰": "action_plan",
+    "### ⭐": "action_plan",
+    "### 📚": "action_plan",
+    "### 📋": "action_plan",
+}
+TITLE_PREFIX = "- **Title:** "
+
+
+def parse_tool_output(tool_result: str) -> Tuple[str, str, str]:
+    """Split telly tool output into (title, transcript, action plan) in one pass"""
+    title = "YouTube Video"
+    sections: Dict[str, List[str]] = {"transcript": [], "action_plan": []}
+    current = None
+    
+    it = enumerate(tool_result.split("\n"))
+    for i, line in it:
+        stripped = line.lstrip()
+        # Only known headers switch sections; any other "### " line is content
+        section = SECTION_MARKERS.get(stripped[:5].rstrip()) if stripped.startswith("### ") else None
+        if section:
+            current = section
+            if current == "info":
+                # Title is the first entry under the video information header
+                entry = next(it, (i + 1, ""))[1]
+                if entry.startswith(TITLE_PREFIX):
+                    title = entry[len(TITLE_PREFIX):].strip()
+        elif current in sections and stripped:
+            sections[current].append(line)
+    
+    return title, "\n".join(sections["transcript"]), "\n".join(sections["action_plan"])
+
 
 class SimpleChatAgent:
     """Simplified agent focused on core functionality"""
@@ -41,7 +89,8 @@ class SimpleChatAgent:
         self, 
         model_provider: str = "anthropic",
         model_name: Optional[str] = None,
-        enable_transcript_store: bool = True
+        enable_transcript_store: bool = True,
+        summary_similarity_threshold: Optional[float] = None
     ):
         """Initialize the simple chat agent"""
         self.model_provider = model_provider
@@ -84,6 +133,14 @@ class SimpleChatAgent:
                 )
             except Exception as e:
                 print(f"Warning: Could not initialize transcript store: {e}")
+        
+        # Summary cache; with a similarity threshold set, near-duplicate
+        # transcripts (re-uploads, reruns) also reuse a summary when the store's
+        # embedding model is available
+        embed = None
+        if self.transcript_store and summary_similarity_threshold is not None:
+            embed = self.transcript_store.long_term_memory.vector_store.embeddings.aembed_query
+        self.summary_cache = LLMCache(embed=embed, similarity_threshold=summary_similarity_threshold or 0.95)
     
     def get_features_status(self) -> Dict[str, bool]:
         """Get status of available features"""
@@ -152,27 +209,7 @@ class SimpleChatAgent:
                 if self.transcript_store:
                     try:
                         # Parse the tool result to extract info
-                        lines = tool_result.split('\n')
-                        title = "YouTube Video"
-                        transcript = ""
-                        action_plan = ""
-                        
-                        in_transcript = False
-                        in_action_plan = False
-                        
-                        for line in lines:
-                            if "**Title:**" in line:
-                                title = line.replace("**Title:**", "").strip()
-                            elif "### 📝" in line and "Transcript" in line:
-                                in_transcript = True
-                                in_action_plan = False
-                            elif "### 📋 Action Plan" in line:
-                                in_transcript = False
-                                in_action_plan = True
-                            elif in_transcript and line.strip():
-                                transcript += line + "\n"
-                            elif in_action_plan and line.strip():
-                                action_plan += line + "\n"
+                        title, transcript, action_plan = parse_tool_output(tool_result)
                         
                         # Save if we have content
                         if transcript:
@@ -181,7 +218,7 @@ class SimpleChatAgent:
                                 title=title,
                                 transcript=transcript.strip(),
                                 action_plan=action_plan.strip(),
-                                summary=f"Extracted from {youtube_url}"
+                                summary=f"{PLACEHOLDER_SUMMARY_PREFIX}{youtube_url}"
                             )
                     except Exception as e:
                         print(f"Failed to save transcript: {e}")
@@ -189,6 +226,8 @@ class SimpleChatAgent:
                 # Add tool result to context for response
                 messages.append(AIMessage(content=f"I've extracted the transcript. Here's what I found:\n\n{tool_result}"))
                 messages.append(HumanMessage(content="Based on this transcript, please provide your analysis or answer my original question."))
+            except Exception as e:
+                yield {"type": "error", "content": f"Error processing video: {str(e)}"}
         
         # Generate response
         if stream:
@@ -218,40 +257,41 @@ class SimpleChatAgent:
     async def process_youtube_video(self, url: str) -> Dict[str, Any]:
         """Simple function to process a YouTube video"""
         try:
-            # Extract transcript
-            tool_result = await self.telly_tool.arun(url)
-            
-            # Parse result
-            lines = tool_result.split('\n')
-            title = "YouTube Video"
-            transcript = ""
-            action_plan = ""
+            # Already processed - skip the tool and summary calls
+            record = None
+            if self.transcript_store:
+                record = self.transcript_store.get_transcript_by_url(url)
+                if record and not record.summary.startswith(PLACEHOLDER_SUMMARY_PREFIX):
+                    return {
+                        "success": True,
+                        "id": record.id,
+                        "title": record.title,
+                        "summary": record.summary,
+                        "has_action_plan": bool(record.action_plan),
+                        "transcript_length": len(record.transcript)
+                    }
             
-            in_transcript = False
-            in_action_plan = False
-            
-            for line in lines:
-                if "**Title:**" in line:
-                    title = line.replace("**Title:**", "").strip()
-                elif "### 📝" in line and "Transcript" in line:
-                    in_transcript = True
-                    in_action_plan = False
-                elif "### 📋 Action Plan" in line:
-                    in_transcript = False
-                    in_action_plan = True
-                elif in_transcript and line.strip():
-                    transcript += line + "\n"
-                elif in_action_plan and line.strip():
-                    action_plan += line + "\n"
+            if record:
+                # Saved from chat without a summary - reuse the transcript only
+                title, transcript, action_plan = record.title, record.transcript, record.action_plan
+            else:
+                # Extract transcript
+                tool_result = await self.telly_tool.arun(url)
+                
+                # Parse result
+                title, transcript, action_plan = parse_tool_output(tool_result)
             
             # Generate summary
-            summary_prompt = f"Summarize this video in 2-3 sentences: {title}\n\n{transcript[:500]}..."
-            messages = [
-                SystemMessage(content="You are a helpful assistant that creates concise summaries."),
-                HumanMessage(content=summary_prompt)
-            ]
-            summary_response = await self.llm.ainvoke(messages)
-            summary = summary_response.content
+            summary_input = f"{title}\n\n{transcript[:500]}..."
+            model = str(getattr(self.llm, "model", ""))
+            key = LLMCache.make_key(model, summary_input, SUMMARY_SYSTEM_MESSAGE.content)
+            scope = (model, SUMMARY_SYSTEM_MESSAGE.content)
+            summary = await self.summary_cache.get(key, summary_input, scope, similar=True)
+            if summary is None:
+                messages = [SUMMARY_SYSTEM_MESSAGE, HumanMessage(content=summary_input)]
+                summary_response = await self.llm.ainvoke(messages)
+                summary = summary_response.content
+                await self.summary_cache.set(key, summary_input, summary, scope, similar=True)
             
             # Save to store
             saved_id = None
@@ -3,6 +3,9 @@
 import sys
 import os
 import re
+import asyncio
+import typing
+from collections import OrderedDict
 from typing import Dict, Any, Optional, Tuple
 from langchain.tools import BaseTool
 from pydantic import BaseModel, Field
@@ -10,6 +13,8 @@ from langchain_anthropic import ChatAnthropic
 from langchain_openai import ChatOpenAI
 from langchain_core.messages import SystemMessage, HumanMessage
 
+from models.youtube import extract_video_id
+
 # Add the telly directory to the path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../../../../telly'))
 
@@ -20,102 +25,50 @@ except ImportError:
     TellyAgent = None
 
 
-class EnhancedTellyToolInput(BaseModel):
-    """Input for the Enhanced Telly YouTube transcript tool"""
-    url: str = Field(..., description="YouTube video URL to extract transcript from")
+# Markdown layout of the tool response, filled in one format call
+RESPONSE_TEMPLATE = """### 📹 Video Information
+- **Title:** {title}
+- **Video ID:** `{video_id}`
+- **Language:** {language}
+- **Content Type:** {content_type}
+{ai_line}
+### 📝 Transcript
+{transcript_block}
 
+---
 
-class EnhancedTellyTool(BaseTool):
-    """Enhanced tool for extracting YouTube transcripts with intelligent content generation"""
-    
-    name: str = "youtube_transcript"
-    description: str = """Extract transcript from a YouTube video and generate appropriate content based on video type.
-    Automatically detects video type (tutorial, news, entertainment, etc.) and generates relevant output.
-    Also detects if content appears to be AI-generated."""
-    
-    args_schema: type[BaseModel] = EnhancedTellyToolInput
-    agent: Any = Field(default=None, exclude=True)
-    llm: Any = Field(default=None, exclude=True)
-    
-    def __init__(self, llm=None, **kwargs):
-        super().__init__(**kwargs)
-        # Initialize the telly agent if available
-        if TellyAgent:
-            object.__setattr__(self, 'agent', TellyAgent())
-        else:
-            object.__setattr__(self, 'agent', None)
-        
-        # Initialize LLM for content analysis
-        if llm:
-            object.__setattr__(self, 'llm', llm)
-        else:
-            # Default to Anthropic
-            api_key = os.getenv("ANTHROPIC_API_KEY")
-            if api_key:
-                object.__setattr__(self, 'llm', ChatAnthropic(
-                    model="claude-3-5-sonnet-20241022",
-                    anthropic_api_key=api_key,
-                    temperature=0.3
-                ))
-    
-    def _detect_content_type(self, title: str, transcript: str) -> Tuple[str, bool]:
-        """Detect the type of content and if it's AI-generated"""
-        
-        analysis_prompt = f"""Analyze this YouTube video based on its title and transcript excerpt.
+{content_header}
 
-Title: {title}
-Transcript excerpt (first 1000 chars): {transcript[:1000]}
+{generated_content}"""
 
-Determine:
-1. Content type - Choose ONE from: tutorial, news, review, entertainment, educational, vlog, documentary, podcast, music, other
-2. Is it likely AI-generated content? Look for:
-   - Repetitive phrasing or unnatural speech patterns
-   - Generic, template-like structure
-   - Lack of personal anecdotes or human elements
-   - Overly formal or robotic language
-   - Mentions of being AI-generated
+AI_GENERATED_LINE = "- **⚠️ AI-Generated:** Likely (confidence: high)\n"
 
-Respond in this exact format:
-CONTENT_TYPE: [type]
-AI_GENERATED: [yes/no]
-AI_CONFIDENCE: [low/medium/high]
-AI_INDICATORS: [brief explanation if yes]"""
-        
-        try:
-            messages = [
-                SystemMessage(content="You are an expert at analyzing video content and detecting AI-generated content."),
-                HumanMessage(content=analysis_prompt)
-            ]
-            
-            response = self.llm.invoke(messages)
-            content = response.content
-            
-            # Parse response
-            content_type = "other"
-            ai_generated = False
-            
-            type_match = re.search(r'CONTENT_TYPE:\s*(\w+)', content)
-            if type_match:
-                content_type = type_match.group(1).lower()
-            
-            ai_match = re.search(r'AI_GENERATED:\s*(yes|no)', content, re.IGNORECASE)
-            if ai_match:
-                ai_generated = ai_match.group(1).lower() == 'yes'
-            
-            return content_type, ai_generated
-            
-        except Exception as e:
-            print(f"Error detecting content type: {e}")
-            return "other", False
-    
-    def _generate_content_based_on_type(self, content_type: str, title: str, transcript: str, ai_generated: bool) -> str:
-        """Generate appropriate content based on the video type"""
-        
-        prompts = {
-            "tutorial": f"""Create a step-by-step tutorial guide from this video.
+TRANSCRIPT_PREVIEW_TEMPLATE = """*Showing first {limit} characters:*
+
+```
+{preview}...
+```
+
+📊 **Full transcript:** {chars:,} characters • {words:,} words"""
+
+TRANSCRIPT_FULL_TEMPLATE = """
+```
+{transcript}
+```"""
+
+# Transcript prefix sent for generation; changing it changes every prompt, so
+# provider prompt caches and LLM response caches start cold
+ANALYSIS_WINDOW_CHARS = 3000
+
+# Extraction results kept per tool, least recently used evicted first
+TRANSCRIPT_CACHE_SIZE = 128
+
+# Generation prompt for each video type, formatted with the title and transcript
+CONTENT_PROMPTS = {
+    "tutorial": """Create a step-by-step tutorial guide from this video.
 
 Title: {title}
-Transcript: {transcript[:3000]}...
+Transcript: {transcript}...
 
 Format the output as:
 OVERVIEW
@@ -135,10 +88,10 @@ TIPS & BEST PRACTICES
 COMMON ISSUES
 - Potential problems and solutions""",
 
-            "news": f"""Create a news summary from this video.
+    "news": """Create a news summary from this video.
 
 Title: {title}
-Transcript: {transcript[:3000]}...
+Transcript: {transcript}...
 
 Format the output as:
 HEADLINE
@@ -159,10 +112,10 @@ Any relevant background information
 IMPLICATIONS
 What this means going forward""",
 
-            "review": f"""Create a structured review summary from this video.
+    "review": """Create a structured review summary from this video.
 
 Title: {title}
-Transcript: {transcript[:3000]}...
+Transcript: {transcript}...
 
 Format the output as:
 PRODUCT/SERVICE REVIEWED
@@ -188,10 +141,10 @@ KEY FEATURES DISCUSSED
 RECOMMENDATION
 Who should consider this and why""",
 
-            "educational": f"""Create educational notes from this video.
+    "educational": """Create educational notes from this video.
 
 Title: {title}
-Transcript: {transcript[:3000]}...
+Transcript: {transcript}...
 
 Format the output as:
 TOPIC
@@ -217,10 +170,10 @@ SUMMARY
 FURTHER LEARNING
 Suggested topics to explore next""",
 
-            "default": f"""Create an action plan from this video content.
+    "default": """Create an action plan from this video content.
 
 Title: {title}
-Transcript: {transcript[:3000]}...
+Transcript: {transcript}...
 
 Format the output as:
 SUMMARY
@@ -241,10 +194,116 @@ RESOURCES MENTIONED
 
 NEXT STEPS
 What to do after watching this video"""
-        }
+}
+
+# Section header for the generated content of each video type
+CONTENT_HEADERS = {
+    "tutorial": "### 🎓 Tutorial Guide",
+    "news": "### 📰 News Summary",
+    "review": "### ⭐ Review Summary",
+    "educational": "### 📚 Educational Notes",
+}
+DEFAULT_CONTENT_HEADER = "### 📋 Action Plan"
+
+
+class EnhancedTellyToolInput(BaseModel):
+    """Input for the Enhanced Telly YouTube transcript tool"""
+    url: str = Field(..., description="YouTube video URL to extract transcript from")
+
+
+class EnhancedTellyTool(BaseTool):
+    """Enhanced tool for extracting YouTube transcripts with intelligent content generation"""
+    
+    name: str = "youtube_transcript"
+    description: str = """Extract transcript from a YouTube video and generate appropriate content based on video type.
+    Automatically detects video type (tutorial, news, entertainment, etc.) and generates relevant output.
+    Also detects if content appears to be AI-generated."""
+    
+    args_schema: type[BaseModel] = EnhancedTellyToolInput
+    agent: Any = Field(default=None, exclude=True)
+    llm: Any = Field(default=None, exclude=True)
+    transcript_cache: typing.OrderedDict[str, Dict[str, Any]] = Field(default_factory=OrderedDict, exclude=True)
+    # Runs in progress by video id, shared by concurrent requests for the same video
+    inflight: Dict[str, Any] = Field(default_factory=dict, exclude=True)
+    
+    def __init__(self, llm=None, **kwargs):
+        super().__init__(**kwargs)
+        # Initialize the telly agent if available
+        if TellyAgent:
+            object.__setattr__(self, 'agent', TellyAgent())
+        else:
+            object.__setattr__(self, 'agent', None)
+        
+        # Initialize LLM for content analysis
+        if llm:
+            object.__setattr__(self, 'llm', llm)
+        else:
+            # Default to Anthropic
+            api_key = os.getenv("ANTHROPIC_API_KEY")
+            if api_key:
+                object.__setattr__(self, 'llm', ChatAnthropic(
+                    model="claude-3-5-sonnet-20241022",
+                    anthropic_api_key=api_key,
+                    temperature=0.3
+                ))
+    
+    def _detect_content_type(self, title: str, transcript: str) -> Tuple[str, bool]:
+        """Detect the type of content and if it's AI-generated"""
+        
+        analysis_prompt = f"""Analyze this YouTube video based on its title and transcript excerpt.
+
+Title: {title}
+Transcript excerpt (first 1000 chars): {transcript[:1000]}
+
+Determine:
+1. Content type - Choose ONE from: tutorial, news, review, entertainment, educational, vlog, documentary, podcast, music, other
+2. Is it likely AI-generated content? Look for:
+   - Repetitive phrasing or unnatural speech patterns
+   - Generic, template-like structure
+   - Lack of personal anecdotes or human elements
+   - Overly formal or robotic language
+   - Mentions of being AI-generated
+
+Respond in this exact format:
+CONTENT_TYPE: [type]
+AI_GENERATED: [yes/no]
+AI_CONFIDENCE: [low/medium/high]
+AI_INDICATORS: [brief explanation if yes]"""
+        
+        try:
+            messages = [
+                SystemMessage(content="You are an expert at analyzing video content and detecting AI-generated content."),
+                HumanMessage(content=analysis_prompt)
+            ]
+            
+            response = self.llm.invoke(messages)
+            content = response.content
+            
+            # Parse response
+            content_type = "other"
+            ai_generated = False
+            
+            type_match = re.search(r'CONTENT_TYPE:\s*(\w+)', content)
+            if type_match:
+                content_type = type_match.group(1).lower()
+            
+            ai_match = re.search(r'AI_GENERATED:\s*(yes|no)', content, re.IGNORECASE)
+            if ai_match:
+                ai_generated = ai_match.group(1).lower() == 'yes'
+            
+            return content_type, ai_generated
+            
+        except Exception as e:
+            print(f"Error detecting content type: {e}")
+            return "other", False
+    
+    def _generate_content_based_on_type(self, content_type: str, title: str, transcript: str, ai_generated: bool) -> str:
+        """Generate appropriate content based on the video type"""
         
-        # Choose appropriate prompt
-        prompt_template = prompts.get(content_type, prompts["default"])
+        # Format only the prompt for this video type
+        prompt_template = CONTENT_PROMPTS.get(content_type, CONTENT_PROMPTS["default"]).format(
+            title=title, transcript=transcript[:ANALYSIS_WINDOW_CHARS]
+        )
         
         # Add AI-generated warning if detected
         if ai_generated:
@@ -279,6 +338,31 @@ This video appears to contain AI-generated content. Take the information with ap
         
         return "YouTube Video"
     
+    def _video_cache_key(self, url: str) -> str:
+        """Key extraction results by video ID so URL variants share an entry"""
+        return extract_video_id(url) or url
+    
+    def _extract_transcript(self, url: str) -> Dict[str, Any]:
+        """Extract the transcript, reusing earlier extractions of the same video"""
+        cache_key = self._video_cache_key(url)
+        try:
+            # Another worker thread may evict the entry between these calls
+            self.transcript_cache.move_to_end(cache_key)
+            return self.transcript_cache[cache_key]
+        except KeyError:
+            pass
+        
+        result = self.agent.process_video(url, generate_plan=False)
+        
+        # Transcripts don't change - only the LLM stages need to re-run
+        if result['success']:
+            # Cut the prompt window once rather than on every generation
+            result['transcript_head'] = result.get('transcript', '')[:ANALYSIS_WINDOW_CHARS]
+            self.transcript_cache[cache_key] = result
+            if len(self.transcript_cache) > TRANSCRIPT_CACHE_SIZE:
+                self.transcript_cache.popitem(last=False)
+        return result
+    
     def _run(self, url: str) -> str:
         """Run the tool synchronously"""
         try:
@@ -286,7 +370,7 @@ This video appears to contain AI-generated content. Take the information with ap
             if not self.agent:
                 return "Error: Telly agent not available. Please check your installation."
             
-            result = self.agent.process_video(url, generate_plan=False)
+            result = self._extract_transcript(url)
             
             if not result['success']:
                 return f"Error extracting transcript: {result.get('error', 'Unknown error')}"
@@ -295,76 +379,62 @@ This video appears to contain AI-generated content. Take the information with ap
             video_id = result.get('video_id', 'unknown')
             language = result.get('language', 'unknown')
             transcript = result.get('transcript', '')
+            transcript_head = result.get('transcript_head', transcript)
             
             # Try to get title from the Telly tool result or extract it
             title = result.get('title', self._extract_video_title(url, transcript))
             
             # Detect content type and AI generation
-            content_type, ai_generated = self._detect_content_type(title, transcript)
+            content_type, ai_generated = self._detect_content_type(title, transcript_head)
             
             # Generate appropriate content
             generated_content = self._generate_content_based_on_type(
-                content_type, title, transcript, ai_generated
+                content_type, title, transcript_head, ai_generated
             )
             
             # Format the response
-            response_parts = []
-            
-            # Add video info
-            response_parts.append(f"### 📹 Video Information")
-            response_parts.append(f"- **Title:** {title}")
-            response_parts.append(f"- **Video ID:** `{video_id}`")
-            response_parts.append(f"- **Language:** {language}")
-            response_parts.append(f"- **Content Type:** {content_type.title()}")
-            if ai_generated:
-                response_parts.append(f"- **⚠️ AI-Generated:** Likely (confidence: high)")
-            response_parts.append("")
-            
-            # Add transcript preview
-            response_parts.append("### 📝 Transcript")
             display_limit = 800
-            
             if len(transcript) > display_limit:
-                response_parts.append(f"*Showing first {display_limit} characters:*")
-                response_parts.append("")
-                response_parts.append("```")
-                response_parts.append(transcript[:display_limit].strip() + "...")
-                response_parts.append("```")
-                response_parts.append("")
-                response_parts.append(f"📊 **Full transcript:** {len(transcript):,} characters • {len(transcript.split()):,} words")
+                transcript_block = TRANSCRIPT_PREVIEW_TEMPLATE.format(
+                    limit=display_limit,
+                    preview=transcript[:display_limit].strip(),
+                    chars=len(transcript),
+                    words=len(transcript.split())
+                )
             else:
-                response_parts.append("")
-                response_parts.append("```")
-                response_parts.append(transcript.strip())
-                response_parts.append("```")
+                transcript_block = TRANSCRIPT_FULL_TEMPLATE.format(transcript=transcript.strip())
             
-            response_parts.append("")
-            response_parts.append("---")
-            response_parts.append("")
-            
-            # Add generated content based on type
-            if content_type == "tutorial":
-                response_parts.append("### 🎓 Tutorial Guide")
-            elif content_type == "news":
-                response_parts.append("### 📰 News Summary")
-            elif content_type == "review":
-                response_parts.append("### ⭐ Review Summary")
-            elif content_type == "educational":
-                response_parts.append("### 📚 Educational Notes")
-            else:
-                response_parts.append("### 📋 Action Plan")
-            
-            response_parts.append("")
-            response_parts.append(generated_content)
-            
-            return "\n".join(response_parts)
+            return RESPONSE_TEMPLATE.format_map({
+                "title": title,
+                "video_id": video_id,
+                "language": language,
+                "content_type": content_type.title(),
+                "ai_line": AI_GENERATED_LINE if ai_generated else "",
+                "transcript_block": transcript_block,
+                "content_header": CONTENT_HEADERS.get(content_type, DEFAULT_CONTENT_HEADER),
+                "generated_content": generated_content
+            })
             
         except Exception as e:
             return f"Error using Enhanced Telly tool: {str(e)}"
     
     async def _arun(self, url: str) -> str:
-        """Run the tool asynchronously"""
-        return self._run(url)
+        """Run the tool asynchronously, joining an in-flight run for the same video"""
+        key = self._video_cache_key(url)
+        task = self.inflight.get(key)
+        if task is None:
+            # Transcript fetch and LLM calls are blocking - keep them off the event loop
+            task = asyncio.ensure_future(asyncio.to_thread(self._run, url))
+            self.inflight[key] = task
+            task.add_done_callback(lambda done: self._finish_inflight(key, done))
+        
+        # Shielded so one cancelled caller doesn't cancel the run for the others
+        return await asyncio.shield(task)
+    
+    def _finish_inflight(self, key: str, task: asyncio.Future):
+        """Drop a finished run so later requests start fresh"""
+        if self.inflight.get(key) is task:
+            del self.inflight[key]
 
 
 def get_enhanced_telly_tool(llm=None) -> EnhancedTellyTool:
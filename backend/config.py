@@ -1,7 +1,18 @@
 """Configuration for Telly Chat features"""
 
+import asyncio
 import os
-from typing import Dict, Any
+from functools import lru_cache
+from typing import Awaitable, Dict, Any, TypeVar
+
+from dotenv import load_dotenv
+
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
+
+T = TypeVar("T")
 
 # Feature flags from environment
 ENABLE_MEMORY = os.getenv("ENABLE_MEMORY", "false").lower() == "true"
@@ -32,8 +43,26 @@ THREAD_CONFIG = {
 }
 
 
+@lru_cache(maxsize=1)
+def load_env() -> bool:
+    """Load .env once, on first use rather than at import"""
+    load_dotenv()
+    return True
+
+
+def run_async(coro: Awaitable[T]) -> T:
+    """asyncio.run for the standalone scripts, on a uvloop loop when uvloop is installed"""
+    if uvloop is None:
+        return asyncio.run(coro)
+    
+    # A loop factory rather than a policy, so the process-wide default is untouched
+    with asyncio.Runner(loop_factory=uvloop.new_event_loop) as runner:
+        return runner.run(coro)
+
+
+@lru_cache(maxsize=1)
 def get_agent_config() -> Dict[str, Any]:
-    """Get configuration for the chat agent"""
+    """Get configuration for the chat agent (built once; treat as read-only)"""
     return {
         "enable_memory": True,  # Always initialize with memory support (can toggle on/off at runtime)
         "enable_workflows": ENABLE_WORKFLOWS,
@@ -10,6 +10,7 @@ import json
 import asyncio
 from datetime import datetime
 from contextlib import asynccontextmanager
+from functools import lru_cache
 from dotenv import load_dotenv
 
 import sys
@@ -367,7 +368,7 @@ async def chat(request: ChatRequest):
     await session_manager.add_message(session_id, user_message)
     
     # Get response from agent
-    response_content = ""
+    response_parts = []
     tool_calls = []
     tool_results = []
     
@@ -391,7 +392,7 @@ async def chat(request: ChatRequest):
     
     async for chunk in chat_agent.chat(**kwargs):
         if chunk["type"] == "text":
-            response_content += chunk["content"]
+            response_parts.append(chunk["content"])
         elif chunk["type"] == "tool_call":
             tool_calls.append(ToolCall(
                 tool_name=chunk["content"]["tool"],
@@ -405,6 +406,7 @@ async def chat(request: ChatRequest):
             ))
     
     # Create assistant message
+    response_content = "".join(response_parts)
     assistant_message = Message(
         id=str(uuid.uuid4()),
         role=MessageRole.ASSISTANT,
@@ -459,7 +461,7 @@ async def chat_stream(message: str, session_id: Optional[str] = None):
             }
         
         # Collect response content and metadata
-        response_content = ""
+        response_parts = []
         tool_calls = []
         tool_results = []
         message_id = str(uuid.uuid4())
@@ -486,7 +488,7 @@ async def chat_stream(message: str, session_id: Optional[str] = None):
             
             async for chunk in chat_agent.chat(**kwargs):
                 if chunk["type"] == "text":
-                    response_content += chunk["content"]
+                    response_parts.append(chunk["content"])
                     yield {
                         "event": "message",
                         "data": json.dumps({
@@ -523,6 +525,7 @@ async def chat_stream(message: str, session_id: Optional[str] = None):
                     }
             
             # Create and save complete assistant message
+            response_content = "".join(response_parts)
             assistant_message = Message(
                 id=message_id,
                 role=MessageRole.ASSISTANT,
@@ -607,7 +610,7 @@ async def websocket_endpoint(websocket: WebSocket):
             })
             
             # Generate response
-            response_content = ""
+            response_parts = []
             message_id = str(uuid.uuid4())
             tool_calls = []
             tool_results = []
@@ -633,7 +636,7 @@ async def websocket_endpoint(websocket: WebSocket):
             
             async for chunk in chat_agent.chat(**kwargs):
                 if chunk["type"] == "text":
-                    response_content += chunk["content"]
+                    response_parts.append(chunk["content"])
                     await websocket.send_json({
                         "type": "stream",
                         "content": chunk["content"]
@@ -665,6 +668,7 @@ async def websocket_endpoint(websocket: WebSocket):
                     })
             
             # Create complete assistant message
+            response_content = "".join(response_parts)
             assistant_message = Message(
                 id=message_id,
                 role=MessageRole.ASSISTANT,
@@ -718,17 +722,20 @@ async def delete_session(session_id: str):
     return {"message": "Session deleted"}
 
 
+@lru_cache(maxsize=1)
+def _get_telly_agent():
+    """TellyAgent shared by transcript requests, created on first use"""
+    sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../../telly'))
+    from telly_agent import TellyAgent
+    return TellyAgent()
+
+
 @app.post("/youtube/transcript")
 async def get_youtube_transcript(url: str):
     """Direct endpoint to get YouTube transcript"""
-    import sys
-    import os
-    sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../../telly'))
-    from telly_agent import TellyAgent
-    
     try:
         # Use TellyAgent directly to get full transcript
-        agent = TellyAgent()
+        agent = _get_telly_agent()
         result = agent.process_video(url, generate_plan=True)
         
         if not result['success']:
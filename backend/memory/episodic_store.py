@@ -147,26 +147,27 @@ class EpisodicStore(EpisodicMemory):
             return
         
         episode = self._episodes[episode_id]
+        entry = self.episode_index["episodes"].get(episode_id)
         
-        # Create filename
-        filename = f"episode_{episode.start_time.strftime('%Y%m%d_%H%M%S')}_{episode_id}.json"
-        filepath = os.path.join(self.storage_dir, filename)
+        if entry is None:
+            # File name and start time never change, so format them once
+            filename = f"episode_{episode.start_time.strftime('%Y%m%d_%H%M%S')}_{episode_id}.json"
+            entry = self.episode_index["episodes"][episode_id] = {
+                "file": os.path.join(self.storage_dir, filename),
+                "title": episode.title,
+                "type": episode.type.value,
+                "start_time": episode.start_time.isoformat(),
+                "participants": episode.participants
+            }
         
         # Save episode data
-        with open(filepath, 'w') as f:
+        with open(entry["file"], 'w') as f:
             json.dump(episode.to_dict(), f, indent=2)
         
         # Update index
-        self.episode_index["episodes"][episode_id] = {
-            "file": filepath,
-            "title": episode.title,
-            "type": episode.type.value,
-            "start_time": episode.start_time.isoformat(),
-            "end_time": episode.end_time.isoformat() if episode.end_time else None,
-            "is_active": episode.is_active,
-            "participants": episode.participants,
-            "event_count": len(episode.events)
-        }
+        entry["end_time"] = episode.end_time.isoformat() if episode.end_time else None
+        entry["is_active"] = episode.is_active
+        entry["event_count"] = len(episode.events)
         
         self._save_index()
     
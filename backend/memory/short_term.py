@@ -1,6 +1,6 @@
 """Short-term memory implementation for immediate context"""
 
-from typing import List, Dict, Any, Optional, Deque
+from typing import List, Dict, Any, Optional, Deque, Tuple
 from collections import deque
 from datetime import datetime, timedelta
 import json
@@ -122,6 +122,38 @@ class ShortTermMemory:
         
         return memory_id
     
+    def bulk_add(
+        self,
+        items: List[Tuple[str, MemoryPriority, Optional[Dict[str, Any]]]]
+    ) -> List[str]:
+        """Add many (content, priority, metadata) memories with one timestamp"""
+        now = datetime.now()
+        base_id = f"stm_{now.timestamp()}"
+        memory_ids = []
+        
+        for i, (content, priority, metadata) in enumerate(items):
+            memory = MemoryItem(
+                id=f"{base_id}_{i}",
+                content=content,
+                timestamp=now,
+                priority=priority,
+                metadata=metadata or {}
+            )
+            
+            # Check if we need to evict
+            if len(self._memories) >= self.capacity:
+                self._evict_memory()
+            
+            self._memories.append(memory)
+            self._memory_index[memory.id] = memory
+            memory_ids.append(memory.id)
+        
+        # Update context window once
+        self._context_window.extend(content for content, _, _ in items)
+        del self._context_window[:-self._max_context_size]
+        
+        return memory_ids
+    
     def get(self, memory_id: str) -> Optional[MemoryItem]:
         """Retrieve a specific memory"""
         memory = self._memory_index.get(memory_id)
@@ -208,6 +240,24 @@ class ShortTermMemory:
         recent.reverse()
         return recent[:limit]
     
+    def clone_tail(self, from_index: int) -> 'ShortTermMemory':
+        """New memory sharing the items from from_index onwards (slice semantics)"""
+        return self.clone_items(list(self._memories)[from_index:])
+    
+    def clone_items(self, items: List[MemoryItem]) -> 'ShortTermMemory':
+        """New memory with the same settings holding items, oldest first"""
+        clone = ShortTermMemory(
+            capacity=self.capacity,
+            decay_time=self.decay_time,
+            priority_threshold=self.priority_threshold
+        )
+        
+        clone._memories.extend(items)
+        clone._memory_index = {memory.id: memory for memory in clone._memories}
+        clone._context_window = [memory.content for memory in items[-clone._max_context_size:]]
+        
+        return clone
+    
     def get_high_priority(self) -> List[MemoryItem]:
         """Get high priority memories"""
         return [
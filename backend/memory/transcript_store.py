@@ -7,6 +7,7 @@ from typing import List, Dict, Any, Optional, Tuple
 from datetime import datetime
 from dataclasses import dataclass, asdict
 
+from models.youtube import canonical_url
 from .long_term import LongTermMemory
 from .vector_store import VectorStoreConfig
 
@@ -108,6 +109,20 @@ class TranscriptStore:
                 self.index = json.load(f)
         else:
             self.index = {}
+        
+        # Content hash -> transcript ID, rebuilt from the persisted index
+        self._hash_to_id = {
+            info["content_hash"]: transcript_id
+            for transcript_id, info in self.index.items()
+            if info.get("content_hash")
+        }
+        
+        # Canonical URL -> transcript ID; records saved before URLs were
+        # canonicalized keep their legacy md5(raw url) IDs
+        self._url_to_id = {
+            canonical_url(info["url"]): transcript_id
+            for transcript_id, info in self.index.items()
+        }
     
     def _save_index(self):
         """Save transcript index to disk"""
@@ -116,7 +131,28 @@ class TranscriptStore:
     
     def _generate_id(self, url: str) -> str:
         """Generate unique ID for transcript"""
-        return f"transcript_{hashlib.md5(url.encode()).hexdigest()[:12]}"
+        return f"transcript_{hashlib.md5(canonical_url(url).encode()).hexdigest()[:12]}"
+    
+    def _content_hash(
+        self,
+        url: str,
+        title: str,
+        transcript: str,
+        action_plan: str,
+        summary: str,
+        duration: Optional[str],
+        metadata: Dict[str, Any]
+    ) -> str:
+        """Hash of every field a save writes, used to skip identical re-saves"""
+        digest = hashlib.blake2b(digest_size=16)
+        for part in (
+            canonical_url(url), title, transcript, action_plan, summary,
+            duration or "", json.dumps(metadata, sort_keys=True, default=str)
+        ):
+            # Separator keeps field boundaries from shifting between saves
+            digest.update(part.encode())
+            digest.update(b"\0")
+        return digest.hexdigest()
     
     def save_transcript(
         self,
@@ -130,13 +166,23 @@ class TranscriptStore:
     ) -> str:
         """Save a transcript and index it for search"""
         
-        # Generate ID
-        transcript_id = self._generate_id(url)
-        
         # Create summary if not provided
         if not summary:
             # Take first 500 chars of transcript as summary
             summary = transcript[:500] + "..." if len(transcript) > 500 else transcript
+        metadata = metadata or {}
+        
+        # Identical content was already saved - skip re-writing and re-indexing
+        content_hash = self._content_hash(
+            url, title, transcript, action_plan, summary, duration, metadata
+        )
+        existing_id = self._hash_to_id.get(content_hash)
+        if existing_id and existing_id in self.index:
+            self.get_transcript(existing_id)  # bumps access count
+            return existing_id
+        
+        # Reuse the video's existing ID, which may be a legacy one
+        transcript_id = self._url_to_id.get(canonical_url(url)) or self._generate_id(url)
         
         # Create record
         record = TranscriptRecord(
@@ -147,7 +193,7 @@ class TranscriptStore:
             action_plan=action_plan,
             summary=summary,
             duration=duration,
-            metadata=metadata or {}
+            metadata=metadata
         )
         
         # Save to disk
@@ -156,12 +202,18 @@ class TranscriptStore:
             json.dump(record.to_dict(), f, indent=2)
         
         # Update index
+        previous_hash = self.index.get(transcript_id, {}).get("content_hash")
+        if previous_hash:
+            self._hash_to_id.pop(previous_hash, None)
         self.index[transcript_id] = {
             "url": url,
             "title": title,
             "saved_at": record.saved_at.isoformat(),
-            "file": record_file
+            "file": record_file,
+            "content_hash": content_hash
         }
+        self._hash_to_id[content_hash] = transcript_id
+        self._url_to_id[canonical_url(url)] = transcript_id
         self._save_index()
         
         # Index in vector store for semantic search
@@ -277,7 +329,7 @@ Transcript Preview:
     
     def get_transcript_by_url(self, url: str) -> Optional[TranscriptRecord]:
         """Get transcript by YouTube URL"""
-        transcript_id = self._generate_id(url)
+        transcript_id = self._url_to_id.get(canonical_url(url)) or self._generate_id(url)
         return self.get_transcript(transcript_id)
     
     def get_related_transcripts(
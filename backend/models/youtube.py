@@ -0,0 +1,21 @@
+"""YouTube URL helpers shared by the transcript tool, store and scripts"""
+
+import re
+from typing import Optional
+
+
+VIDEO_ID_RE = re.compile(r'(?:[?&]v=|youtu\.be/|/shorts/)([a-zA-Z0-9_-]{11})')
+
+
+def extract_video_id(url: str) -> Optional[str]:
+    """Video ID from a watch, youtu.be or shorts URL, or None"""
+    match = VIDEO_ID_RE.search(url)
+    return match.group(1) if match else None
+
+
+def canonical_url(url: str) -> str:
+    """Normalize a YouTube URL so share links and tracking params map to one video"""
+    video_id = extract_video_id(url)
+    if video_id:
+        return f"https://www.youtube.com/watch?v={video_id}"
+    return url
@@ -1,15 +1,14 @@
 #!/usr/bin/env python3
 """Test what the agent is actually outputting"""
-import asyncio
 import sys
 sys.path.insert(0, '.')
 
 from agents.chat_agent import ChatAgent
-from dotenv import load_dotenv
+from config import load_env, run_async
 
-load_dotenv()
 
 async def test_agent():
+    load_env()
     agent = ChatAgent(model_provider="anthropic")
     
     print("Testing agent output...")
@@ -36,4 +35,4 @@ async def test_agent():
     print(f"Output type: {type(response.get('output')) if isinstance(response, dict) else 'N/A'}")
 
 if __name__ == "__main__":
-    asyncio.run(test_agent())
\ No newline at end of file
+    run_async(test_agent())
\ No newline at end of file
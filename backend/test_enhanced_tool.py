@@ -2,27 +2,52 @@
 """Test script for the enhanced YouTube tool"""
 
 import asyncio
+import atexit
+import contextlib
+import logging
+import logging.handlers
 import os
+import shelve
 import sys
+from functools import lru_cache
 from pathlib import Path
 
 # Add backend to path
 sys.path.insert(0, str(Path(__file__).parent))
 
 from agents.tools.enhanced_telly_tool import get_enhanced_telly_tool
+from config import run_async
+from models.youtube import extract_video_id
 from langchain_anthropic import ChatAnthropic
 
+# Buffer output and write it in batches rather than flushing every line;
+# errors flush immediately so ordering is preserved
+log = logging.getLogger("enhanced_tool_test")
+log.setLevel(logging.INFO)
+log.propagate = False
+_log_buffer = logging.handlers.MemoryHandler(
+    capacity=1024,
+    target=logging.StreamHandler(sys.stdout)
+)
+log.addHandler(_log_buffer)
+atexit.register(_log_buffer.flush)
 
-async def test_enhanced_tool():
-    """Test the enhanced YouTube tool with different video types"""
-    
-    # Initialize the tool
-    print("🔧 Initializing enhanced YouTube tool...")
-    
+# Maximum number of videos processed at once in the batch test
+MAX_CONCURRENT_VIDEOS = 5
+
+# Seconds before a single video is abandoned
+VIDEO_TIMEOUT = 120
+
+# Set TEST_RESULT_CACHE to a file path to reuse tool results across runs
+RESULT_CACHE_PATH = os.getenv("TEST_RESULT_CACHE")
+
+
+@lru_cache(maxsize=1)
+def get_test_tool():
+    """Create the LLM and tool once and share them across tests"""
     api_key = os.getenv("ANTHROPIC_API_KEY")
     if not api_key:
-        print("❌ Error: ANTHROPIC_API_KEY not found in environment")
-        return
+        return None
     
     llm = ChatAnthropic(
         model="claude-3-5-sonnet-20241022",
@@ -30,7 +55,49 @@ async def test_enhanced_tool():
         temperature=0.3
     )
     
-    tool = get_enhanced_telly_tool(llm)
+    return get_enhanced_telly_tool(llm)
+
+
+def video_cache_key(url: str) -> str:
+    """Result cache key for a URL: its video ID, falling back to the URL"""
+    return extract_video_id(url) or url
+
+
+def open_result_cache():
+    """Open the on-disk result cache, or a no-op context if disabled"""
+    if RESULT_CACHE_PATH:
+        return shelve.open(RESULT_CACHE_PATH)
+    return contextlib.nullcontext()
+
+
+async def run_tool(tool, url: str, video_id: str, cache=None) -> str:
+    """Run the tool on a URL and cache the result under its video ID"""
+    result = await tool._arun(url)
+    
+    # The tool reports failures as text - only cache real results
+    if cache is not None and not result.startswith("Error"):
+        cache[video_id] = result
+    return result
+
+
+async def analyze_video(tool, url: str, cache=None) -> str:
+    """Run the tool on a URL, reusing a cached result for the same video"""
+    video_id = video_cache_key(url)
+    if cache is not None and video_id in cache:
+        return cache[video_id]
+    return await run_tool(tool, url, video_id, cache)
+
+
+async def test_enhanced_tool():
+    """Test the enhanced YouTube tool with different video types"""
+    
+    # Initialize the tool
+    log.info("🔧 Initializing enhanced YouTube tool...")
+    
+    tool = get_test_tool()
+    if tool is None:
+        log.error("❌ Error: ANTHROPIC_API_KEY not found in environment")
+        return
     
     # Test videos of different types
     test_videos = [
@@ -51,70 +118,107 @@ async def test_enhanced_tool():
         }
     ]
     
-    print("\n📺 Testing with sample videos...\n")
+    log.info("\n📺 Testing with sample videos...\n")
+    
+    # Process videos concurrently, capped to avoid hammering the APIs
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_VIDEOS)
     
-    for video in test_videos:
-        print(f"➡️  Testing: {video['description']}")
-        print(f"   URL: {video['url']}")
-        print(f"   Expected type: {video['expected_type']}")
-        print("\n" + "="*80 + "\n")
+    # Parse every URL up front into parallel lists
+    urls = [video['url'] for video in test_videos]
+    video_ids = [video_cache_key(url) for url in urls]
+    
+    with open_result_cache() as cache:
+        # Resolve cache hits in one pass so only misses reach the tool
+        results = [
+            cache.get(video_id) if cache is not None else None
+            for video_id in video_ids
+        ]
+        misses = [i for i, result in enumerate(results) if result is None]
+        if cache is not None:
+            log.info(f"   {len(urls) - len(misses)} cached, {len(misses)} to process\n")
         
-        try:
-            # Run the tool
-            result = await tool._arun(video['url'])
-            
+        async def run_video(i):
+            # Errors are returned, not raised, so one video can't cancel the rest
+            try:
+                async with semaphore:
+                    return await asyncio.wait_for(
+                        run_tool(tool, urls[i], video_ids[i], cache),
+                        timeout=VIDEO_TIMEOUT
+                    )
+            except asyncio.TimeoutError:
+                return TimeoutError(f"Timed out after {VIDEO_TIMEOUT}s")
+            except Exception as e:
+                return e
+        
+        async with asyncio.TaskGroup() as tg:
+            tasks = {i: tg.create_task(run_video(i)) for i in misses}
+        
+        for i, task in tasks.items():
+            results[i] = task.result()
+    
+    for video, result in zip(test_videos, results):
+        log.info(f"➡️  Testing: {video['description']}")
+        log.info(f"   URL: {video['url']}")
+        log.info(f"   Expected type: {video['expected_type']}")
+        log.info("\n" + "="*80 + "\n")
+        
+        if isinstance(result, Exception):
+            log.error(f"❌ Error processing video: {str(result)}")
+        else:
             # Extract content type from result
             if "**Content Type:**" in result:
                 import re
                 type_match = re.search(r'\*\*Content Type:\*\* ([^\n]+)', result)
                 if type_match:
                     detected_type = type_match.group(1)
-                    print(f"✅ Detected content type: {detected_type}")
+                    log.info(f"✅ Detected content type: {detected_type}")
             
             # Check for AI detection
             if "**⚠️ AI-Generated:**" in result:
-                print("🤖 AI-generated content detected!")
+                log.info("🤖 AI-generated content detected!")
             
             # Show first 500 chars of analysis
-            print("\n📝 Analysis preview:")
-            print(result[:500] + "..." if len(result) > 500 else result)
-            
-        except Exception as e:
-            print(f"❌ Error processing video: {str(e)}")
-        
-        print("\n" + "="*80 + "\n")
+            log.info("\n📝 Analysis preview:")
+            log.info(result[:500] + "..." if len(result) > 500 else result)
         
-        # Small delay between requests
-        await asyncio.sleep(2)
+        log.info("\n" + "="*80 + "\n")
     
-    print("✅ Test completed!")
+    log.info("✅ Test completed!")
 
 
 async def test_single_video(url: str):
     """Test a single video URL"""
     
-    print(f"🔧 Testing single video: {url}")
+    log.info(f"🔧 Testing single video: {url}")
     
-    api_key = os.getenv("ANTHROPIC_API_KEY")
-    if not api_key:
-        print("❌ Error: ANTHROPIC_API_KEY not found in environment")
+    tool = get_test_tool()
+    if tool is None:
+        log.error("❌ Error: ANTHROPIC_API_KEY not found in environment")
         return
     
-    llm = ChatAnthropic(
-        model="claude-3-5-sonnet-20241022",
-        anthropic_api_key=api_key,
-        temperature=0.3
-    )
-    
-    tool = get_enhanced_telly_tool(llm)
-    
     try:
-        result = await tool._arun(url)
-        print("\n" + "="*80 + "\n")
-        print(result)
-        print("\n" + "="*80 + "\n")
+        with open_result_cache() as cache:
+            result = await analyze_video(tool, url, cache)
+        log.info("\n" + "="*80 + "\n")
+        log.info(result)
+        log.info("\n" + "="*80 + "\n")
     except Exception as e:
-        print(f"❌ Error: {str(e)}")
+        log.error(f"❌ Error: {str(e)}")
+
+
+def run(coro):
+    """Run a test coroutine, under the pyinstrument profiler if PROFILE is set"""
+    if not os.getenv("PROFILE"):
+        return run_async(coro)
+    
+    from pyinstrument import Profiler
+    
+    # async_mode attributes time spent awaiting to the awaiting coroutine
+    profiler = Profiler(async_mode="enabled")
+    with profiler:
+        result = run_async(coro)
+    log.info(profiler.output_text(unicode=True, color=True))
+    return result
 
 
 def main():
@@ -124,10 +228,10 @@ def main():
     if len(sys.argv) > 1:
         # Test specific video
         url = sys.argv[1]
-        asyncio.run(test_single_video(url))
+        run(test_single_video(url))
     else:
         # Run default tests
-        asyncio.run(test_enhanced_tool())
+        run(test_enhanced_tool())
 
 
 if __name__ == "__main__":
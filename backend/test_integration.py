@@ -1,14 +1,29 @@
 #!/usr/bin/env python3
 """Integration tests for new AI features"""
 
-import asyncio
 import sys
 import os
 from datetime import datetime
+from functools import lru_cache
 
 # Add backend to path
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
+from config import run_async
+
+
+@lru_cache(maxsize=1)
+def get_enhanced_agent():
+    """Create one feature-disabled EnhancedChatAgent shared by all tests"""
+    from agents.enhanced_chat_agent import EnhancedChatAgent
+    
+    return EnhancedChatAgent(
+        model_provider="anthropic",
+        enable_memory=False,  # Disable to avoid dependency issues
+        enable_workflows=False,
+        enable_threads=False
+    )
+
 
 def test_basic_app():
     """Test that basic app still works"""
@@ -37,12 +52,7 @@ def test_enhanced_agent():
         print("✓ EnhancedChatAgent imports successfully")
         
         # Test with all features disabled (should work like original)
-        agent = EnhancedChatAgent(
-            model_provider="anthropic",
-            enable_memory=False,
-            enable_workflows=False,
-            enable_threads=False
-        )
+        agent = get_enhanced_agent()
         print("✓ EnhancedChatAgent instantiates with features disabled")
         
         # Check feature status
@@ -189,15 +199,8 @@ async def test_async_features():
     print("\n=== Testing Async Features ===")
     
     try:
-        from agents.enhanced_chat_agent import EnhancedChatAgent
-        
-        # Create agent
-        agent = EnhancedChatAgent(
-            model_provider="anthropic",
-            enable_memory=False,  # Disable to avoid dependency issues
-            enable_workflows=False,
-            enable_threads=False
-        )
+        # Reuse the agent built by the sync tests
+        agent = get_enhanced_agent()
         
         print("✓ Created enhanced agent for async testing")
         
@@ -226,7 +229,7 @@ def main():
     results.append(("Parsing System", test_parsing_system()))
     
     # Run async tests
-    results.append(("Async Features", asyncio.run(test_async_features())))
+    results.append(("Async Features", run_async(test_async_features())))
     
     # Summary
     print("\n" + "=" * 50)
@@ -1,19 +1,18 @@
 #!/usr/bin/env python3
 """Test transcript storage and retrieval system"""
 
-import asyncio
 import sys
 import os
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-from dotenv import load_dotenv
-load_dotenv()
+from config import load_env, run_async
 
 from memory.transcript_store import TranscriptStore
 
 
 async def test_transcript_store():
     """Test transcript storage functionality"""
+    load_env()
     print("=== Testing Transcript Store ===\n")
     
     # Initialize store
@@ -133,4 +132,4 @@ async def test_transcript_store():
 
 
 if __name__ == "__main__":
-    asyncio.run(test_transcript_store())
\ No newline at end of file
+    run_async(test_transcript_store())
\ No newline at end of file
@@ -1,15 +1,14 @@
 #!/usr/bin/env python3
 """Test YouTube tool calling"""
-import asyncio
 import sys
 sys.path.insert(0, '.')
 
 from agents.chat_agent import ChatAgent
-from dotenv import load_dotenv
+from config import load_env, run_async
 
-load_dotenv()
 
 async def test_youtube():
+    load_env()
     agent = ChatAgent(model_provider="anthropic")
     
     print("Testing YouTube URL processing...")
@@ -32,4 +31,4 @@ async def test_youtube():
     print(full_text[:1000] + "..." if len(full_text) > 1000 else full_text)
 
 if __name__ == "__main__":
-    asyncio.run(test_youtube())
\ No newline at end of file
+    run_async(test_youtube())
\ No newline at end of file
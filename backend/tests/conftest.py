@@ -0,0 +1,34 @@
+"""Pytest configuration for backend tests"""
+
+import asyncio
+import os
+import sys
+
+import pytest
+
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
+
+# Make backend modules (workflows, memory, ...) importable at collection time
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+# Packages with relative imports across backend (threads) import as backend.*
+sys.path.insert(1, os.path.dirname(BACKEND_DIR))
+
+
+@pytest.fixture(scope="session", autouse=True)
+def uvloop_policy():
+    """Run the suite's event loops on uvloop when installed, restoring the policy after"""
+    if uvloop is None:
+        yield
+        return
+    
+    previous = asyncio.get_event_loop_policy()
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    try:
+        yield
+    finally:
+        asyncio.set_event_loop_policy(previous)
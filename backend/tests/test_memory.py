@@ -2,11 +2,6 @@
 
 import unittest
 from datetime import datetime, timedelta
-import sys
-import os
-
-# Add parent directory to path
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 try:
     from memory.short_term import ShortTermMemory, MemoryPriority, MemoryItem
@@ -79,6 +74,27 @@ class TestShortTermMemory(unittest.TestCase):
         context = self.memory.get_context_window()
         self.assertLessEqual(len(context), self.memory._max_context_size)
     
+    def test_bulk_add(self):
+        """Test adding a batch of memories"""
+        memory_ids = self.memory.bulk_add([
+            (f"Bulk {i}", MemoryPriority.LOW, {"index": i}) for i in range(7)
+        ])
+        
+        # Ids are unique and capacity still applies
+        self.assertEqual(len(set(memory_ids)), 7)
+        self.assertEqual(len(self.memory._memories), 5)
+        self.assertEqual(self.memory.get(memory_ids[-1]).metadata, {"index": 6})
+        self.assertEqual(self.memory.get_context_window()[-1], "Bulk 6")
+    
+    def test_clone_tail(self):
+        """Test cloning the most recent memories"""
+        ids = [self.memory.add(f"Message {i}", memory_id=f"m{i}") for i in range(4)]
+        
+        clone = self.memory.clone_tail(-2)
+        self.assertEqual([m.id for m in clone.get_all()], ids[-2:])
+        self.assertIsNone(clone.get("m0"))
+        self.assertEqual(clone.get_context_window(), ["Message 2", "Message 3"])
+    
     def test_decay(self):
         """Test time-based decay"""
         # Add old memory
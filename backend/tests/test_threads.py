@@ -0,0 +1,253 @@
+"""Tests for thread system"""
+
+import unittest
+import asyncio
+import gc
+import weakref
+from datetime import timedelta
+
+try:
+    from backend.threads.thread_manager import (
+        ThreadManager, ThreadStatus, ThreadPriority, Message,
+        _pack_columns, _unpack_columns, _tag_intern
+    )
+    THREADS_AVAILABLE = True
+except ImportError:
+    THREADS_AVAILABLE = False
+
+
+@unittest.skipIf(not THREADS_AVAILABLE, "Thread modules not available")
+class TestThreadManager(unittest.TestCase):
+    """Test thread manager functionality"""
+    
+    def setUp(self):
+        self.manager = ThreadManager(max_active_threads=3)
+    
+    def _create(self, title: str, topic: str = "general", **kwargs) -> str:
+        return self.manager.create_thread(title, topic, ["user"], **kwargs)
+    
+    def test_search_index(self):
+        """Test searching through the tag, status and token indices"""
+        cooking = self._create("Cooking", tags={"food"})
+        travel = self._create("Travel plans", tags={"trips"})
+        self.manager.threads[cooking].add_message("user", "The quick brown fox")
+        self.manager.threads[travel].add_message("user", "Flights to Lisbon")
+        
+        # Substrings may start and end mid-word
+        self.assertEqual([t.id for t in self.manager.search_threads("uick bro")], [cooking])
+        self.assertEqual([t.id for t in self.manager.search_threads("LISBON")], [travel])
+        self.assertEqual(self.manager.search_threads("quick lisbon"), [])
+        
+        self.assertEqual([t.id for t in self.manager.search_threads(tags={"trips"})], [travel])
+        self.assertEqual(len(self.manager.search_threads(tags={"food", "trips"})), 2)
+        
+        self.manager.threads[travel].pause()
+        self.assertEqual([t.id for t in self.manager.search_threads(status=ThreadStatus.PAUSED)], [travel])
+        self.assertEqual([t.id for t in self.manager.search_threads(status=ThreadStatus.ACTIVE)], [cooking])
+        
+        # Most recently active first
+        self.assertEqual([t.id for t in self.manager.search_threads()], [travel, cooking])
+    
+    def test_search_window(self):
+        """Test that messages leaving the search window leave the index"""
+        thread_id = self._create("Window")
+        thread = self.manager.threads[thread_id]
+        thread.add_message("user", "ancient history")
+        thread.bulk_add_messages([Message(f"m{i}", "user", f"filler {i}", i, {}) for i in range(10)])
+        
+        self.assertNotIn("ancient", self.manager._token_index)
+        self.assertEqual(self.manager.search_threads("ancient"), [])
+        self.assertEqual([t.id for t in self.manager.search_threads("ler 9")], [thread_id])
+        
+        thread.add_message("user", "brand new")
+        self.assertNotIn("0", self.manager._token_index)
+        
+        # Truncating brings older messages back into the window
+        thread.truncate_messages(5)
+        self.assertNotIn("brand", self.manager._token_index)
+        self.assertIn("ancient", self.manager._token_index)
+        self.assertEqual([t.id for t in self.manager.search_threads("ient hist")], [thread_id])
+        self.assertEqual(self.manager._index._vocab, sorted(self.manager._token_index))
+    
+    def test_bulk_search(self):
+        """Test matching several queries in one pass"""
+        thread_id = self._create("Weekly sync", topic="planning")
+        self.manager.threads[thread_id].add_message("user", "Agenda items")
+        
+        results = self.manager.bulk_search(["SYNC", "agenda", "missing", ""])
+        self.assertEqual([t.id for t in results["SYNC"]], [thread_id])
+        self.assertEqual([t.id for t in results["agenda"]], [thread_id])
+        self.assertEqual(results["missing"], [])
+        self.assertEqual([t.id for t in results[""]], [thread_id])
+    
+    def test_active_lru(self):
+        """Test that the least recently used thread is archived past capacity"""
+        first, second, third = (self._create(f"Thread {i}") for i in range(3))
+        self.assertTrue(self.manager.switch_thread(first))
+        
+        fourth = self._create("Thread 3")
+        self.assertEqual(self.manager.threads[second].status, ThreadStatus.ARCHIVED)
+        self.assertEqual(list(self.manager.active_thread_ids), [third, first, fourth])
+        
+        # Archived threads cannot be switched to
+        self.assertFalse(self.manager.switch_thread(second))
+    
+    def test_archive_packing(self):
+        """Test that archived messages are packed and restored intact"""
+        thread_id = self._create("Archive me", tags={"a", "b"})
+        thread = self.manager.threads[thread_id]
+        thread.add_message("user", "Hello", {"span": (1, 2), "ids": [3, 4]})
+        thread.add_message("assistant", "Hi there")
+        before = thread.get_messages()
+        
+        self.manager.archive_thread(thread_id)
+        self.assertIsNotNone(thread._packed)
+        self.assertEqual(thread.msg_ids, [])
+        self.assertEqual(thread.get_messages(), before)
+        self.assertEqual(thread.get_messages()[0].metadata["span"], (1, 2))
+        
+        # Short-term memory survives archiving
+        self.assertEqual(len(thread.short_term_memory.get_all()), 2)
+        
+        # New messages unpack the columns first
+        thread.add_message("user", "Back again")
+        self.assertIsNone(thread._packed)
+        self.assertEqual(thread.get_messages()[:2], before)
+        self.assertEqual(thread.message_count, 3)
+    
+    def test_export_keeps_memory_lazy(self):
+        """Test that exporting a thread without memories does not allocate one"""
+        thread_id = self._create("Quiet")
+        thread = self.manager.threads[thread_id]
+        
+        exported = self.manager.export_thread(thread_id)
+        self.assertIsNone(thread._short_term_memory)
+        self.assertEqual(exported["memory_stats"], thread.short_term_memory.get_statistics())
+    
+    def test_pack_columns(self):
+        """Test that packing preserves value types"""
+        columns = [["id"], [{"pair": (1, (2, "x")), "list": [1, 2], (3, 4): "key"}]]
+        self.assertEqual(_unpack_columns(_pack_columns(columns)), columns)
+        
+        # Values msgpack cannot encode fall back to pickle
+        columns = [[{"big": 2 ** 70, "set": {1, 2}}]]
+        self.assertEqual(_unpack_columns(_pack_columns(columns)), columns)
+    
+    def test_tag_intern(self):
+        """Test that equal frozen tag sets are shared while in use"""
+        first = self._create("First", tags={"shared"})
+        second = self._create("Second", tags={"shared"})
+        self.manager.threads[first].complete()
+        self.manager.threads[second].complete()
+        
+        tags = self.manager.threads[first].context.tags
+        self.assertIs(tags, self.manager.threads[second].context.tags)
+        self.assertEqual(tags, {"shared"})
+        
+        # Adding a tag thaws the set for that thread only
+        self.manager.threads[first].context.add_tag("extra")
+        self.assertEqual(self.manager.threads[second].context.tags, {"shared"})
+        
+        key = frozenset({"shared"})
+        self.assertIn(key, _tag_intern)
+        self.manager = None
+        del tags
+        gc.collect()
+        self.assertNotIn(key, _tag_intern)
+    
+    def test_split_thread(self):
+        """Test splitting messages and their memories into a new thread"""
+        thread_id = self._create("Original", tags={"x"})
+        thread = self.manager.threads[thread_id]
+        thread.memory_capacity = 3
+        for i in range(6):
+            thread.add_message("user" if i % 2 else "assistant", f"Message {i}")
+        
+        new_id = self.manager.split_thread(thread_id, 4, "Split", "side topic")
+        new_thread = self.manager.threads[new_id]
+        
+        self.assertEqual([m.content for m in thread.get_messages()], [f"Message {i}" for i in range(4)])
+        self.assertEqual([m.content for m in new_thread.get_messages()], ["Message 4", "Message 5"])
+        self.assertEqual(new_thread.context.parent_thread_id, thread_id)
+        self.assertIn(new_id, self.manager.get_thread_relationships(thread_id)["related"])
+        
+        # Priority eviction kept user messages only, so just "Message 5"
+        # follows the split, pointing at its message in the new thread
+        memories = new_thread.short_term_memory.get_all()
+        self.assertEqual([m.content for m in memories], ["Message 5"])
+        self.assertEqual(memories[0].metadata["message_id"], new_thread.msg_ids[1])
+        self.assertEqual(memories[0].metadata["thread_id"], new_id)
+        
+        with self.assertRaises(ValueError):
+            self.manager.split_thread(thread_id, 10, "Too far", "none")
+    
+    def test_merge_threads(self):
+        """Test merging threads in timestamp order"""
+        first = self._create("First", tags={"a"}, priority=ThreadPriority.HIGH)
+        second = self._create("Second", tags={"b"})
+        self.manager.threads[first].bulk_add_messages([
+            Message("m1", "user", "one", 1, {}),
+            Message("m3", "user", "three", 3, {})
+        ])
+        self.manager.threads[second].bulk_add_messages([Message("m2", "user", "two", 2, {})])
+        
+        merged_id = self.manager.merge_threads([first, second], "Merged")
+        merged = self.manager.threads[merged_id]
+        
+        self.assertEqual([m.content for m in merged.get_messages()], ["one", "two", "three"])
+        self.assertEqual(merged.get_messages()[1].metadata["original_thread_id"], second)
+        self.assertEqual(merged.priority, ThreadPriority.HIGH)
+        self.assertEqual(merged.context.tags, {"a", "b"})
+        for thread_id in (first, second):
+            self.assertEqual(self.manager.threads[thread_id].status, ThreadStatus.ARCHIVED)
+            self.assertEqual(self.manager.threads[thread_id].context.metadata["merged_into"], merged_id)
+        
+        with self.assertRaises(ValueError):
+            self.manager.merge_threads([first], "Alone")
+
+    def test_merge_at_capacity(self):
+        """Test that a source archived by the merged thread keeps its messages"""
+        first, second, third = (self._create(f"Thread {i}") for i in range(3))
+        self.manager.threads[first].add_message("user", "from A")
+        self.manager.threads[second].add_message("user", "from B")
+        
+        merged_id = self.manager.merge_threads([first, second], "Merged")
+        merged = self.manager.threads[merged_id]
+        
+        self.assertEqual([m.content for m in merged.get_messages()], ["from A", "from B"])
+        self.assertEqual([m.content for m in self.manager.threads[first].get_messages()], ["from A"])
+
+
+@unittest.skipIf(not THREADS_AVAILABLE, "Thread modules not available")
+class TestThreadScheduler(unittest.IsolatedAsyncioTestCase):
+    """Test automatic archival through the shared scheduler"""
+    
+    async def test_auto_archive(self):
+        """Test that inactive threads are archived and paused ones are kept"""
+        manager = ThreadManager(auto_archive_after=timedelta(milliseconds=20))
+        idle = manager.create_thread("Idle", "general", ["user"])
+        paused = manager.create_thread("Paused", "general", ["user"])
+        manager.threads[paused].pause()
+        
+        await manager.start_cleanup()
+        await asyncio.sleep(0.1)
+        await manager.stop_cleanup()
+        
+        self.assertEqual(manager.threads[idle].status, ThreadStatus.ARCHIVED)
+        self.assertEqual(manager.threads[paused].status, ThreadStatus.PAUSED)
+    
+    async def test_stopped_manager_released(self):
+        """Test that pending expiry checks do not keep a manager alive"""
+        manager = ThreadManager()
+        manager.create_thread("Thread", "general", ["user"])
+        await manager.start_cleanup()
+        await manager.stop_cleanup()
+        
+        ref = weakref.ref(manager)
+        del manager
+        gc.collect()
+        self.assertIsNone(ref())
+
+
+if __name__ == "__main__":
+    unittest.main()
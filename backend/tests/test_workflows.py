@@ -2,23 +2,27 @@
 
 import unittest
 import asyncio
+import json
 from datetime import datetime, timedelta
-import sys
-import os
-
-# Add parent directory to path
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from typing import Any, Dict
 
 try:
     from workflows.engine import (
-        WorkflowEngine, WorkflowState, WorkflowStatus,
-        WorkflowNode, ConditionalNode, WorkflowBuilder
+        WorkflowEngine, WorkflowState, WorkflowStatus, NodeStatus,
+        WorkflowNode, ConditionalNode, WorkflowBuilder, LLMNode,
+        WorkflowStatePool, ParallelNode, compile_template
     )
+    from workflows.llm_cache import LLMCache
     from workflows.orchestrator import WorkflowOrchestrator, WorkflowInstance
     WORKFLOW_AVAILABLE = True
 except ImportError:
     WORKFLOW_AVAILABLE = False
 
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
 
 class MockNode(WorkflowNode):
     """Mock node for testing"""
@@ -28,18 +32,40 @@ class MockNode(WorkflowNode):
         self.result = result
         self.should_fail = should_fail
         self.executed = False
+        # Built once so execute() does no per-call formatting
+        self._payload = {"result": result or f"Result from {name}"}
     
     async def execute(self, state: WorkflowState) -> Dict[str, Any]:
         self.executed = True
         if self.should_fail:
             raise Exception("Mock node failure")
-        return {"result": self.result or f"Result from {self.name}"}
+        return self._payload
+
+
+class MockLLM:
+    """Mock LLM that counts calls"""
+    
+    def __init__(self, temperature: float = 0.0):
+        self.model = "mock-model"
+        self.temperature = temperature
+        self.calls = 0
+        self.inputs = []
+    
+    async def ainvoke(self, prompt: str):
+        self.calls += 1
+        self.inputs.append(prompt)
+        return type("Response", (), {"content": f"Echo: {prompt}"})()
 
 
 @unittest.skipIf(not WORKFLOW_AVAILABLE, "Workflow modules not available")
-class TestWorkflowEngine(unittest.TestCase):
+class TestWorkflowEngine(unittest.IsolatedAsyncioTestCase):
     """Test workflow engine functionality"""
     
+    async def asyncSetUp(self):
+        # Python 3.12+: run tasks inline until their first real suspension
+        if hasattr(asyncio, "eager_task_factory"):
+            asyncio.get_running_loop().set_task_factory(asyncio.eager_task_factory)
+    
     def test_workflow_creation(self):
         """Test creating a workflow"""
         engine = WorkflowEngine("test_workflow", "Test workflow")
@@ -59,6 +85,10 @@ class TestWorkflowEngine(unittest.TestCase):
         self.assertEqual(len(engine.nodes), 2)
         self.assertIn("node1", engine.nodes)
         self.assertIn("node2", engine.nodes)
+        
+        # Nodes are keyed by name for O(1) lookup
+        self.assertIs(engine.nodes["node1"], node1)
+        self.assertIs(engine.nodes["node2"], node2)
     
     def test_workflow_state(self):
         """Test workflow state management"""
@@ -81,39 +111,323 @@ class TestWorkflowEngine(unittest.TestCase):
         state.add_error("node1", "Test error", {"code": 500})
         self.assertEqual(len(state.errors), 1)
         self.assertEqual(state.errors[0]["error"], "Test error")
+        self.assertEqual(
+            datetime.fromisoformat(state.errors[0]["timestamp"]).date(),
+            state.created_at.date()
+        )
+        self.assertIn("timestamp", json.loads(json.dumps(state.errors[0])))
+        self.assertGreaterEqual(state.updated_at, state.created_at)
+    
+    def test_state_pool(self):
+        """Test that pooled states are reused and reset"""
+        pool = WorkflowStatePool(max_size=1)
+        
+        state = pool.get("wf_1", {"a": 1})
+        state.set_result("node1", "done")
+        state.add_error("node1", "boom")
+        results = state.results
+        pool.put(state)
+        pool.put(WorkflowState(workflow_id="extra", status=WorkflowStatus.PENDING, current_node=None))
+        
+        reused = pool.get("wf_2", {"b": 2})
+        self.assertIs(reused, state)
+        # Containers are fresh, so earlier holders keep their contents
+        self.assertIsNot(reused.results, results)
+        self.assertEqual(results, {"node1": "done"})
+        self.assertEqual(reused.workflow_id, "wf_2")
+        self.assertEqual(reused.status, WorkflowStatus.PENDING)
+        self.assertEqual(reused.context, {"b": 2})
+        self.assertEqual(reused.results, {})
+        self.assertEqual(reused.errors, [])
+        
+        # Pool is capped at max_size, so the next get allocates
+        self.assertIsNot(pool.get("wf_3"), state)
     
     @unittest.skipIf(not WORKFLOW_AVAILABLE, "Requires async support")
-    def test_workflow_execution(self):
+    async def test_workflow_execution(self):
         """Test workflow execution"""
-        async def run_test():
-            # Create workflow
-            engine = WorkflowEngine("test_workflow")
-            
-            # Add nodes
-            node1 = MockNode("node1", result="Result 1")
-            node2 = MockNode("node2", result="Result 2")
-            
-            engine.add_node(node1)
-            engine.add_node(node2)
-            
-            # Build and compile
+        # Create workflow
+        engine = WorkflowEngine("test_workflow")
+        
+        # Add nodes
+        node1 = MockNode("node1", result="Result 1")
+        node2 = MockNode("node2", result="Result 2")
+        
+        engine.add_node(node1)
+        engine.add_node(node2)
+        
+        # Build and compile
+        engine.build()
+        engine.set_entry_point("node1")
+        engine.add_edge("node1", "node2")
+        engine.compile()
+        
+        # Execute
+        state = await engine.execute({"test": "data"})
+        
+        # Verify execution
+        self.assertTrue(node1.executed)
+        self.assertTrue(node2.executed)
+        self.assertEqual(state.status, WorkflowStatus.COMPLETED)
+        self.assertIn("node1", state.results)
+        self.assertIn("node2", state.results)
+    
+    async def test_repeated_execution_keeps_results(self):
+        """Test that a later run does not overwrite an earlier run's state"""
+        engine = WorkflowEngine("test_workflow")
+        engine.add_node(MockNode("node1", result="Result 1"))
+        engine.build()
+        engine.set_entry_point("node1")
+        engine.compile(use_cache=False)
+        
+        first = await engine.execute({"run": 1})
+        first_results = dict(first.results)
+        first_visited = list(first.visited_nodes)
+        
+        second = await engine.execute({"run": 2})
+        
+        self.assertEqual(first.results, first_results)
+        self.assertEqual(first.visited_nodes, first_visited)
+        self.assertEqual(first.context["run"], 1)
+        self.assertEqual(second.context["run"], 2)
+        self.assertIsNot(first.results, second.results)
+    
+    def test_compile_template(self):
+        """Test that compiled templates render like str.format"""
+        context = {"topic": "cats", "count": 3.14159, "items": ["a", "b"]}
+        for template in [
+            "Summarize {topic} in {count:.2f} words {{literally}} 'quoted' \\",
+            "{items!r} {topic}{topic}",
+            "First item: {items[0]}"
+        ]:
+            self.assertEqual(compile_template(template)(context), template.format(**context))
+        
+        with self.assertRaises(KeyError):
+            compile_template("{missing}")(context)
+        
+        # Renderers are compiled once per template
+        self.assertIs(compile_template("{topic}"), compile_template("{topic}"))
+    
+    async def test_llm_prompt_defaults(self):
+        """Test that missing template fields fall back to node defaults"""
+        llm = MockLLM()
+        node = LLMNode("llm", llm, "{topic} ({tone})", prompt_defaults={"tone": "neutral"})
+        
+        for context, expected in [
+            ({"topic": "cats"}, "cats (neutral)"),
+            ({"topic": "cats", "tone": "funny"}, "cats (funny)")
+        ]:
+            state = WorkflowState(
+                workflow_id="wf", status=WorkflowStatus.RUNNING,
+                current_node=None, context=context
+            )
+            await node.execute(state)
+            self.assertEqual(llm.inputs[-1], expected)
+    
+    async def test_llm_cache(self):
+        """Test that repeated deterministic prompts are served from cache"""
+        cache = LLMCache()
+        llm = MockLLM()
+        node = LLMNode("llm", llm, "Summarize {topic}", cache=cache)
+        
+        for _ in range(3):
+            state = WorkflowState(
+                workflow_id="wf", status=WorkflowStatus.RUNNING,
+                current_node=None, context={"topic": "cats"}
+            )
+            result = await node.execute(state)
+        
+        self.assertEqual(llm.calls, 1)
+        self.assertEqual(result["response"], "Echo: Summarize cats")
+        self.assertEqual([m.content for m in state.messages], ["Summarize cats", "Echo: Summarize cats"])
+        self.assertEqual(cache.stats["hits"], 2)
+        self.assertEqual(cache.stats["misses"], 1)
+        
+        # Sampling above the threshold bypasses the cache
+        hot_llm = MockLLM(temperature=0.7)
+        hot_node = LLMNode("hot", hot_llm, "Summarize {topic}", cache=cache)
+        for _ in range(2):
+            state = WorkflowState(
+                workflow_id="wf", status=WorkflowStatus.RUNNING,
+                current_node=None, context={"topic": "cats"}
+            )
+            await hot_node.execute(state)
+        self.assertEqual(hot_llm.calls, 2)
+        
+        engine = WorkflowEngine("test_workflow")
+        engine.add_node(node)
+        engine.add_node(hot_node)
+        self.assertEqual(engine.get_metrics()["llm_cache"]["hits"], 2)
+    
+    @unittest.skipIf(numpy is None, "numpy not available")
+    async def test_llm_cache_similarity(self):
+        """Test near-duplicate prompts hitting the quantized similarity tier"""
+        vectors = {"a": [1.0, 0.1, 0.0], "b": [1.0, 0.12, 0.0], "c": [0.0, 0.0, 1.0]}
+        
+        embedded = []
+        
+        async def embed(prompt: str):
+            embedded.append(prompt)
+            return vectors[prompt]
+        
+        cache = LLMCache(embed=embed, similarity_threshold=0.95)
+        scope = ("m", None)
+        await cache.set(LLMCache.make_key("m", "a", None), "a", "cached", scope, similar=True)
+        self.assertEqual(cache._vectors[scope].vectors.dtype, numpy.int8)
+        
+        # The tier is opt-in per lookup and never crosses scopes
+        self.assertIsNone(await cache.get(LLMCache.make_key("m", "b", None), "b"))
+        self.assertIsNone(await cache.get(LLMCache.make_key("n", "b", None), "b", ("n", None), similar=True))
+        
+        self.assertEqual(await cache.get(LLMCache.make_key("m", "b", None), "b", scope, similar=True), "cached")
+        self.assertIsNone(await cache.get(LLMCache.make_key("m", "c", None), "c", scope, similar=True))
+        self.assertEqual(cache.stats["similar_hits"], 1)
+        
+        # Storing after a miss reuses the embedding computed by the lookup
+        await cache.set(LLMCache.make_key("m", "c", None), "c", "other", scope, similar=True)
+        self.assertEqual(embedded, ["a", "b", "c"])
+        self.assertEqual(await cache.get(LLMCache.make_key("m", "x", None), "c", scope, similar=True), "other")
+    
+    async def test_llm_system_prompt(self):
+        """Test that static instructions are sent as a shared system message"""
+        llm = MockLLM()
+        node = LLMNode("llm", llm, "Topic: {topic}", system_prompt="Summarize the topic.")
+        
+        for topic in ("cats", "dogs"):
+            state = WorkflowState(
+                workflow_id="wf", status=WorkflowStatus.RUNNING,
+                current_node=None, context={"topic": topic}
+            )
+            await node.execute(state)
+        
+        first, second = llm.inputs
+        self.assertIs(first[0], second[0])
+        self.assertEqual(first[0].content, "Summarize the topic.")
+        self.assertEqual(second[1].content, "Topic: dogs")
+        self.assertEqual(state.messages[0].content, "Topic: dogs")
+    
+    async def test_node_runtime_per_state(self):
+        """Test that retries are tracked on the state, not the shared node"""
+        class FlakyNode(MockNode):
+            async def execute(self, state: WorkflowState) -> Dict[str, Any]:
+                if not state.errors:
+                    raise Exception("Transient failure")
+                return await super().execute(state)
+        
+        engine = WorkflowEngine("test_workflow")
+        engine.add_node(FlakyNode("flaky"))
+        engine.build()
+        engine.set_entry_point("flaky")
+        engine.compile()
+        
+        first, second = await asyncio.gather(engine.execute(), engine.execute())
+        for state in (first, second):
+            runtime = state.node_runtime["flaky"]
+            self.assertEqual(runtime["retry_count"], 1)
+            self.assertEqual(runtime["status"], NodeStatus.COMPLETED)
+    
+    async def test_parallel_node(self):
+        """Test running independent nodes concurrently"""
+        # Counts branches in flight instead of timing them, so the test does
+        # not depend on machine load
+        running = {"now": 0, "peak": 0}
+        
+        class SlowNode(MockNode):
+            async def execute(self, state: WorkflowState) -> Dict[str, Any]:
+                running["now"] += 1
+                running["peak"] = max(running["peak"], running["now"])
+                try:
+                    await asyncio.sleep(0.01)
+                finally:
+                    running["now"] -= 1
+                return await super().execute(state)
+        
+        node = ParallelNode("fan_out", [SlowNode(f"branch{i}", result=i) for i in range(3)])
+        state = WorkflowState(workflow_id="wf", status=WorkflowStatus.RUNNING, current_node=None)
+        await node.execute(state)
+        
+        # Branches overlap rather than running back to back
+        self.assertEqual(running["peak"], 3)
+        
+        # max_parallel caps how many branches run at once
+        running["peak"] = 0
+        node = ParallelNode("capped", [SlowNode(f"branch{i}") for i in range(3)], max_parallel=1)
+        await node.execute(state)
+        self.assertEqual(running["peak"], 1)
+        self.assertEqual(state.results["fan_out.branch2"], {"result": 2})
+        self.assertEqual(state.node_runtime["fan_out.branch0"]["status"], NodeStatus.COMPLETED)
+        
+        # A branch out of retries cancels its in-flight siblings
+        slow = SlowNode("slow")
+        failing = MockNode("failing", should_fail=True)
+        failing.MAX_RETRIES = 0
+        node = ParallelNode("failfast", [slow, failing])
+        with self.assertRaisesRegex(Exception, "Mock node failure"):
+            await node.execute(state)
+        self.assertFalse(slow.executed)
+        self.assertEqual(state.node_runtime["failfast.failing"]["status"], NodeStatus.FAILED)
+        
+        # In a workflow, a failed branch does not re-run its finished siblings
+        runs = []
+        
+        class CountingNode(MockNode):
+            async def execute(self, state: WorkflowState) -> Dict[str, Any]:
+                runs.append(self.name)
+                return await super().execute(state)
+        
+        engine = WorkflowEngine("parallel_workflow")
+        engine.add_node(ParallelNode("fan_out", [CountingNode("done"), failing]))
+        engine.build()
+        engine.set_entry_point("fan_out")
+        engine.compile(use_cache=False)
+        with self.assertRaisesRegex(Exception, "Mock node failure"):
+            await engine.execute()
+        self.assertEqual(runs, ["done"])
+    
+    async def test_workflow_stream(self):
+        """Test streaming node updates and reusing cacheable node results"""
+        engine = WorkflowEngine("test_workflow")
+        node1 = MockNode("node1", result="Result 1")
+        node1.cacheable = True
+        node2 = MockNode("node2", result="Result 2")
+        engine.add_node(node1)
+        engine.add_node(node2)
+        engine.build()
+        engine.set_entry_point("node1")
+        engine.add_edge("node1", "node2")
+        engine.compile()
+        
+        updates = [name async for name, _ in engine.stream({"test": "data"})]
+        self.assertEqual(updates[:2], ["node1", "node2"])
+        self.assertEqual(len(updates), 3)
+        
+        # Same context again: node1 comes from the cache, node2 reruns
+        node1.executed = node2.executed = False
+        state = await engine.execute({"test": "data"})
+        self.assertFalse(node1.executed)
+        self.assertTrue(node2.executed)
+        self.assertEqual(state.results["node1"], {"result": "Result 1"})
+    
+    async def test_compiled_graph_sharing(self):
+        """Test that engines with the same topology share a compiled graph"""
+        engines = []
+        for result in ("First", "Second"):
+            engine = WorkflowEngine("shared_workflow")
+            engine.add_node(MockNode("node1", result=result))
             engine.build()
             engine.set_entry_point("node1")
-            engine.add_edge("node1", "node2")
             engine.compile()
-            
-            # Execute
-            state = await engine.execute({"test": "data"})
-            
-            # Verify execution
-            self.assertTrue(node1.executed)
-            self.assertTrue(node2.executed)
-            self.assertEqual(state.status, WorkflowStatus.COMPLETED)
-            self.assertIn("node1", state.results)
-            self.assertIn("node2", state.results)
-        
-        # Run async test
-        asyncio.run(run_test())
+            engines.append(engine)
+        
+        self.assertIs(engines[0].compiled_graph, engines[1].compiled_graph)
+        
+        # Each engine still runs its own nodes, even under the same workflow id
+        first, second = await asyncio.gather(
+            engines[0].execute(workflow_id="same_id"),
+            engines[1].execute(workflow_id="same_id")
+        )
+        self.assertEqual(first.results["node1"], {"result": "First"})
+        self.assertEqual(second.results["node1"], {"result": "Second"})
     
     def test_workflow_builder(self):
         """Test workflow builder pattern"""
@@ -123,6 +437,27 @@ class TestWorkflowEngine(unittest.TestCase):
         # Verify builder creates engine
         self.assertIsInstance(builder.engine, WorkflowEngine)
         self.assertEqual(builder.engine.name, "test_workflow")
+    
+    async def test_builder_conditional(self):
+        """Test building a conditional workflow and validating its branches"""
+        builder = WorkflowBuilder("conditional_workflow")
+        builder.add_llm_node("ask", MockLLM(), "Question about {topic}")
+        builder.add_conditional(
+            "route",
+            lambda state: "long" if len(state.context["response"]) > 10 else "short",
+            {"long": "summarize", "short": None}
+        )
+        builder.engine.add_node(MockNode("summarize"))
+        engine = builder.build()
+        
+        state = await engine.execute({"topic": "cats"})
+        self.assertEqual(state.visited_nodes, ["ask", "route", "summarize"])
+        
+        # Branches pointing at missing nodes fail at build time
+        builder = WorkflowBuilder("broken_workflow")
+        builder.add_conditional("route", lambda state: "next", {"next": "missing"})
+        with self.assertRaises(ValueError):
+            builder.build()
 
 
 @unittest.skipIf(not WORKFLOW_AVAILABLE, "Workflow modules not available")
@@ -138,6 +473,24 @@ class TestWorkflowOrchestrator(unittest.TestCase):
         self.orchestrator.register_workflow(workflow)
         
         self.assertIn("test_workflow", self.orchestrator.registered_workflows)
+        self.assertIs(self.orchestrator.registered_workflows["test_workflow"], workflow)
+    
+    def test_registration_compiles_workflow(self):
+        """Test that registering a built workflow compiles it once"""
+        workflow = WorkflowEngine("test_workflow")
+        workflow.add_node(MockNode("node1"))
+        workflow.add_node(MockNode("node2"))
+        workflow.build()
+        workflow.set_entry_point("node1")
+        workflow.add_edge("node1", "node2")
+        
+        self.orchestrator.register_workflow(workflow)
+        compiled_graph = workflow.compiled_graph
+        self.assertIsNotNone(compiled_graph)
+        
+        # Scheduling reuses the compiled graph
+        self.orchestrator.schedule_workflow("test_workflow")
+        self.assertIs(workflow.compiled_graph, compiled_graph)
     
     def test_workflow_scheduling(self):
         """Test scheduling workflows"""
@@ -153,7 +506,7 @@ class TestWorkflowOrchestrator(unittest.TestCase):
         )
         
         self.assertIsNotNone(instance_id)
-        self.assertEqual(len(self.orchestrator.workflow_queue), 1)
+        self.assertEqual(self.orchestrator.get_queue_status()["queued"], 1)
         
         # Check scheduled workflow
         status = self.orchestrator.get_status(instance_id)
@@ -170,11 +523,136 @@ class TestWorkflowOrchestrator(unittest.TestCase):
         medium_id = self.orchestrator.schedule_workflow("test_workflow", priority=2)
         
         # Check queue order (high priority first)
-        queue = self.orchestrator.workflow_queue
+        queue = [entry[-1] for entry in sorted(self.orchestrator.workflow_queue)]
         self.assertEqual(queue[0].priority, 3)
         self.assertEqual(queue[1].priority, 2)
         self.assertEqual(queue[2].priority, 1)
     
+    def test_delayed_scheduling(self):
+        """Test that future workflows wait outside the ready queue"""
+        workflow = WorkflowEngine("test_workflow")
+        self.orchestrator.register_workflow(workflow)
+        
+        later_id = self.orchestrator.schedule_workflow(
+            "test_workflow",
+            priority=3,
+            scheduled_time=datetime.now() + timedelta(hours=1)
+        )
+        now_id = self.orchestrator.schedule_workflow("test_workflow", priority=1)
+        
+        # Only the due workflow is in the ready heap
+        ready = [entry[-1].id for entry in self.orchestrator.workflow_queue]
+        self.assertEqual(ready, [now_id])
+        
+        # Both are still reported as queued
+        self.assertEqual(self.orchestrator.get_queue_status()["queued"], 2)
+        self.assertEqual(self.orchestrator.get_status(later_id), WorkflowStatus.PENDING)
+    
+    def test_completed_retention(self):
+        """Test that completed workflows are bounded"""
+        evicted = []
+        orchestrator = WorkflowOrchestrator(completed_retention=2, completion_sink=evicted.append)
+        
+        for i in range(3):
+            state = WorkflowState(workflow_id=f"wf_{i}", status=WorkflowStatus.COMPLETED, current_node=None)
+            orchestrator._record_completed(WorkflowInstance(id=f"wf_{i}", workflow_name="test", state=state))
+        
+        self.assertEqual(list(orchestrator.completed_workflows), ["wf_1", "wf_2"])
+        self.assertEqual([instance.id for instance in evicted], ["wf_0"])
+        self.assertIsNone(orchestrator.get_status("wf_0"))
+        self.assertEqual(orchestrator.get_status("wf_2"), WorkflowStatus.COMPLETED)
+        
+        # Evicted instances still count as finished dependencies
+        orchestrator.register_workflow(WorkflowEngine("test"))
+        child_id = orchestrator.schedule_workflow("test", dependencies=["wf_0"])
+        self.assertEqual([entry[-1].id for entry in orchestrator.workflow_queue], [child_id])
+        
+        # Finished flags are bounded too; older ids become unknown
+        orchestrator = WorkflowOrchestrator(completed_retention=1, finished_retention=2)
+        for i in range(3):
+            state = WorkflowState(workflow_id=f"wf_{i}", status=WorkflowStatus.COMPLETED, current_node=None)
+            orchestrator._record_completed(WorkflowInstance(id=f"wf_{i}", workflow_name="test", state=state))
+        
+        self.assertEqual(list(orchestrator._finished), ["wf_1", "wf_2"])
+        orchestrator.register_workflow(WorkflowEngine("test"))
+        orchestrator.schedule_workflow("test", dependencies=["wf_1"])
+        with self.assertRaises(ValueError):
+            orchestrator.schedule_workflow("test", dependencies=["wf_0"])
+    
+    def test_workflow_timeout(self):
+        """Test that a timed out workflow is not completed when it finishes later"""
+        class SlowNode(MockNode):
+            async def execute(self, state: WorkflowState) -> Dict[str, Any]:
+                await asyncio.sleep(0.2)
+                return await super().execute(state)
+        
+        workflow = WorkflowEngine("test_workflow")
+        workflow.add_node(SlowNode("slow"))
+        workflow.build()
+        workflow.set_entry_point("slow")
+        self.orchestrator.register_workflow(workflow)
+        
+        events = []
+        for event_type in ("workflow_timeout", "workflow_completed", "workflow_failed"):
+            self.orchestrator.on_event(event_type, lambda event_type, instance: events.append(event_type))
+        
+        instance_id = self.orchestrator.schedule_workflow("test_workflow", timeout=timedelta(milliseconds=50))
+        
+        async def run():
+            await self.orchestrator.start()
+            await asyncio.sleep(0.4)
+            await self.orchestrator.stop()
+        asyncio.run(run())
+        
+        self.assertEqual(events, ["workflow_timeout"])
+        self.assertEqual(self.orchestrator.get_status(instance_id), WorkflowStatus.FAILED)
+        self.assertEqual(self.orchestrator.metrics.completed, 0)
+    
+    def test_dependency_scheduling(self):
+        """Test that dependent workflows run after their dependencies"""
+        workflow = WorkflowEngine("test_workflow")
+        workflow.add_node(MockNode("node1"))
+        workflow.build()
+        workflow.set_entry_point("node1")
+        self.orchestrator.register_workflow(workflow)
+        
+        completed = []
+        self.orchestrator.on_event("workflow_completed", lambda event_type, instance: completed.append(instance.id))
+        
+        parent_id = self.orchestrator.schedule_workflow("test_workflow", priority=1)
+        child_id = self.orchestrator.schedule_workflow("test_workflow", priority=3, dependencies=[parent_id])
+        
+        # The child waits outside the ready heap despite its higher priority
+        ready = [entry[-1].id for entry in self.orchestrator.workflow_queue]
+        self.assertEqual(ready, [parent_id])
+        
+        async def run():
+            await self.orchestrator.start()
+            for _ in range(100):
+                if self.orchestrator.get_status(child_id) == WorkflowStatus.COMPLETED:
+                    break
+                await asyncio.sleep(0.01)
+            await self.orchestrator.stop()
+        asyncio.run(run())
+        
+        self.assertEqual(completed, [parent_id, child_id])
+        
+        with self.assertRaises(ValueError):
+            self.orchestrator.schedule_workflow("test_workflow", dependencies=["missing"])
+    
+    def test_dependency_failure(self):
+        """Test that dependents fail when a dependency is cancelled"""
+        workflow = WorkflowEngine("test_workflow")
+        self.orchestrator.register_workflow(workflow)
+        
+        parent_id = self.orchestrator.schedule_workflow("test_workflow")
+        child_id = self.orchestrator.schedule_workflow("test_workflow", dependencies=[parent_id])
+        self.assertEqual(self.orchestrator.get_queue_status()["queued"], 2)
+        
+        self.orchestrator.cancel_workflow(parent_id)
+        self.assertEqual(self.orchestrator.get_status(child_id), WorkflowStatus.FAILED)
+        self.assertEqual(self.orchestrator.get_queue_status()["queued"], 0)
+    
     def test_workflow_cancellation(self):
         """Test cancelling workflows"""
         workflow = WorkflowEngine("test_workflow")
@@ -187,7 +665,83 @@ class TestWorkflowOrchestrator(unittest.TestCase):
         self.assertTrue(success)
         
         # Check it's removed from queue
-        self.assertEqual(len(self.orchestrator.workflow_queue), 0)
+        self.assertEqual(self.orchestrator.get_queue_status()["queued"], 0)
+        self.assertEqual(self.orchestrator.get_status(instance_id), WorkflowStatus.CANCELLED)
+        self.assertFalse(self.orchestrator.cancel_workflow(instance_id))
+    
+    def test_event_dispatch(self):
+        """Test that events reach sync and async handlers through the consumer"""
+        received = []
+        
+        async def async_handler(event_type, data):
+            received.append(("async", event_type))
+        
+        self.orchestrator.on_event("workflow_scheduled", lambda event_type, data: received.append(("sync", event_type)))
+        self.orchestrator.on_event("workflow_scheduled", async_handler)
+        self.orchestrator.register_workflow(WorkflowEngine("test_workflow"))
+        self.orchestrator.schedule_workflow("test_workflow")
+        
+        # Nothing runs until the orchestrator's consumer does
+        self.assertEqual(received, [])
+        
+        async def run():
+            await self.orchestrator.start()
+            await self.orchestrator.stop()
+        asyncio.run(run())
+        
+        self.assertEqual(received, [("sync", "workflow_scheduled"), ("async", "workflow_scheduled")])
+    
+    def test_stop_with_slow_handler(self):
+        """Test that a handler that never returns does not hang stop()"""
+        orchestrator = WorkflowOrchestrator(event_drain_timeout=0.05)
+        
+        async def stuck_handler(event_type, data):
+            await asyncio.Event().wait()
+        
+        orchestrator.on_event("orchestrator_started", stuck_handler)
+        
+        async def run():
+            await orchestrator.start()
+            await asyncio.wait_for(orchestrator.stop(), timeout=1)
+        with self.assertLogs("workflows.orchestrator", level="WARNING"):
+            asyncio.run(run())
+        self.assertTrue(orchestrator._event_task.done())
+    
+    @unittest.skipIf(not hasattr(asyncio, "eager_task_factory"), "Requires Python 3.12+")
+    def test_eager_tasks_restored(self):
+        """Test that eager tasks are opt-in and the loop's factory is restored"""
+        self.assertFalse(self.orchestrator.eager_tasks)
+        orchestrator = WorkflowOrchestrator(eager_tasks=True)
+        
+        async def run():
+            loop = asyncio.get_running_loop()
+            await orchestrator.start()
+            self.assertIs(loop.get_task_factory(), asyncio.eager_task_factory)
+            await orchestrator.stop()
+            self.assertIsNone(loop.get_task_factory())
+        asyncio.run(run())
+    
+    def test_event_handler_errors(self):
+        """Test that failing handlers are counted without stopping dispatch"""
+        received = []
+        
+        def failing_handler(event_type, data):
+            raise RuntimeError("handler failure")
+        
+        self.orchestrator.on_event("workflow_scheduled", failing_handler)
+        self.orchestrator.on_event("workflow_scheduled", lambda event_type, data: received.append(event_type))
+        self.orchestrator.register_workflow(WorkflowEngine("test_workflow"))
+        self.orchestrator.schedule_workflow("test_workflow")
+        self.orchestrator.schedule_workflow("test_workflow")
+        
+        async def run():
+            await self.orchestrator.start()
+            await self.orchestrator.stop()
+        with self.assertLogs("workflows.orchestrator", level="WARNING"):
+            asyncio.run(run())
+        
+        self.assertEqual(received, ["workflow_scheduled", "workflow_scheduled"])
+        self.assertEqual(self.orchestrator.get_metrics()["handler_errors"], 2)
     
     def test_metrics_tracking(self):
         """Test metrics collection"""
@@ -202,6 +756,15 @@ class TestWorkflowOrchestrator(unittest.TestCase):
         self.assertIn("queued", queue_status)
         self.assertIn("active", queue_status)
         self.assertIn("completed", queue_status)
+        
+        # Averages are derived from accumulated durations
+        self.orchestrator.register_workflow(WorkflowEngine("test_workflow"))
+        self.orchestrator._update_metrics("test_workflow", "completed", 1.0)
+        self.orchestrator._update_metrics("test_workflow", "failed", 3.0)
+        metrics = self.orchestrator.get_metrics()
+        self.assertEqual(metrics["total_completed"], 1)
+        self.assertEqual(metrics["total_failed"], 1)
+        self.assertEqual(metrics["by_workflow"]["test_workflow"]["average_duration"], 2.0)
 
 
 @unittest.skipIf(not WORKFLOW_AVAILABLE, "Workflow modules not available")
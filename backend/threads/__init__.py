@@ -1,10 +1,21 @@
 """Threading system for managing parallel conversation contexts"""
 
-from .thread_manager import ThreadManager, ConversationThread
-from .thread_pool import ThreadPool
-
-__all__ = [
-    "ThreadManager",
-    "ConversationThread",
-    "ThreadPool"
-]
\ No newline at end of file
+# Exports are resolved lazily (PEP 562) so importing the package does not
+# pull in the thread manager and its memory dependencies until needed
+_EXPORTS = {
+    "ThreadManager": ".thread_manager",
+    "ConversationThread": ".thread_manager",
+    "ThreadStatus": ".thread_manager",
+    "ThreadPriority": ".thread_manager"
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    if name in _EXPORTS:
+        from importlib import import_module
+        value = getattr(import_module(_EXPORTS[name], __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,72 @@
+"""Process-wide scheduler for thread expiry callbacks"""
+
+from typing import Callable, Optional, Tuple
+import asyncio
+import itertools
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+
+# (monotonic deadline, tie-breaker, callback); one queue and one task serve
+# every ThreadManager in the process
+_events: "asyncio.PriorityQueue[Tuple[float, int, Callable[[], None]]]" = asyncio.PriorityQueue()
+_seq = itertools.count()
+_task: Optional[asyncio.Task] = None
+_wakeup: Optional[asyncio.Event] = None
+
+
+def schedule(delay: float, callback: Callable[[], None]):
+    """Run callback on the scheduler task after delay seconds"""
+    _events.put_nowait((time.monotonic() + delay, next(_seq), callback))
+    
+    # Wake the scheduler in case this deadline is earlier than the one it waits on
+    if _wakeup is not None:
+        _wakeup.set()
+
+
+async def ensure_running():
+    """Start the scheduler task on the running loop if it is not already running"""
+    global _events, _task, _wakeup
+    
+    loop = asyncio.get_running_loop()
+    if _task is not None and not _task.done() and _task.get_loop() is loop:
+        return
+    
+    # Queues bind to the loop that first waits on them, so rebuild for this
+    # loop while keeping events scheduled before it started
+    pending = []
+    while not _events.empty():
+        pending.append(_events.get_nowait())
+    _events = asyncio.PriorityQueue()
+    for event in pending:
+        _events.put_nowait(event)
+    
+    _wakeup = asyncio.Event()
+    _task = loop.create_task(_run())
+
+
+async def _run():
+    """Pop events in deadline order and run their callbacks when due"""
+    while True:
+        deadline, seq, callback = await _events.get()
+        
+        wait = deadline - time.monotonic()
+        if wait > 0:
+            _wakeup.clear()
+            try:
+                await asyncio.wait_for(_wakeup.wait(), wait)
+            except asyncio.TimeoutError:
+                pass
+            else:
+                # A new event arrived; requeue and take the earliest again
+                _events.put_nowait((deadline, seq, callback))
+                continue
+        
+        try:
+            callback()
+        except Exception:
+            # Log error but keep serving other callbacks
+            if logger.isEnabledFor(logging.ERROR):
+                logger.exception("thread scheduler callback error")
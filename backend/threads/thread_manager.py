@@ -1,13 +1,34 @@
 """Thread manager for handling multiple conversation contexts"""
 
-from typing import Dict, List, Optional, Any, Set
+from typing import Dict, List, Optional, Any, Set, Tuple
 from datetime import datetime, timedelta
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, replace
 import uuid
 from enum import Enum
-import asyncio
-from collections import deque
+import pickle
+import re
+import time
+import weakref
+from bisect import bisect_left, insort
+from collections import Counter, OrderedDict
+from functools import partial
 
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+from . import _scheduler
 from ..memory.short_term import ShortTermMemory, MemoryPriority
 from ..memory.episodic import EpisodicMemory, Episode, EpisodeType
 
@@ -28,7 +49,233 @@ class ThreadPriority(Enum):
     URGENT = 4
 
 
-@dataclass
+def _datetime_from_ns(ns: int) -> datetime:
+    """Local datetime for a time_ns() value, exact to the microsecond"""
+    return datetime.fromtimestamp(ns // 1_000_000_000).replace(microsecond=ns // 1000 % 1_000_000)
+
+
+# msgpack extension type code for tuples, which it would otherwise turn into lists
+_MSGPACK_TUPLE = 1
+
+
+def _msgpack_default(value: Any) -> Any:
+    """Encode tuples as an extension type; anything else falls back to pickle"""
+    if type(value) is tuple:
+        return msgpack.ExtType(
+            _MSGPACK_TUPLE,
+            msgpack.packb(list(value), strict_types=True, default=_msgpack_default)
+        )
+    raise TypeError(f"cannot msgpack {type(value).__name__}")
+
+
+def _msgpack_ext_hook(code: int, data: bytes) -> Any:
+    """Inverse of _msgpack_default"""
+    if code == _MSGPACK_TUPLE:
+        return tuple(msgpack.unpackb(data, ext_hook=_msgpack_ext_hook, strict_map_key=False))
+    return msgpack.ExtType(code, data)
+
+
+def _pack_columns(columns: List[list]) -> bytes:
+    """Serialize message columns compactly; msgpack when possible, else pickle"""
+    if msgpack is not None:
+        try:
+            # strict_types sends subclasses (and tuples) to the default hook
+            # rather than packing them as their base type
+            return b"m" + msgpack.packb(columns, strict_types=True, default=_msgpack_default)
+        except (TypeError, ValueError, OverflowError):
+            # Metadata holds values msgpack cannot encode
+            pass
+    return b"p" + pickle.dumps(columns, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+def _unpack_columns(data: bytes) -> List[list]:
+    """Inverse of _pack_columns"""
+    if data[:1] == b"m":
+        return msgpack.unpackb(data[1:], ext_hook=_msgpack_ext_hook, strict_map_key=False)
+    return pickle.loads(data[1:])
+
+
+_TOKEN_RE = re.compile(r"\w+")
+
+# Search matches the title, topic and this many most recent messages
+_SEARCH_WINDOW = 10
+
+
+def _tokenize(text: str) -> List[str]:
+    """Split text into lowercase word tokens"""
+    return _TOKEN_RE.findall(text.lower())
+
+
+def _intersect_smallest_first(postings: List[Set[str]]) -> Optional[Set[str]]:
+    """Intersect posting sets starting from the smallest, or None if there are none"""
+    if not postings:
+        return None
+    
+    postings = sorted(postings, key=len)
+    result = set(postings[0])
+    for other in postings[1:]:
+        if not result:
+            break
+        result &= other
+    return result
+
+
+def _with_prefix(sorted_tokens: List[str], prefix: str) -> List[str]:
+    """Tokens in a sorted list that start with prefix"""
+    start = bisect_left(sorted_tokens, prefix)
+    end = start
+    while end < len(sorted_tokens) and sorted_tokens[end].startswith(prefix):
+        end += 1
+    return sorted_tokens[start:end]
+
+
+class ThreadIndex:
+    """Inverted indices over thread tags, status and text tokens"""
+    
+    def __init__(self):
+        self.tag_index: Dict[str, Set[str]] = {}
+        self.status_index: Dict[ThreadStatus, Set[str]] = {}
+        self.token_index: Dict[str, Set[str]] = {}
+        # Per-thread token counts, so a posting goes when its last use does
+        self._token_counts: Dict[str, Counter] = {}
+        # Vocabulary sorted forwards and by reversed token, for prefix and
+        # suffix lookups by bisection
+        self._vocab: List[str] = []
+        self._reversed_vocab: List[str] = []
+        
+        # Thread ids ordered by last activity, most recent last
+        self.activity: OrderedDict[str, None] = OrderedDict()
+    
+    def touch(self, thread_id: str):
+        """Move a thread to the most recently active position"""
+        self.activity[thread_id] = None
+        self.activity.move_to_end(thread_id)
+    
+    def add_tag(self, thread_id: str, tag: str):
+        """Record a tag for a thread"""
+        self.tag_index.setdefault(tag, set()).add(thread_id)
+    
+    def remove_tag(self, thread_id: str, tag: str):
+        """Drop a tag posting for a thread"""
+        postings = self.tag_index.get(tag)
+        if postings is not None:
+            postings.discard(thread_id)
+            if not postings:
+                del self.tag_index[tag]
+    
+    def set_status(self, thread_id: str, old: Optional[ThreadStatus], new: ThreadStatus):
+        """Move a thread between status buckets"""
+        if old is not None:
+            self.status_index.get(old, set()).discard(thread_id)
+        self.status_index.setdefault(new, set()).add(thread_id)
+    
+    def add_text(self, thread_id: str, text: str):
+        """Add postings for every token in text"""
+        counts = self._token_counts.setdefault(thread_id, Counter())
+        for token in _tokenize(text):
+            counts[token] += 1
+            if counts[token] > 1:
+                continue
+            
+            postings = self.token_index.get(token)
+            if postings is None:
+                postings = self.token_index[token] = set()
+                insort(self._vocab, token)
+                insort(self._reversed_vocab, token[::-1])
+            postings.add(thread_id)
+    
+    def remove_text(self, thread_id: str, text: str):
+        """Drop postings for tokens in text that the thread no longer uses"""
+        counts = self._token_counts.get(thread_id)
+        if counts is None:
+            return
+        
+        for token in _tokenize(text):
+            counts[token] -= 1
+            if counts[token] > 0:
+                continue
+            
+            del counts[token]
+            postings = self.token_index[token]
+            postings.discard(thread_id)
+            if not postings:
+                del self.token_index[token]
+                del self._vocab[bisect_left(self._vocab, token)]
+                reversed_token = token[::-1]
+                del self._reversed_vocab[bisect_left(self._reversed_vocab, reversed_token)]
+    
+    def match_query(self, query: str) -> Optional[Set[str]]:
+        """Thread ids that can contain query as a substring, or None if unrestricted"""
+        tokens = _tokenize(query)
+        if not tokens:
+            return None
+        
+        # Interior tokens of a substring match must be whole words; the
+        # outer ones may be partial, so widen them over the vocabulary: a
+        # suffix of the first and a prefix of the last, by bisection
+        if len(tokens) == 1:
+            edges = [lambda q=tokens[0]: [t for t in self._vocab if q in t]]
+        else:
+            edges = [
+                lambda q=tokens[0][::-1]: [t[::-1] for t in _with_prefix(self._reversed_vocab, q)],
+                lambda q=tokens[-1]: _with_prefix(self._vocab, q)
+            ]
+        
+        # Intersect whole-word postings rarest first
+        candidates = _intersect_smallest_first(
+            [self.token_index.get(token, set()) for token in tokens[1:-1]]
+        )
+        if candidates is not None and not candidates:
+            return set()
+        
+        for widen in edges:
+            postings = set()
+            for token in widen():
+                postings |= self.token_index[token]
+            candidates = postings if candidates is None else candidates & postings
+            if not candidates:
+                return set()
+        
+        return candidates
+
+
+@dataclass(slots=True)
+class Message:
+    """Single message in a thread"""
+    id: str
+    role: str
+    content: str
+    timestamp_ns: int
+    metadata: Dict[str, Any]
+    
+    @property
+    def timestamp(self) -> str:
+        """ISO-8601 rendering of timestamp_ns"""
+        return _datetime_from_ns(self.timestamp_ns).isoformat()
+
+
+class _TagSet(frozenset):
+    """Frozen tag set; a subclass only so the intern table can hold it weakly"""
+
+
+# Frozen tag sets shared between threads with equal tags, dropped once no
+# thread uses them
+_tag_intern: "weakref.WeakValueDictionary[frozenset, _TagSet]" = weakref.WeakValueDictionary()
+
+
+def _call_weak(method_ref: weakref.WeakMethod, *args):
+    """Call a weakly referenced method unless its object has been collected"""
+    method = method_ref()
+    if method is not None:
+        method(*args)
+
+
+def _memory_priority(role: str) -> MemoryPriority:
+    """Short-term memory priority for a message role"""
+    return MemoryPriority.HIGH if role == "user" else MemoryPriority.MEDIUM
+
+
+@dataclass(slots=True)
 class ThreadContext:
     """Context information for a thread"""
     topic: str
@@ -38,20 +285,38 @@ class ThreadContext:
     child_thread_ids: List[str] = field(default_factory=list)
     tags: Set[str] = field(default_factory=set)
     
+    # Owning thread and manager index, set when the thread is registered
+    thread_id: Optional[str] = field(default=None, repr=False, compare=False)
+    index: Optional[ThreadIndex] = field(default=None, repr=False, compare=False)
+    
     def add_tag(self, tag: str):
         """Add a tag to the thread"""
+        if isinstance(self.tags, frozenset):
+            self.tags = set(self.tags)
         self.tags.add(tag)
+        if self.index is not None:
+            self.index.add_tag(self.thread_id, tag)
     
     def remove_tag(self, tag: str):
         """Remove a tag from the thread"""
+        if isinstance(self.tags, frozenset):
+            self.tags = set(self.tags)
         self.tags.discard(tag)
+        if self.index is not None:
+            self.index.remove_tag(self.thread_id, tag)
     
     def has_tag(self, tag: str) -> bool:
         """Check if thread has a tag"""
         return tag in self.tags
+    
+    def freeze_tags(self):
+        """Store tags as a shared frozenset once they stop changing"""
+        # The key must be a separate object: the table holds keys strongly
+        key = frozenset(self.tags)
+        self.tags = _tag_intern.setdefault(key, _TagSet(key))
 
 
-@dataclass
+@dataclass(slots=True)
 class ConversationThread:
     """Represents a conversation thread with isolated context"""
     id: str
@@ -62,51 +327,242 @@ class ConversationThread:
     created_at: datetime
     updated_at: datetime
     
-    # Memory components
-    short_term_memory: ShortTermMemory
+    # Memory components; short-term memory is allocated on first use
+    memory_capacity: int = 100
     episode_id: Optional[str] = None
+    _short_term_memory: Optional[ShortTermMemory] = field(default=None, init=False, repr=False)
+    
+    # Message history, stored column-wise
+    msg_ids: List[str] = field(default_factory=list)
+    msg_roles: List[str] = field(default_factory=list)
+    msg_contents: List[str] = field(default_factory=list)
+    msg_timestamps_ns: List[int] = field(default_factory=list)
+    msg_metadata: List[Dict[str, Any]] = field(default_factory=list)
     
-    # Message history
-    messages: List[Dict[str, Any]] = field(default_factory=list)
+    # Lowercased shadows for substring search
+    title_lc: str = field(init=False, repr=False)
+    topic_lc: str = field(init=False, repr=False)
+    msg_contents_lc: List[str] = field(init=False, repr=False)
+    
+    # Message columns packed into bytes while the thread is archived
+    _packed: Optional[bytes] = field(default=None, repr=False)
     
     # Thread metrics
     message_count: int = 0
     last_active: datetime = field(default_factory=datetime.now)
+    last_active_ns: int = field(default_factory=time.monotonic_ns)
     inactive_duration: Optional[timedelta] = None
     
+    # Manager index, set when the thread is registered
+    index: Optional[ThreadIndex] = field(default=None, repr=False, compare=False)
+    
+    # Per-thread message sequence for ids
+    _msg_seq: int = field(default=0, repr=False)
+    
+    # Last rendered context summary and the state it was built from
+    _summary_cache: Optional[Tuple[tuple, str]] = field(default=None, repr=False)
+    
+    def __post_init__(self):
+        self.title_lc = self.title.lower()
+        self.topic_lc = self.context.topic.lower()
+        self.msg_contents_lc = [content.lower() for content in self.msg_contents]
+    
+    @property
+    def short_term_memory(self) -> ShortTermMemory:
+        """Short-term memory for this thread"""
+        if self._short_term_memory is None:
+            self._short_term_memory = ShortTermMemory(capacity=self.memory_capacity)
+        return self._short_term_memory
+    
+    @short_term_memory.setter
+    def short_term_memory(self, memory: ShortTermMemory):
+        self._short_term_memory = memory
+    
+    def attach_index(self, index: ThreadIndex):
+        """Register this thread's tags, status and text with a manager index"""
+        self.index = index
+        self.context.thread_id = self.id
+        self.context.index = index
+        
+        for tag in self.context.tags:
+            index.add_tag(self.id, tag)
+        index.set_status(self.id, None, self.status)
+        index.touch(self.id)
+        index.add_text(self.id, self.title)
+        index.add_text(self.id, self.context.topic)
+        for content in self.msg_contents_lc[-_SEARCH_WINDOW:]:
+            index.add_text(self.id, content)
+    
+    def freeze(self):
+        """Pack message columns into bytes; short-term memory is kept"""
+        if self._packed is not None:
+            return
+        
+        self._packed = _pack_columns([
+            self.msg_ids, self.msg_roles, self.msg_contents,
+            self.msg_timestamps_ns, self.msg_metadata
+        ])
+        self.msg_ids = []
+        self.msg_roles = []
+        self.msg_contents = []
+        self.msg_timestamps_ns = []
+        self.msg_metadata = []
+        # Search only reads the last few lowercased messages
+        self.msg_contents_lc = self.msg_contents_lc[-_SEARCH_WINDOW:]
+    
+    def _thaw(self):
+        """Restore packed message columns before they are modified"""
+        if self._packed is None:
+            return
+        
+        (self.msg_ids, self.msg_roles, self.msg_contents,
+         self.msg_timestamps_ns, self.msg_metadata) = _unpack_columns(self._packed)
+        self.msg_contents_lc = [content.lower() for content in self.msg_contents]
+        self._packed = None
+    
+    def _columns(self) -> List[list]:
+        """Message columns, unpacked on demand for frozen threads"""
+        if self._packed is not None:
+            return _unpack_columns(self._packed)
+        return [
+            self.msg_ids, self.msg_roles, self.msg_contents,
+            self.msg_timestamps_ns, self.msg_metadata
+        ]
+    
+    def _set_status(self, status: ThreadStatus):
+        """Change status and keep the manager index in sync"""
+        if self.index is not None:
+            self.index.set_status(self.id, self.status, status)
+        self.status = status
+    
     def add_message(self, role: str, content: str, metadata: Optional[Dict] = None):
         """Add a message to the thread"""
-        message = {
-            "id": f"msg_{uuid.uuid4().hex}",
-            "role": role,
-            "content": content,
-            "timestamp": datetime.now().isoformat(),
-            "metadata": metadata or {}
-        }
+        self._thaw()
+        now_ns = time.time_ns()
+        now = _datetime_from_ns(now_ns)
+        self._msg_seq += 1
+        metadata = metadata or {}
+        msg_id = f"msg_{self.id}_{self._msg_seq}"
         
-        self.messages.append(message)
+        self.msg_ids.append(msg_id)
+        self.msg_roles.append(role)
+        self.msg_contents.append(content)
+        self.msg_contents_lc.append(content.lower())
+        self.msg_timestamps_ns.append(now_ns)
+        self.msg_metadata.append(metadata)
         self.message_count += 1
-        self.last_active = datetime.now()
-        self.updated_at = datetime.now()
+        if self.index is not None:
+            # Index only the messages search looks at
+            self.index.add_text(self.id, content)
+            if len(self.msg_contents_lc) > _SEARCH_WINDOW:
+                self.index.remove_text(self.id, self.msg_contents_lc[-_SEARCH_WINDOW - 1])
+        self.last_active = now
+        self.last_active_ns = time.monotonic_ns()
+        if self.index is not None:
+            self.index.touch(self.id)
+        self.updated_at = now
         
         # Add to short-term memory
-        priority = MemoryPriority.HIGH if role == "user" else MemoryPriority.MEDIUM
+        priority = _memory_priority(role)
         self.short_term_memory.add(
             content=content,
             priority=priority,
             metadata={
                 "role": role,
                 "thread_id": self.id,
-                **message["metadata"]
+                **metadata,
+                "message_id": msg_id
             }
         )
     
-    def get_recent_messages(self, limit: int = 10) -> List[Dict[str, Any]]:
+    def bulk_add_messages(self, messages: List[Message], add_to_memory: bool = True):
+        """Append many messages, keeping their timestamps, with one round of bookkeeping"""
+        if not messages:
+            return
+        
+        self._thaw()
+        now_ns = time.time_ns()
+        now = _datetime_from_ns(now_ns)
+        seq = self._msg_seq
+        old_count = len(self.msg_ids)
+        
+        self.msg_ids.extend(f"msg_{self.id}_{seq + i}" for i in range(1, len(messages) + 1))
+        self.msg_roles.extend(m.role for m in messages)
+        self.msg_contents.extend(m.content for m in messages)
+        self.msg_contents_lc.extend(m.content.lower() for m in messages)
+        self.msg_timestamps_ns.extend(m.timestamp_ns for m in messages)
+        self.msg_metadata.extend(m.metadata for m in messages)
+        self._msg_seq = seq + len(messages)
+        self.message_count += len(messages)
+        
+        if self.index is not None:
+            # Swap the messages pushed out of the search window for the new ones in it
+            new_count = len(self.msg_ids)
+            window_start = max(0, new_count - _SEARCH_WINDOW)
+            for content in self.msg_contents_lc[max(0, old_count - _SEARCH_WINDOW):min(old_count, window_start)]:
+                self.index.remove_text(self.id, content)
+            for content in self.msg_contents_lc[max(old_count, window_start):]:
+                self.index.add_text(self.id, content)
+        self.last_active = now
+        self.last_active_ns = time.monotonic_ns()
+        if self.index is not None:
+            self.index.touch(self.id)
+        self.updated_at = now
+        
+        # Add to short-term memory in one batch
+        if add_to_memory:
+            self.short_term_memory.bulk_add([
+                (
+                    m.content,
+                    _memory_priority(m.role),
+                    {"role": m.role, "thread_id": self.id, **m.metadata, "message_id": msg_id}
+                )
+                for m, msg_id in zip(messages, self.msg_ids[-len(messages):])
+            ])
+    
+    @property
+    def messages(self) -> List[Message]:
+        """All messages, assembled from the columns"""
+        return self.get_messages()
+    
+    def get_messages(self, start: int = 0, stop: Optional[int] = None) -> List[Message]:
+        """Messages in the slice [start:stop]"""
+        return [
+            Message(*row) for row in zip(
+                *(column[start:stop] for column in self._columns())
+            )
+        ]
+    
+    def get_recent_messages(self, limit: int = 10) -> List[Message]:
         """Get recent messages from the thread"""
-        return self.messages[-limit:]
+        if limit <= 0:
+            return []
+        return self.get_messages(-limit)
+    
+    def truncate_messages(self, length: int):
+        """Drop messages from index length onwards"""
+        self._thaw()
+        if self.index is not None:
+            old_count = len(self.msg_ids)
+            for content in self.msg_contents_lc[max(0, old_count - _SEARCH_WINDOW):old_count]:
+                self.index.remove_text(self.id, content)
+            for content in self.msg_contents_lc[max(0, length - _SEARCH_WINDOW):length]:
+                self.index.add_text(self.id, content)
+        del self.msg_ids[length:]
+        del self.msg_roles[length:]
+        del self.msg_contents[length:]
+        del self.msg_contents_lc[length:]
+        del self.msg_timestamps_ns[length:]
+        del self.msg_metadata[length:]
+        self.message_count = len(self.msg_ids)
     
     def get_context_summary(self) -> str:
         """Generate a summary of the thread context"""
+        # Tags can change without touching updated_at, so they are part of the key
+        key = (self.updated_at, self.message_count, frozenset(self.context.tags))
+        if self._summary_cache and self._summary_cache[0] == key:
+            return self._summary_cache[1]
+        
         summary_parts = [
             f"Thread: {self.title}",
             f"Topic: {self.context.topic}",
@@ -116,35 +572,40 @@ class ConversationThread:
         ]
         
         # Add recent context from memory
-        recent_memories = self.short_term_memory.get_recent(3)
+        recent_memories = self._short_term_memory.get_recent(3) if self._short_term_memory else []
         if recent_memories:
             summary_parts.append("Recent context:")
             for memory in recent_memories:
                 summary_parts.append(f"- {memory.content[:50]}...")
         
-        return "\n".join(summary_parts)
+        summary = "\n".join(summary_parts)
+        self._summary_cache = (key, summary)
+        return summary
     
     def pause(self):
         """Pause the thread"""
-        self.status = ThreadStatus.PAUSED
+        self._set_status(ThreadStatus.PAUSED)
         self.inactive_duration = timedelta(0)
         self.updated_at = datetime.now()
     
     def resume(self):
         """Resume the thread"""
         if self.status == ThreadStatus.PAUSED:
-            self.status = ThreadStatus.ACTIVE
+            self._set_status(ThreadStatus.ACTIVE)
             self.inactive_duration = None
             self.updated_at = datetime.now()
     
     def complete(self):
         """Mark thread as completed"""
-        self.status = ThreadStatus.COMPLETED
+        self._set_status(ThreadStatus.COMPLETED)
+        self.context.freeze_tags()
         self.updated_at = datetime.now()
     
     def archive(self):
         """Archive the thread"""
-        self.status = ThreadStatus.ARCHIVED
+        self._set_status(ThreadStatus.ARCHIVED)
+        self.context.freeze_tags()
+        self.freeze()
         self.updated_at = datetime.now()
 
 
@@ -172,15 +633,23 @@ class ThreadManager:
         
         # Thread storage
         self.threads: Dict[str, ConversationThread] = {}
-        self.active_thread_ids: deque = deque(maxlen=max_active_threads)
+        # Insertion-ordered set of active thread ids, least recently used first
+        self.active_thread_ids: OrderedDict[str, None] = OrderedDict()
         self.current_thread_id: Optional[str] = None
         
         # Thread relationships
         self.thread_graph: Dict[str, Set[str]] = {}  # thread_id -> related_thread_ids
         
-        # Background tasks
-        self._cleanup_task: Optional[asyncio.Task] = None
+        # Inverted indices for search
+        self._index = ThreadIndex()
+        self._tag_index = self._index.tag_index
+        self._status_index = self._index.status_index
+        self._token_index = self._index.token_index
+        
+        # Background cleanup, driven by the shared expiry scheduler
         self.is_running = False
+        self._cleanup_epoch = 0
+        self._archive_after_ns = int(auto_archive_after.total_seconds() * 1e9)
     
     def create_thread(
         self,
@@ -192,12 +661,6 @@ class ThreadManager:
         tags: Optional[Set[str]] = None
     ) -> str:
         """Create a new conversation thread"""
-        # Check active thread limit
-        if len(self.active_thread_ids) >= self.max_active_threads:
-            # Archive least recently used thread
-            lru_thread_id = self.active_thread_ids[0]
-            self.archive_thread(lru_thread_id)
-        
         # Create thread
         thread_id = f"thread_{uuid.uuid4().hex}"
         
@@ -205,7 +668,7 @@ class ThreadManager:
             topic=topic,
             participants=participants,
             parent_thread_id=parent_thread_id,
-            tags=tags or set()
+            tags=set(tags) if tags else set()
         )
         
         thread = ConversationThread(
@@ -215,13 +678,15 @@ class ThreadManager:
             priority=priority,
             context=context,
             created_at=datetime.now(),
-            updated_at=datetime.now(),
-            short_term_memory=ShortTermMemory(capacity=100)
+            updated_at=datetime.now()
         )
         
-        # Store thread
+        # Store and index thread
         self.threads[thread_id] = thread
-        self.active_thread_ids.append(thread_id)
+        thread.attach_index(self._index)
+        self._touch_active(thread_id)
+        if self.is_running:
+            self._schedule_expiry(thread_id, self._archive_after_ns)
         
         # Update parent-child relationships
         if parent_thread_id and parent_thread_id in self.threads:
@@ -263,12 +728,20 @@ class ThreadManager:
         self.current_thread_id = thread_id
         
         # Update active thread order
-        if thread_id in self.active_thread_ids:
-            self.active_thread_ids.remove(thread_id)
-        self.active_thread_ids.append(thread_id)
+        self._touch_active(thread_id)
         
         return True
     
+    def _touch_active(self, thread_id: str):
+        """Mark a thread as most recently used, archiving past capacity"""
+        self.active_thread_ids[thread_id] = None
+        self.active_thread_ids.move_to_end(thread_id)
+        
+        # Archive least recently used threads over the limit
+        while len(self.active_thread_ids) > self.max_active_threads:
+            lru_thread_id, _ = self.active_thread_ids.popitem(last=False)
+            self.archive_thread(lru_thread_id)
+    
     def get_current_thread(self) -> Optional[ConversationThread]:
         """Get the current active thread"""
         if self.current_thread_id:
@@ -294,41 +767,109 @@ class ThreadManager:
         limit: int = 10
     ) -> List[ConversationThread]:
         """Search threads by criteria"""
-        results = []
+        # Narrow candidates through the indices before touching threads
+        postings: List[Set[str]] = []
         
-        for thread in self.threads.values():
-            # Status filter
-            if status and thread.status != status:
-                continue
-            
-            # Tag filter
-            if tags and not tags.intersection(thread.context.tags):
-                continue
-            
-            # Query filter
-            if query:
-                query_lower = query.lower()
-                # Search in title, topic, and recent messages
-                if (query_lower not in thread.title.lower() and 
-                    query_lower not in thread.context.topic.lower()):
-                    
-                    # Search in messages
-                    found = False
-                    for msg in thread.messages[-10:]:  # Check last 10 messages
-                        if query_lower in msg["content"].lower():
-                            found = True
-                            break
-                    
-                    if not found:
-                        continue
-            
-            results.append(thread)
+        if status:
+            postings.append(self._status_index.get(status, set()))
         
-        # Sort by last active
+        if tags:
+            # Any of the tags may match
+            if len(tags) == 1:
+                postings.append(self._tag_index.get(next(iter(tags)), set()))
+            else:
+                tagged = set()
+                for tag in tags:
+                    tagged |= self._tag_index.get(tag, set())
+                postings.append(tagged)
+        
+        query_lower = query.lower() if query else None
+        if query_lower:
+            matched = self._index.match_query(query_lower)
+            if matched is not None:
+                postings.append(matched)
+        
+        candidates = _intersect_smallest_first(postings)
+        
+        def matches(thread: ConversationThread) -> bool:
+            # Search in title, topic, and recent messages
+            return not query_lower or (
+                query_lower in thread.title_lc or
+                query_lower in thread.topic_lc or
+                any(query_lower in c for c in thread.msg_contents_lc[-_SEARCH_WINDOW:])
+            )
+        
+        if candidates is None or len(candidates) > len(self.threads) // 4:
+            # Walk threads most recent first and stop once limit is reached
+            results = []
+            for thread_id in reversed(self._index.activity):
+                if candidates is not None and thread_id not in candidates:
+                    continue
+                thread = self.threads[thread_id]
+                if matches(thread):
+                    results.append(thread)
+                    if len(results) == limit:
+                        break
+            return results[:limit]
+        
+        # Few candidates: filter them, then sort by last active
+        results = [
+            thread for thread in map(self.threads.__getitem__, candidates)
+            if matches(thread)
+        ]
         results.sort(key=lambda t: t.last_active, reverse=True)
         
         return results[:limit]
     
+    def bulk_search(self, queries: List[str]) -> Dict[str, List[ConversationThread]]:
+        """Match many substring queries against every thread in one pass per thread"""
+        results: Dict[str, List[ConversationThread]] = {q: [] for q in queries}
+        
+        # Group original queries by their lowercased form
+        by_lower: Dict[str, List[str]] = {}
+        for q in queries:
+            by_lower.setdefault(q.lower(), []).append(q)
+        patterns = [q for q in by_lower if q]
+        
+        if ahocorasick is not None and patterns:
+            automaton = ahocorasick.Automaton()
+            for q in patterns:
+                automaton.add_word(q, q)
+            automaton.make_automaton()
+            
+            def scan(text: str) -> Set[str]:
+                return {q for _, q in automaton.iter(text)}
+        elif patterns:
+            # Longest pattern starting at each position, then every pattern
+            # contained in it, covers the overlapping matches re would skip
+            patterns.sort(key=len, reverse=True)
+            regex = re.compile("(?=(" + "|".join(map(re.escape, patterns)) + "))")
+            contained = {q: {p for p in patterns if p in q} for q in patterns}
+            
+            def scan(text: str) -> Set[str]:
+                found = set()
+                for m in regex.finditer(text):
+                    found |= contained[m.group(1)]
+                return found
+        else:
+            def scan(text: str) -> Set[str]:
+                return set()
+        
+        for thread in self.threads.values():
+            text = "\n".join([thread.title_lc, thread.topic_lc, *thread.msg_contents_lc[-_SEARCH_WINDOW:]])
+            matched = scan(text)
+            if "" in by_lower:
+                matched.add("")
+            for q in matched:
+                for original in by_lower[q]:
+                    results[original].append(thread)
+        
+        # Sort by last active, as in search_threads
+        for threads in results.values():
+            threads.sort(key=lambda t: t.last_active, reverse=True)
+        
+        return results
+    
     def merge_threads(
         self,
         thread_ids: List[str],
@@ -350,6 +891,42 @@ class ThreadManager:
         # Sort by creation time
         threads_to_merge.sort(key=lambda t: t.created_at)
         
+        # Archived sources are refrozen when they are archived again below
+        for thread in threads_to_merge:
+            thread._thaw()
+        
+        # Gather message columns from every thread
+        sources = [
+            (thread, i)
+            for thread in threads_to_merge
+            for i in range(len(thread.msg_ids))
+        ]
+        
+        # Stable sort by timestamp
+        if np is not None:
+            ts_arr = np.fromiter(
+                (ns for thread in threads_to_merge for ns in thread.msg_timestamps_ns),
+                dtype=np.int64,
+                count=len(sources)
+            )
+            order = np.argsort(ts_arr, kind="stable").tolist()
+        else:
+            timestamps = [ns for thread in threads_to_merge for ns in thread.msg_timestamps_ns]
+            order = sorted(range(len(timestamps)), key=timestamps.__getitem__)
+        
+        # Collect messages before create_thread, which may archive a source
+        # past capacity and clear its columns
+        messages = []
+        for k in order:
+            thread, i = sources[k]
+            messages.append(Message(
+                id=thread.msg_ids[i],
+                role=thread.msg_roles[i],
+                content=thread.msg_contents[i],
+                timestamp_ns=thread.msg_timestamps_ns[i],
+                metadata={**thread.msg_metadata[i], "original_thread_id": thread.id}
+            ))
+        
         # Create merged thread
         all_participants = set()
         all_tags = set()
@@ -361,30 +938,12 @@ class ThreadManager:
             title=new_title,
             topic=new_topic or threads_to_merge[0].context.topic,
             participants=list(all_participants),
-            priority=max(t.priority for t in threads_to_merge),
+            priority=max((t.priority for t in threads_to_merge), key=lambda p: p.value),
             tags=all_tags
         )
         
         merged_thread = self.threads[merged_thread_id]
-        
-        # Merge messages and memories
-        all_messages = []
-        for thread in threads_to_merge:
-            for msg in thread.messages:
-                msg_copy = msg.copy()
-                msg_copy["original_thread_id"] = thread.id
-                all_messages.append(msg_copy)
-        
-        # Sort by timestamp
-        all_messages.sort(key=lambda m: m["timestamp"])
-        
-        # Add to merged thread
-        for msg in all_messages:
-            merged_thread.add_message(
-                role=msg["role"],
-                content=msg["content"],
-                metadata=msg.get("metadata", {})
-            )
+        merged_thread.bulk_add_messages(messages)
         
         # Archive original threads
         for thread in threads_to_merge:
@@ -408,7 +967,7 @@ class ThreadManager:
         if not original_thread:
             raise ValueError(f"Thread {thread_id} not found")
         
-        if split_point >= len(original_thread.messages):
+        if split_point >= original_thread.message_count:
             raise ValueError("Split point beyond message count")
         
         # Create new thread
@@ -418,23 +977,32 @@ class ThreadManager:
             participants=original_thread.context.participants,
             priority=original_thread.priority,
             parent_thread_id=thread_id,
-            tags=original_thread.context.tags.copy()
+            tags=set(original_thread.context.tags)
         )
         
         new_thread = self.threads[new_thread_id]
         
         # Move messages after split point to new thread
-        messages_to_move = original_thread.messages[split_point:]
-        for msg in messages_to_move:
-            new_thread.add_message(
-                role=msg["role"],
-                content=msg["content"],
-                metadata=msg.get("metadata", {})
-            )
+        messages_to_move = original_thread.get_messages(split_point)
+        new_thread.bulk_add_messages(messages_to_move, add_to_memory=False)
+        
+        # Carry over the moved messages' short-term memories instead of
+        # re-adding them. Eviction means memories need not line up with
+        # messages, so match them by message id and repoint them
+        new_ids = dict(zip((m.id for m in messages_to_move), new_thread.msg_ids))
+        if original_thread._short_term_memory is not None:
+            new_thread.short_term_memory = original_thread._short_term_memory.clone_items([
+                replace(memory, metadata={
+                    **memory.metadata,
+                    "thread_id": new_thread_id,
+                    "message_id": new_ids[memory.metadata["message_id"]]
+                })
+                for memory in original_thread._short_term_memory.get_all()
+                if memory.metadata.get("message_id") in new_ids
+            ])
         
         # Remove moved messages from original thread
-        original_thread.messages = original_thread.messages[:split_point]
-        original_thread.message_count = len(original_thread.messages)
+        original_thread.truncate_messages(split_point)
         original_thread.updated_at = datetime.now()
         
         # Update relationships
@@ -453,8 +1021,7 @@ class ThreadManager:
         thread.archive()
         
         # Remove from active threads
-        if thread_id in self.active_thread_ids:
-            self.active_thread_ids.remove(thread_id)
+        self.active_thread_ids.pop(thread_id, None)
         
         # End episode if exists
         if thread.episode_id and self.episodic_memory:
@@ -479,48 +1046,55 @@ class ThreadManager:
         return True
     
     async def start_cleanup(self):
-        """Start background cleanup task"""
+        """Start background cleanup of inactive threads"""
         if not self.is_running:
             self.is_running = True
-            self._cleanup_task = asyncio.create_task(self._cleanup_loop())
+            self._cleanup_epoch += 1
+            await _scheduler.ensure_running()
+            
+            # Schedule every live thread; callbacks from earlier runs are stale
+            now_ns = time.monotonic_ns()
+            for thread in self.threads.values():
+                if thread.status in (ThreadStatus.ACTIVE, ThreadStatus.PAUSED):
+                    expiry_ns = thread.last_active_ns + self._archive_after_ns
+                    self._schedule_expiry(thread.id, max(0, expiry_ns - now_ns))
     
     async def stop_cleanup(self):
-        """Stop background cleanup task"""
+        """Stop background cleanup of inactive threads"""
         self.is_running = False
-        if self._cleanup_task:
-            self._cleanup_task.cancel()
-            try:
-                await self._cleanup_task
-            except asyncio.CancelledError:
-                pass
-    
-    async def _cleanup_loop(self):
-        """Background task to clean up inactive threads"""
-        while self.is_running:
-            try:
-                current_time = datetime.now()
-                
-                # Check for inactive threads
-                for thread in list(self.threads.values()):
-                    if thread.status == ThreadStatus.ACTIVE:
-                        # Check inactivity
-                        inactive_time = current_time - thread.last_active
-                        
-                        if inactive_time > self.auto_archive_after:
-                            # Auto-archive inactive thread
-                            self.archive_thread(thread.id)
-                    
-                    elif thread.status == ThreadStatus.PAUSED:
-                        # Update inactive duration
-                        if thread.inactive_duration is not None:
-                            thread.inactive_duration = current_time - thread.last_active
-                
-                # Sleep for a while before next check
-                await asyncio.sleep(300)  # Check every 5 minutes
-                
-            except Exception as e:
-                # Log error but continue
-                print(f"Error in cleanup loop: {e}")
+    
+    def _schedule_expiry(self, thread_id: str, delay_ns: int):
+        """Check a thread for expiry after delay_ns"""
+        # The process-wide scheduler holds only a weak reference, so pending
+        # checks do not keep a stopped or discarded manager alive
+        _scheduler.schedule(
+            delay_ns / 1e9,
+            partial(_call_weak, weakref.WeakMethod(self._check_expiry), thread_id, self._cleanup_epoch)
+        )
+    
+    def _check_expiry(self, thread_id: str, epoch: int):
+        """Archive a thread whose inactivity deadline has passed"""
+        if not self.is_running or epoch != self._cleanup_epoch:
+            return
+        
+        thread = self.threads.get(thread_id)
+        if not thread:
+            return
+        
+        if thread.status == ThreadStatus.ACTIVE:
+            remaining_ns = thread.last_active_ns + self._archive_after_ns - time.monotonic_ns()
+            if remaining_ns <= 0:
+                # Auto-archive inactive thread
+                self.archive_thread(thread_id)
+            else:
+                # Thread was active since this check was scheduled
+                self._schedule_expiry(thread_id, remaining_ns)
+        
+        elif thread.status == ThreadStatus.PAUSED:
+            # Update inactive duration, re-checking every 5 minutes
+            if thread.inactive_duration is not None:
+                thread.inactive_duration = datetime.now() - thread.last_active
+            self._schedule_expiry(thread_id, 300 * 1_000_000_000)
     
     def get_thread_relationships(self, thread_id: str) -> Dict[str, List[str]]:
         """Get relationships for a thread"""
@@ -542,6 +1116,13 @@ class ThreadManager:
         if not thread:
             return {}
         
+        # Threads that never stored a memory have none allocated; keep it that way
+        memory = thread._short_term_memory
+        if memory is not None:
+            memory_stats = memory.get_statistics()
+        else:
+            memory_stats = {"total_memories": 0, "capacity": thread.memory_capacity, "utilization": 0.0}
+        
         return {
             "id": thread.id,
             "title": thread.title,
@@ -557,6 +1138,15 @@ class ThreadManager:
             "created_at": thread.created_at.isoformat(),
             "updated_at": thread.updated_at.isoformat(),
             "message_count": thread.message_count,
-            "messages": thread.messages,
-            "memory_stats": thread.short_term_memory.get_statistics()
+            "messages": [
+                {
+                    "id": i,
+                    "role": r,
+                    "content": c,
+                    "timestamp": _datetime_from_ns(ns).isoformat(),
+                    "metadata": m
+                }
+                for i, r, c, ns, m in zip(*thread._columns())
+            ],
+            "memory_stats": memory_stats
         }
\ No newline at end of file
@@ -1,28 +1,18 @@
 #!/usr/bin/env python3
 """Verify main.py has all endpoints"""
 
-import ast
 import os
 
-# Read main.py
-with open('main.py', 'r') as f:
-    content = f.read()
+from fastapi.routing import APIRoute
 
-# Parse the AST
-tree = ast.parse(content)
+from main import app
 
-# Find all route decorators
+# Collect routes registered on the app
 routes = []
-for node in ast.walk(tree):
-    if isinstance(node, ast.FunctionDef):
-        for decorator in node.decorator_list:
-            if isinstance(decorator, ast.Call) and isinstance(decorator.func, ast.Attribute):
-                if hasattr(decorator.func.value, 'id') and decorator.func.value.id == 'app':
-                    if decorator.func.attr in ['get', 'post', 'put', 'delete']:
-                        # Get the path from the decorator
-                        if decorator.args:
-                            path = ast.literal_eval(decorator.args[0])
-                            routes.append((decorator.func.attr.upper(), path, node.name))
+for route in app.routes:
+    if isinstance(route, APIRoute):
+        for method in route.methods & {'GET', 'POST', 'PUT', 'DELETE'}:
+            routes.append((method, route.path, route.endpoint.__name__))
 
 # Print all routes
 print(f"Total routes found: {len(routes)}\n")
@@ -1,12 +1,14 @@
 """Workflow module for orchestrating complex agent tasks"""
 
 from .engine import WorkflowEngine, WorkflowState
+from .llm_cache import LLMCache
 from .orchestrator import WorkflowOrchestrator
 from .templates import WorkflowTemplate, get_workflow_template
 
 __all__ = [
     "WorkflowEngine",
     "WorkflowState",
+    "LLMCache",
     "WorkflowOrchestrator",
     "WorkflowTemplate",
     "get_workflow_template"
@@ -1,16 +1,40 @@
 """Workflow engine for executing complex, stateful workflows"""
 
-from typing import Dict, List, Any, Optional, Callable, Union, Tuple
+from typing import Dict, List, Any, Optional, Callable, Union, Tuple, AsyncIterator
 from enum import Enum
-from dataclasses import dataclass, field
-from datetime import datetime
+from dataclasses import dataclass, field, fields
+from datetime import datetime, timedelta
 import uuid
 import asyncio
+import string
+import time
+from collections import ChainMap, OrderedDict, deque
+from functools import lru_cache
 from abc import ABC, abstractmethod
 
 from langgraph.graph import StateGraph, END
 from langgraph.prebuilt import ToolExecutor
 from langchain_core.messages import BaseMessage, HumanMessage, AIMessage, SystemMessage
+from langchain_core.runnables import RunnableConfig
+
+try:
+    from langgraph.checkpoint.base import BaseCheckpointSaver
+except ImportError:
+    BaseCheckpointSaver = None
+
+try:
+    from langchain_anthropic import ChatAnthropic
+except ImportError:
+    ChatAnthropic = None
+
+try:
+    import aiosqlite
+    from langgraph.checkpoint.sqlite.aio import AsyncSqliteSaver
+except ImportError:
+    aiosqlite = None
+    AsyncSqliteSaver = None
+
+from .llm_cache import LLMCache
 
 
 class WorkflowStatus(Enum):
@@ -35,55 +59,184 @@ class NodeStatus(Enum):
 @dataclass
 class WorkflowState:
     """State container for workflow execution"""
-    workflow_id: str
-    status: WorkflowStatus
-    current_node: Optional[str]
+    # Every field has a default: LangGraph rebuilds the state from channel
+    # values and omits channels that were never written (e.g. a None field)
+    workflow_id: str = ""
+    status: WorkflowStatus = WorkflowStatus.PENDING
+    current_node: Optional[str] = None
     visited_nodes: List[str] = field(default_factory=list)
     context: Dict[str, Any] = field(default_factory=dict)
     messages: List[BaseMessage] = field(default_factory=list)
     results: Dict[str, Any] = field(default_factory=dict)
     errors: List[Dict[str, Any]] = field(default_factory=list)
     metadata: Dict[str, Any] = field(default_factory=dict)
-    created_at: datetime = field(default_factory=datetime.now)
-    updated_at: datetime = field(default_factory=datetime.now)
+    # Per-node {status, retry_count}, kept here so node objects stay shareable
+    node_runtime: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+    # Wall clock is read once at creation; everything after is monotonic
+    created_ns: int = field(default_factory=time.time_ns)
+    created_mono: float = field(default_factory=time.monotonic)
+    updated_mono: float = field(default_factory=time.monotonic)
+    
+    @property
+    def created_at(self) -> datetime:
+        return datetime.fromtimestamp(self.created_ns / 1e9)
+    
+    @property
+    def updated_at(self) -> datetime:
+        return self.created_at + timedelta(seconds=self.updated_mono - self.created_mono)
     
     def update(self, **kwargs):
         """Update state fields"""
         for key, value in kwargs.items():
             if hasattr(self, key):
                 setattr(self, key, value)
-        self.updated_at = datetime.now()
+        self.updated_mono = time.monotonic()
     
-    def add_message(self, message: BaseMessage):
-        """Add a message to the conversation"""
-        self.messages.append(message)
-        self.updated_at = datetime.now()
+    def add_message(self, *messages: BaseMessage):
+        """Add one or more messages to the conversation"""
+        self.messages.extend(messages)
+        self.updated_mono = time.monotonic()
     
     def set_result(self, node: str, result: Any):
         """Set result for a node"""
         self.results[node] = result
-        self.updated_at = datetime.now()
+        self.updated_mono = time.monotonic()
+    
+    def set_results(self, results: Dict[str, Any]):
+        """Set results for several nodes at once"""
+        self.results.update(results)
+        self.updated_mono = time.monotonic()
     
     def add_error(self, node: str, error: str, details: Optional[Dict] = None):
         """Add an error"""
+        # Errors are off the hot path, so the timestamp stays a real key that
+        # .get(), "in" and json.dumps see like any other
+        ts_ns = time.time_ns()
         self.errors.append({
             "node": node,
             "error": error,
             "details": details or {},
-            "timestamp": datetime.now().isoformat()
+            "ts_ns": ts_ns,
+            "timestamp": datetime.fromtimestamp(ts_ns / 1e9).isoformat()
         })
-        self.updated_at = datetime.now()
+        self.updated_mono = time.monotonic()
+    
+    def reset(self, workflow_id: str, context: Optional[Dict[str, Any]] = None):
+        """Reset state for reuse with fresh containers"""
+        # Containers are replaced, not cleared: a finished run's result state
+        # may still share them with the caller
+        self.workflow_id = workflow_id
+        self.status = WorkflowStatus.PENDING
+        self.current_node = None
+        self.context = context if context is not None else {}
+        self.visited_nodes = []
+        self.messages = []
+        self.results = {}
+        self.errors = []
+        self.metadata = {}
+        self.node_runtime = {}
+        self.created_ns = time.time_ns()
+        self.created_mono = self.updated_mono = time.monotonic()
+
+
+class WorkflowStatePool:
+    """Free list of WorkflowState objects recycled between executions"""
+    
+    def __init__(self, max_size: int = 100):
+        self.max_size = max_size
+        self._free: deque = deque()
+    
+    def get(self, workflow_id: str, context: Optional[Dict[str, Any]] = None) -> WorkflowState:
+        """Get a reset state, allocating only when the pool is empty"""
+        if self._free:
+            state = self._free.pop()
+            state.reset(workflow_id, context)
+            return state
+        
+        return WorkflowState(
+            workflow_id=workflow_id,
+            status=WorkflowStatus.PENDING,
+            current_node=None,
+            context=context if context is not None else {}
+        )
+    
+    def put(self, state: WorkflowState):
+        """Return a state nothing else references any more"""
+        if len(self._free) < self.max_size:
+            self._free.append(state)
+
+
+_STATE_FIELDS = frozenset(f.name for f in fields(WorkflowState))
+
+
+def _coerce_state(value: Any) -> WorkflowState:
+    """WorkflowState for a graph output, which LangGraph returns as a dict of channels"""
+    if isinstance(value, WorkflowState):
+        return value
+    return WorkflowState(**{key: item for key, item in value.items() if key in _STATE_FIELDS})
+
+
+def _freeze(value: Any) -> Any:
+    """Hashable snapshot of a context value (raises TypeError if impossible)"""
+    if isinstance(value, dict):
+        return frozenset((key, _freeze(item)) for key, item in value.items())
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(item) for item in value)
+    if isinstance(value, set):
+        return frozenset(_freeze(item) for item in value)
+    hash(value)
+    return value
+
+
+_SAFE_FORMAT_SPEC = set(string.ascii_letters + string.digits + "<>=^+- ,._%#")
+
+
+@lru_cache(maxsize=256)
+def compile_template(template: str) -> Callable[[Dict[str, Any]], str]:
+    """
+    Compile a str.format template into a function of a context mapping
+    
+    Plain {name} fields become an f-string, so rendering neither reparses
+    the template nor copies the context into kwargs. Templates using
+    attribute/index lookups or nested specs fall back to format_map.
+    Compiled renderers are shared by every node using the same template.
+    """
+    body = []
+    names: Dict[str, str] = {}
+    try:
+        for literal, field_name, format_spec, conversion in string.Formatter().parse(template):
+            body.append(literal.replace("{", "{{").replace("}", "}}"))
+            if field_name is None:
+                continue
+            if not field_name.isidentifier() or not set(format_spec) <= _SAFE_FORMAT_SPEC:
+                raise ValueError(field_name)
+            
+            var = names.setdefault(field_name, f"_v{len(names)}")
+            conversion = f"!{conversion}" if conversion else ""
+            format_spec = f":{format_spec}" if format_spec else ""
+            body.append("{" + var + conversion + format_spec + "}")
+    except ValueError:
+        return template.format_map
+    
+    lines = ["def _render(ctx):"]
+    lines += [f"    {var} = ctx[{name!r}]" for name, var in names.items()]
+    lines.append(f"    return f{''.join(body)!r}")
+    
+    namespace: Dict[str, Any] = {}
+    exec("\n".join(lines), namespace)
+    return namespace["_render"]
 
 
 class WorkflowNode(ABC):
     """Abstract base class for workflow nodes"""
     
+    MAX_RETRIES = 3
+    # Whether results depend only on state.context and may be reused
+    cacheable = False
+    
     def __init__(self, name: str, description: str = ""):
         self.name = name
         self.description = description
-        self.status = NodeStatus.PENDING
-        self.retry_count = 0
-        self.max_retries = 3
     
     @abstractmethod
     async def execute(self, state: WorkflowState) -> Dict[str, Any]:
@@ -94,9 +247,9 @@ class WorkflowNode(ABC):
         """Check if node can be executed given current state"""
         return True
     
-    def should_retry(self) -> bool:
+    def should_retry(self, runtime: Dict[str, Any]) -> bool:
         """Check if node should be retried after failure"""
-        return self.retry_count < self.max_retries
+        return runtime["retry_count"] < self.MAX_RETRIES
 
 
 class ConditionalNode(WorkflowNode):
@@ -153,29 +306,191 @@ class LLMNode(WorkflowNode):
         name: str,
         llm: Any,  # LangChain LLM
         prompt_template: Optional[str] = None,
-        description: str = ""
+        description: str = "",
+        cache: Optional[LLMCache] = None,
+        cache_temperature_threshold: float = 0.0,
+        system_prompt: Optional[str] = None,
+        prompt_defaults: Optional[Dict[str, Any]] = None,
+        cache_similar: bool = False
     ):
         super().__init__(name, description)
         self.llm = llm
         self.prompt_template = prompt_template
+        self._render = compile_template(prompt_template) if prompt_template else None
+        # Fallback values for template fields missing from the context
+        self.prompt_defaults = prompt_defaults
+        self.cache = cache
+        self.cache_temperature_threshold = cache_temperature_threshold
+        # Also serve responses cached for similar prompts to this model and template
+        self.cache_similar = cache_similar
+        self._model_name = str(getattr(llm, "model", None) or getattr(llm, "model_name", None) or type(llm))
+        
+        # Static instructions go out as one byte-stable system message ahead of
+        # the rendered prompt so providers can reuse the cached prefix
+        self.system_prompt = system_prompt
+        self._system_message = None
+        if system_prompt:
+            if ChatAnthropic is not None and isinstance(llm, ChatAnthropic):
+                self._system_message = SystemMessage(content=[{
+                    "type": "text",
+                    "text": system_prompt,
+                    "cache_control": {"type": "ephemeral"}
+                }])
+            else:
+                self._system_message = SystemMessage(content=system_prompt)
+        self._cache_template = "\n\n".join(filter(None, (system_prompt, prompt_template))) or None
     
     async def execute(self, state: WorkflowState) -> Dict[str, Any]:
         """Execute LLM call"""
         # Build prompt from template and state
         if self.prompt_template:
-            prompt = self.prompt_template.format(**state.context)
+            if self.prompt_defaults:
+                prompt = self._render(ChainMap(state.context, self.prompt_defaults))
+            else:
+                prompt = self._render(state.context)
         else:
             # Use last message as prompt
             prompt = state.messages[-1].content if state.messages else ""
         
-        # Call LLM
-        response = await self.llm.ainvoke(prompt)
+        # Only reuse responses for (near-)deterministic sampling
+        cache = self.cache
+        temperature = getattr(self.llm, "temperature", None) or 0.0
+        if temperature > self.cache_temperature_threshold:
+            cache = None
+        
+        content = None
+        if cache is not None:
+            key = cache.make_key(self._model_name, prompt, self._cache_template)
+            scope = (self._model_name, self._cache_template)
+            content = await cache.get(key, prompt, scope, similar=self.cache_similar)
+        
+        if content is None:
+            # Call LLM
+            if self._system_message is not None:
+                response = await self.llm.ainvoke([self._system_message, HumanMessage(content=prompt)])
+            else:
+                response = await self.llm.ainvoke(prompt)
+            content = response.content
+            if cache is not None:
+                await cache.set(key, prompt, content, scope, similar=self.cache_similar)
         
         # Add to messages
-        state.add_message(HumanMessage(content=prompt))
-        state.add_message(AIMessage(content=response.content))
+        state.add_message(HumanMessage(content=prompt), AIMessage(content=content))
+        
+        return {"response": content}
+
+
+class ParallelNode(WorkflowNode):
+    """
+    Node that runs independent sub-nodes concurrently in one graph step
+    
+    Sub-nodes share the state, so they must not write overlapping context
+    keys; their dict results are merged into the context in declaration order.
+    """
+    
+    # Branches retry on their own; retrying the whole node would re-run the
+    # branches that already succeeded
+    MAX_RETRIES = 0
+    
+    def __init__(
+        self,
+        name: str,
+        sub_nodes: List[WorkflowNode],
+        description: str = "",
+        max_parallel: Optional[int] = 3
+    ):
+        super().__init__(name, description)
+        self.sub_nodes = sub_nodes
+        # Cap on sub-nodes in flight at once (None for no limit)
+        self.max_parallel = max_parallel
+    
+    async def _execute_limited(
+        self,
+        sub: WorkflowNode,
+        state: WorkflowState,
+        semaphore: Optional[asyncio.Semaphore]
+    ) -> Any:
+        """Execute a sub-node, waiting for a free slot if concurrency is capped"""
+        if semaphore is None:
+            return await sub.execute(state)
+        async with semaphore:
+            return await sub.execute(state)
+    
+    async def _run_branch(
+        self,
+        sub: WorkflowNode,
+        state: WorkflowState,
+        semaphore: Optional[asyncio.Semaphore],
+        results: Dict[str, Any]
+    ):
+        """Run a sub-node to completion, retrying it independently of its siblings"""
+        key = f"{self.name}.{sub.name}"
+        runtime = state.node_runtime.setdefault(
+            key, {"status": NodeStatus.PENDING, "retry_count": 0}
+        )
+        
+        while True:
+            try:
+                outcome = await self._execute_limited(sub, state, semaphore)
+            except Exception as e:
+                runtime["status"] = NodeStatus.FAILED
+                state.add_error(key, str(e))
+                if not sub.should_retry(runtime):
+                    raise
+                
+                runtime["retry_count"] += 1
+                runtime["status"] = NodeStatus.PENDING
+                continue
+            
+            runtime["status"] = NodeStatus.COMPLETED
+            results[sub.name] = outcome
+            return
+    
+    async def execute(self, state: WorkflowState) -> Dict[str, Any]:
+        """Execute all sub-nodes, retrying failed branches"""
+        results: Dict[str, Any] = {}
+        semaphore = asyncio.Semaphore(self.max_parallel) if self.max_parallel else None
         
-        return {"response": response.content}
+        try:
+            # A branch that runs out of retries cancels its in-flight siblings
+            async with asyncio.TaskGroup() as group:
+                for sub in self.sub_nodes:
+                    if sub.can_execute(state):
+                        group.create_task(self._run_branch(sub, state, semaphore, results))
+        except ExceptionGroup as errors:
+            raise errors.exceptions[0] from None
+        finally:
+            # Record completed branches in one update, even on failure
+            state.set_results({
+                f"{self.name}.{sub.name}": results[sub.name]
+                for sub in self.sub_nodes if sub.name in results
+            })
+        
+        # Merge branch outputs as if the sub-nodes had run one after another
+        merged: Dict[str, Any] = {}
+        for sub in self.sub_nodes:
+            if isinstance(results.get(sub.name), dict):
+                merged.update(results[sub.name])
+        return merged
+
+
+# Compiled graphs shared by engines with the same topology, most recent last
+_COMPILED_CACHE: "OrderedDict[Tuple, Any]" = OrderedDict()
+_COMPILED_CACHE_SIZE = 128
+
+# Engine executing each graph run, keyed by a per-run token passed in the run
+# config; graph handlers dispatch through it so one compiled graph can serve
+# several engines, even for the same workflow id
+_running_engines: Dict[str, "WorkflowEngine"] = {}
+
+
+def _node_handler(node_name: str) -> Callable:
+    """Graph handler that runs node_name on the engine executing the run"""
+    async def handler(state: WorkflowState, config: RunnableConfig) -> WorkflowState:
+        engine = _running_engines[config["configurable"]["engine_run"]]
+        return await engine._run_node(engine.nodes[node_name], state)
+    
+    return handler
 
 
 class WorkflowEngine:
@@ -190,15 +505,33 @@ class WorkflowEngine:
     - Checkpointing
     """
     
-    def __init__(self, name: str, description: str = ""):
+    def __init__(
+        self,
+        name: str,
+        description: str = "",
+        node_cache_size: int = 256,
+        checkpointer: Optional["BaseCheckpointSaver"] = None
+    ):
         self.name = name
         self.description = description
         self.nodes: Dict[str, WorkflowNode] = {}
         self.graph: Optional[StateGraph] = None
         self.compiled_graph = None
+        # Persists state after each superstep, keyed by workflow id
+        self.checkpointer = checkpointer
+        
+        # Topology recorded for the compiled-graph cache
+        self._graph_nodes: Tuple[str, ...] = ()
+        self._edges: List[Tuple[str, Union[str, Callable]]] = []
+        self._entry: Optional[str] = None
         
         # Execution tracking
         self.active_workflows: Dict[str, WorkflowState] = {}
+        self.state_pool = WorkflowStatePool()
+        
+        # Results of cacheable nodes keyed by (node name, frozen context)
+        self.node_cache: "OrderedDict[Tuple[str, Any], Any]" = OrderedDict()
+        self.node_cache_size = node_cache_size
         
     def add_node(self, node: WorkflowNode):
         """Add a node to the workflow"""
@@ -209,6 +542,7 @@ class WorkflowEngine:
         if not self.graph:
             raise ValueError("Graph not initialized. Call build() first.")
         
+        self._edges.append((from_node, to_node))
         if callable(to_node):
             # Conditional edge
             self.graph.add_conditional_edges(from_node, to_node)
@@ -221,23 +555,48 @@ class WorkflowEngine:
         if not self.graph:
             raise ValueError("Graph not initialized. Call build() first.")
         
+        self._entry = node
         self.graph.set_entry_point(node)
     
     def build(self):
         """Build the workflow graph"""
         # Initialize graph with state schema
         self.graph = StateGraph(WorkflowState)
+        self._graph_nodes = tuple(self.nodes)
+        self._edges = []
+        self._entry = None
         
         # Add nodes to graph
-        for node_name, node in self.nodes.items():
-            self.graph.add_node(node_name, self._create_node_handler(node))
+        for node_name in self.nodes:
+            self.graph.add_node(node_name, _node_handler(node_name))
     
-    def compile(self):
-        """Compile the workflow graph"""
+    def compile(self, use_cache: bool = True):
+        """Compile the workflow graph, reusing one with identical topology"""
         if not self.graph:
             raise ValueError("Graph not built. Call build() first.")
         
-        self.compiled_graph = self.graph.compile()
+        if not use_cache:
+            self.compiled_graph = self.graph.compile(checkpointer=self.checkpointer)
+            return
+        
+        # Conditional routers and the checkpointer are compared by identity
+        signature = (
+            tuple(sorted(self._graph_nodes)),
+            tuple(self._edges),
+            self._entry,
+            self.checkpointer
+        )
+        
+        compiled_graph = _COMPILED_CACHE.get(signature)
+        if compiled_graph is None:
+            compiled_graph = self.graph.compile(checkpointer=self.checkpointer)
+            _COMPILED_CACHE[signature] = compiled_graph
+            if len(_COMPILED_CACHE) > _COMPILED_CACHE_SIZE:
+                _COMPILED_CACHE.popitem(last=False)
+        else:
+            _COMPILED_CACHE.move_to_end(signature)
+        
+        self.compiled_graph = compiled_graph
     
     async def execute(
         self,
@@ -245,30 +604,51 @@ class WorkflowEngine:
         workflow_id: Optional[str] = None
     ) -> WorkflowState:
         """Execute the workflow"""
+        final_state = None
+        async for node_name, payload in self.stream(initial_context, workflow_id):
+            if node_name == END:
+                final_state = payload
+        return final_state
+    
+    async def stream(
+        self,
+        initial_context: Optional[Dict[str, Any]] = None,
+        workflow_id: Optional[str] = None
+    ) -> AsyncIterator[Tuple[str, Any]]:
+        """
+        Execute the workflow, yielding (node_name, update) as nodes complete
+        
+        The last item is (END, final_state).
+        """
         if not self.compiled_graph:
             raise ValueError("Workflow not compiled. Call compile() first.")
         
         # Create initial state
         workflow_id = workflow_id or f"wf_{uuid.uuid4().hex}"
-        state = WorkflowState(
-            workflow_id=workflow_id,
-            status=WorkflowStatus.PENDING,
-            current_node=None,
-            context=initial_context or {}
-        )
+        state = self.state_pool.get(workflow_id, initial_context or {})
+        final_state = None
         
         # Track active workflow
         self.active_workflows[workflow_id] = state
+        run_key = self._start_run()
         state.status = WorkflowStatus.RUNNING
         
         try:
-            # Execute workflow
-            final_state = await self.compiled_graph.ainvoke(state)
+            # Execute workflow, surfacing each superstep's node updates
+            config = {"configurable": {"thread_id": workflow_id, "engine_run": run_key}}
+            async for mode, chunk in self.compiled_graph.astream(
+                state, config=config, stream_mode=["updates", "values"]
+            ):
+                if mode == "values":
+                    final_state = _coerce_state(chunk)
+                    continue
+                for node_name, payload in chunk.items():
+                    yield node_name, payload
             
             # Update status
             final_state.status = WorkflowStatus.COMPLETED
             
-            return final_state
+            yield END, final_state
             
         except Exception as e:
             # Handle execution error
@@ -280,6 +660,34 @@ class WorkflowEngine:
             # Clean up
             if workflow_id in self.active_workflows:
                 del self.active_workflows[workflow_id]
+            _running_engines.pop(run_key, None)
+            
+            # The graph returns a new state object, so the input one is free
+            if final_state is not state:
+                self.state_pool.put(state)
+    
+    async def resume_from_checkpoint(self, workflow_id: str) -> WorkflowState:
+        """Continue an interrupted workflow from its last checkpoint"""
+        if not self.checkpointer:
+            raise ValueError("Workflow has no checkpointer.")
+        if not self.compiled_graph:
+            raise ValueError("Workflow not compiled. Call compile() first.")
+        
+        run_key = self._start_run()
+        config = {"configurable": {"thread_id": workflow_id, "engine_run": run_key}}
+        try:
+            final_state = _coerce_state(await self.compiled_graph.ainvoke(None, config=config))
+        finally:
+            _running_engines.pop(run_key, None)
+        
+        final_state.status = WorkflowStatus.COMPLETED
+        return final_state
+    
+    def _start_run(self) -> str:
+        """Register this engine for one graph run and return the run's key"""
+        run_key = uuid.uuid4().hex
+        _running_engines[run_key] = self
+        return run_key
     
     def pause(self, workflow_id: str):
         """Pause a running workflow"""
@@ -302,27 +710,69 @@ class WorkflowEngine:
         """Get current state of a workflow"""
         return self.active_workflows.get(workflow_id)
     
-    def _create_node_handler(self, node: WorkflowNode) -> Callable:
-        """Create async handler for a node"""
-        async def handler(state: WorkflowState) -> WorkflowState:
-            # Update current node
-            state.current_node = node.name
-            state.visited_nodes.append(node.name)
-            
-            # Check if node can execute
-            if not node.can_execute(state):
-                node.status = NodeStatus.SKIPPED
-                return state
-            
+    def get_metrics(self) -> Dict[str, Any]:
+        """Get engine metrics, including LLM cache hit rates"""
+        cache_stats = {"hits": 0, "similar_hits": 0, "misses": 0}
+        
+        # Nodes may share one cache; count each cache once
+        seen = set()
+        for node in self.nodes.values():
+            cache = getattr(node, "cache", None)
+            if cache is None or id(cache) in seen:
+                continue
+            seen.add(id(cache))
+            for stat, count in cache.stats.items():
+                cache_stats[stat] = cache_stats.get(stat, 0) + count
+        
+        return {
+            "active_workflows": len(self.active_workflows),
+            "llm_cache": cache_stats
+        }
+    
+    async def _execute_node(self, node: WorkflowNode, state: WorkflowState) -> Any:
+        """Execute a node, reusing a cached result for an identical context"""
+        if not node.cacheable or not self.node_cache_size:
+            return await node.execute(state)
+        
+        try:
+            key = (node.name, _freeze(state.context))
+        except TypeError:
+            return await node.execute(state)
+        
+        if key in self.node_cache:
+            self.node_cache.move_to_end(key)
+            return self.node_cache[key]
+        
+        result = await node.execute(state)
+        self.node_cache[key] = result
+        if len(self.node_cache) > self.node_cache_size:
+            self.node_cache.popitem(last=False)
+        return result
+    
+    async def _run_node(self, node: WorkflowNode, state: WorkflowState) -> WorkflowState:
+        """Run one node against a workflow state, retrying on failure"""
+        # Update current node
+        state.current_node = node.name
+        state.visited_nodes.append(node.name)
+        runtime = state.node_runtime.setdefault(
+            node.name, {"status": NodeStatus.PENDING, "retry_count": 0}
+        )
+        
+        # Check if node can execute
+        if not node.can_execute(state):
+            runtime["status"] = NodeStatus.SKIPPED
+            return state
+        
+        while True:
             # Execute node
-            node.status = NodeStatus.RUNNING
+            runtime["status"] = NodeStatus.RUNNING
             
             try:
-                result = await node.execute(state)
+                result = await self._execute_node(node, state)
                 
                 # Store result
                 state.set_result(node.name, result)
-                node.status = NodeStatus.COMPLETED
+                runtime["status"] = NodeStatus.COMPLETED
                 
                 # Handle special results
                 if isinstance(result, dict):
@@ -333,23 +783,41 @@ class WorkflowEngine:
                     if "next_node" in result:
                         state.metadata["next_node"] = result["next_node"]
                 
+                return state
+                
             except Exception as e:
                 # Handle node error
-                node.status = NodeStatus.FAILED
+                runtime["status"] = NodeStatus.FAILED
                 state.add_error(node.name, str(e))
                 
                 # Retry if applicable
-                if node.should_retry():
-                    node.retry_count += 1
-                    node.status = NodeStatus.PENDING
-                    # Re-execute (simplified retry logic)
-                    return await handler(state)
-                else:
+                if not node.should_retry(runtime):
                     raise
-            
-            return state
-        
-        return handler
+                runtime["retry_count"] += 1
+                runtime["status"] = NodeStatus.PENDING
+
+
+async def create_sqlite_checkpointer(path: str = "workflow_checkpoints.db") -> "BaseCheckpointSaver":
+    """Create a SQLite checkpointer for WorkflowEngine"""
+    if AsyncSqliteSaver is None:
+        raise ImportError("langgraph-checkpoint-sqlite is required for SQLite checkpoints")
+    
+    saver = AsyncSqliteSaver(await aiosqlite.connect(path))
+    await saver.setup()
+    return saver
+
+
+def _router(
+    condition_fn: Callable[[WorkflowState], str],
+    branches: Dict[str, str]
+) -> Callable[[WorkflowState], str]:
+    """Router mapping a condition result to its branch target, ending on unknown results"""
+    # A plain function rather than a partial: older LangGraph inspects the
+    # router's signature and rejects partial objects
+    def route(state: WorkflowState) -> str:
+        return branches.get(condition_fn(state), END)
+    
+    return route
 
 
 class WorkflowBuilder:
@@ -358,23 +826,39 @@ class WorkflowBuilder:
     def __init__(self, name: str, description: str = ""):
         self.engine = WorkflowEngine(name, description)
         self.current_node = None
+        
+        # Wiring is recorded here and applied to the graph in build()
+        self._entry: Optional[str] = None
+        self._edges: List[Tuple[str, str]] = []
+        self._routers: Dict[str, Tuple[Callable[[WorkflowState], str], Dict[str, str]]] = {}
+    
+    def _chain(self, name: str):
+        """Link a new node after the current one"""
+        if self.current_node:
+            self._edges.append((self.current_node, name))
+        else:
+            self._entry = name
+        
+        self.current_node = name
     
     def add_llm_node(
         self,
         name: str,
         llm: Any,
-        prompt_template: Optional[str] = None
+        prompt_template: Optional[str] = None,
+        cache: Optional[LLMCache] = None,
+        system_prompt: Optional[str] = None,
+        prompt_defaults: Optional[Dict[str, Any]] = None,
+        cache_similar: bool = False
     ) -> 'WorkflowBuilder':
         """Add an LLM node"""
-        node = LLMNode(name, llm, prompt_template)
+        node = LLMNode(
+            name, llm, prompt_template,
+            cache=cache, system_prompt=system_prompt, prompt_defaults=prompt_defaults,
+            cache_similar=cache_similar
+        )
         self.engine.add_node(node)
-        
-        if self.current_node:
-            self.engine.add_edge(self.current_node, name)
-        else:
-            self.engine.set_entry_point(name)
-        
-        self.current_node = name
+        self._chain(name)
         return self
     
     def add_tool_node(
@@ -386,13 +870,19 @@ class WorkflowBuilder:
         """Add a tool node"""
         node = ToolNode(name, tool_executor, tool_name)
         self.engine.add_node(node)
-        
-        if self.current_node:
-            self.engine.add_edge(self.current_node, name)
-        else:
-            self.engine.set_entry_point(name)
-        
-        self.current_node = name
+        self._chain(name)
+        return self
+    
+    def add_parallel(
+        self,
+        name: str,
+        sub_nodes: List[WorkflowNode],
+        max_parallel: Optional[int] = 3
+    ) -> 'WorkflowBuilder':
+        """Add a group of independent nodes that run concurrently"""
+        node = ParallelNode(name, sub_nodes, max_parallel=max_parallel)
+        self.engine.add_node(node)
+        self._chain(name)
         return self
     
     def add_conditional(
@@ -404,24 +894,41 @@ class WorkflowBuilder:
         """Add a conditional branch"""
         node = ConditionalNode(name, condition_fn)
         self.engine.add_node(node)
+        self._chain(name)
         
-        if self.current_node:
-            self.engine.add_edge(self.current_node, name)
-        else:
-            self.engine.set_entry_point(name)
-        
-        # Add conditional edges for each branch
-        def router(state: WorkflowState) -> str:
-            next_node = condition_fn(state)
-            return branches.get(next_node, END)
+        # Conditional edges for each branch are added in build(); a None
+        # target ends the workflow
+        self._routers[name] = (
+            condition_fn,
+            {key: END if target is None else target for key, target in branches.items()}
+        )
+        return self
+    
+    def validate(self):
+        """Check that every edge and branch targets a known node or END"""
+        if self._entry is None:
+            raise ValueError("Workflow has no nodes.")
         
-        self.engine.add_edge(name, router)
+        targets = [to_node for _, to_node in self._edges]
+        for _, branches in self._routers.values():
+            targets.extend(branches.values())
         
-        self.current_node = name
-        return self
+        for target in targets:
+            if target != END and target not in self.engine.nodes:
+                raise ValueError(f"Unknown node '{target}' in workflow '{self.engine.name}'")
     
     def build(self) -> WorkflowEngine:
         """Build and return the workflow engine"""
+        self.validate()
+        
         self.engine.build()
+        self.engine.set_entry_point(self._entry)
+        for from_node, to_node in self._edges:
+            self.engine.add_edge(from_node, to_node)
+        for name, (condition_fn, branches) in self._routers.items():
+            self.engine.add_edge(
+                name, _router(condition_fn, branches)
+            )
+        
         self.engine.compile()
-        return self.engine
\ No newline at end of file
+        return self.engine
@@ -0,0 +1,217 @@
+"""Response cache for LLM workflow nodes"""
+
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Optional, Protocol, Tuple
+from collections import OrderedDict
+import hashlib
+import json
+import time
+
+try:
+    from redis.asyncio import from_url as redis_from_url
+except ImportError:
+    redis_from_url = None
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+class CacheBackend(Protocol):
+    """Storage for exact-match cache entries"""
+
+    async def get(self, key: str) -> Optional[str]:
+        ...
+
+    async def set(self, key: str, value: str, ttl: Optional[int] = None):
+        ...
+
+
+class MemoryCacheBackend:
+    """In-process LRU backend with per-entry expiry"""
+
+    def __init__(self, maxsize: int = 1024):
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[str, Tuple[str, Optional[float]]]" = OrderedDict()
+
+    async def get(self, key: str) -> Optional[str]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        value, expires_at = entry
+        if expires_at is not None and time.monotonic() >= expires_at:
+            del self._entries[key]
+            return None
+
+        self._entries.move_to_end(key)
+        return value
+
+    async def set(self, key: str, value: str, ttl: Optional[int] = None):
+        expires_at = time.monotonic() + ttl if ttl else None
+        self._entries[key] = (value, expires_at)
+        self._entries.move_to_end(key)
+
+        # Evict least recently used entries
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+
+class RedisCacheBackend:
+    """Redis backend for sharing cached responses across processes"""
+
+    def __init__(self, redis_url: str, prefix: str = "llm_cache:"):
+        if redis_from_url is None:
+            raise ImportError("redis is required for RedisCacheBackend")
+        self.redis = redis_from_url(redis_url, encoding="utf-8", decode_responses=True)
+        self.prefix = prefix
+
+    async def get(self, key: str) -> Optional[str]:
+        return await self.redis.get(self.prefix + key)
+
+    async def set(self, key: str, value: str, ttl: Optional[int] = None):
+        await self.redis.set(self.prefix + key, value, ex=ttl)
+
+
+class _SimilarityIndex:
+    """Ring buffer of int8 prompt vectors, searched with one matrix-vector product"""
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self.vectors: Optional[Any] = None  # (capacity, dim) int8, sized on first add
+        self.scales = np.zeros(capacity, dtype=np.float32)
+        self.keys: List[Optional[str]] = [None] * capacity
+        self.size = 0
+        self._next = 0
+
+    def add(self, vector: Any, key: str):
+        """Quantize and store a unit vector, overwriting the oldest when full"""
+        if self.vectors is None:
+            self.vectors = np.zeros((self.capacity, vector.size), dtype=np.int8)
+
+        i = self._next
+        self.vectors[i], self.scales[i] = _quantize(vector)
+        self.keys[i] = key
+        self._next = (i + 1) % self.capacity
+        self.size = min(self.size + 1, self.capacity)
+
+    def best(self, vector: Any, threshold: float) -> Optional[str]:
+        """Key of the most similar stored vector scoring at least threshold"""
+        if not self.size:
+            return None
+
+        scores = (self.vectors[:self.size] @ vector) * self.scales[:self.size]
+        i = int(np.argmax(scores))
+        return self.keys[i] if scores[i] >= threshold else None
+
+
+def _quantize(vector: Any) -> Tuple[Any, float]:
+    """Symmetric int8 quantization; vector ~= q * scale"""
+    peak = float(np.max(np.abs(vector))) if vector.size else 0.0
+    if not peak:
+        return np.zeros(vector.shape, dtype=np.int8), 0.0
+    scale = peak / 127
+    return np.round(vector / scale).astype(np.int8), scale
+
+
+class LLMCache:
+    """
+    Two-tier LLM response cache
+
+    - Exact tier: SHA-256 of (model, prompt, template) in a CacheBackend
+    - Similarity tier: opt-in cosine lookup over recent prompt embeddings,
+      held as int8 with a per-vector scale (4x smaller than float32). Lookups
+      only compare prompts within one scope, e.g. the same model and template
+    """
+
+    def __init__(
+        self,
+        backend: Optional[CacheBackend] = None,
+        ttl: Optional[int] = 3600,
+        embed: Optional[Callable[[str], Awaitable[List[float]]]] = None,
+        similarity_threshold: float = 0.95,
+        max_similar: int = 1000
+    ):
+        self.backend = backend or MemoryCacheBackend()
+        self.ttl = ttl
+        self.embed = embed
+        self.similarity_threshold = similarity_threshold
+
+        # Per-scope bounded vector indices for the similarity tier
+        self.max_similar = max_similar
+        self._vectors: Dict[Hashable, _SimilarityIndex] = {}
+        # Embeddings computed by a missed get(), reused by the following set()
+        self._pending: "OrderedDict[str, Any]" = OrderedDict()
+
+        self.stats: Dict[str, int] = {"hits": 0, "similar_hits": 0, "misses": 0}
+
+    @staticmethod
+    def make_key(model: str, prompt: str, template: Optional[str]) -> str:
+        """Exact cache key for a call"""
+        payload = json.dumps(
+            {"model": model, "prompt": prompt, "template": template},
+            sort_keys=True
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    async def get(
+        self,
+        key: str,
+        prompt: str,
+        scope: Hashable = None,
+        similar: bool = False
+    ) -> Optional[str]:
+        """Look up a response by exact key, then optionally by prompt similarity within scope"""
+        value = await self.backend.get(key)
+        if value is not None:
+            self.stats["hits"] += 1
+            return value
+
+        index = self._vectors.get(scope) if similar and self._similarity_enabled else None
+        if index is not None:
+            vector = await self._embed(prompt)
+            best_key = index.best(vector, self.similarity_threshold)
+
+            if best_key is not None:
+                value = await self.backend.get(best_key)
+                if value is not None:
+                    self.stats["similar_hits"] += 1
+                    return value
+
+            self._pending[key] = vector
+            if len(self._pending) > self.max_similar:
+                self._pending.popitem(last=False)
+
+        self.stats["misses"] += 1
+        return None
+
+    async def set(
+        self,
+        key: str,
+        prompt: str,
+        value: str,
+        scope: Hashable = None,
+        similar: bool = False
+    ):
+        """Store a response under its exact key, optionally indexing the prompt in scope"""
+        await self.backend.set(key, value, ttl=self.ttl)
+
+        if similar and self._similarity_enabled:
+            vector = self._pending.pop(key, None)
+            if vector is None:
+                vector = await self._embed(prompt)
+
+            index = self._vectors.get(scope)
+            if index is None:
+                index = self._vectors[scope] = _SimilarityIndex(self.max_similar)
+            index.add(vector, key)
+
+    @property
+    def _similarity_enabled(self) -> bool:
+        return self.embed is not None and np is not None
+
+    async def _embed(self, prompt: str) -> Any:
+        """Unit-normalized embedding so a dot product is cosine similarity"""
+        vector = np.asarray(await self.embed(prompt), dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
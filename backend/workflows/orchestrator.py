@@ -1,14 +1,23 @@
 """Workflow orchestrator for managing multiple workflow executions"""
 
-from typing import Dict, List, Optional, Any, Callable
+from typing import Dict, List, Optional, Any, Callable, Tuple
 from datetime import datetime, timedelta
 import asyncio
+import heapq
+import itertools
+import logging
+import time
 import uuid
-from collections import defaultdict
+from collections import OrderedDict, defaultdict
 from dataclasses import dataclass, field
 import json
 
-from .engine import WorkflowEngine, WorkflowState, WorkflowStatus
+from .engine import WorkflowEngine, WorkflowState, WorkflowStatePool, WorkflowStatus
+
+logger = logging.getLogger(__name__)
+
+# Handler failures logged per second; the rest are only counted
+_HANDLER_ERROR_LOG_RATE = 10
 
 
 @dataclass
@@ -22,19 +31,23 @@ class WorkflowInstance:
     timeout: Optional[timedelta] = None
     dependencies: List[str] = field(default_factory=list)
     metadata: Dict[str, Any] = field(default_factory=dict)
+    created_mono: float = field(default_factory=time.monotonic)
+    # scheduled_time as epoch seconds, so readiness checks skip datetime math
+    scheduled_ts: Optional[float] = None
+    # Number of dependencies that have not completed yet
+    waiting_on: int = 0
+    
+    def __post_init__(self):
+        if self.scheduled_ts is None and self.scheduled_time:
+            self.scheduled_ts = self.scheduled_time.timestamp()
     
     @property
     def is_ready(self) -> bool:
         """Check if workflow is ready to execute"""
-        # Check scheduled time
-        if self.scheduled_time and datetime.now() < self.scheduled_time:
-            return False
-        
-        # Check dependencies (simplified - would need dependency tracking)
-        if self.dependencies:
-            return False
-        
-        return True
+        return (
+            (self.scheduled_ts is None or time.time() >= self.scheduled_ts)
+            and self.waiting_on == 0
+        )
     
     @property
     def is_timeout(self) -> bool:
@@ -42,8 +55,48 @@ class WorkflowInstance:
         if not self.timeout:
             return False
         
-        age = datetime.now() - self.state.created_at
-        return age > self.timeout
+        return time.monotonic() - self.created_mono > self.timeout.total_seconds()
+
+
+@dataclass(slots=True)
+class PerWorkflowMetrics:
+    """Execution counters for one registered workflow"""
+    executed: int = 0
+    completed: int = 0
+    failed: int = 0
+    total_duration: float = 0.0
+    
+    @property
+    def average_duration(self) -> float:
+        finished = self.completed + self.failed
+        return self.total_duration / finished if finished else 0.0
+    
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "executed": self.executed,
+            "completed": self.completed,
+            "failed": self.failed,
+            "average_duration": self.average_duration
+        }
+
+
+@dataclass(slots=True)
+class WorkflowMetrics(PerWorkflowMetrics):
+    """Orchestrator-wide counters plus per-workflow breakdown"""
+    by_workflow: Dict[str, PerWorkflowMetrics] = field(default_factory=dict)
+    handler_errors: int = 0
+    
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "total_executed": self.executed,
+            "total_completed": self.completed,
+            "total_failed": self.failed,
+            "average_duration": self.average_duration,
+            "handler_errors": self.handler_errors,
+            "by_workflow": {
+                name: metrics.to_dict() for name, metrics in self.by_workflow.items()
+            }
+        }
 
 
 class WorkflowOrchestrator:
@@ -61,43 +114,74 @@ class WorkflowOrchestrator:
     def __init__(
         self,
         max_concurrent_workflows: int = 10,
-        max_queue_size: int = 100
+        max_queue_size: int = 100,
+        eager_tasks: bool = False,
+        completed_retention: int = 1000,
+        finished_retention: int = 100_000,
+        completion_sink: Optional[Callable[[WorkflowInstance], None]] = None,
+        event_drain_timeout: float = 5.0
     ):
         self.max_concurrent_workflows = max_concurrent_workflows
         self.max_queue_size = max_queue_size
+        self.eager_tasks = eager_tasks
+        self.completed_retention = completed_retention
+        self.finished_retention = finished_retention
+        # Called with each completed instance before it is evicted
+        self.completion_sink = completion_sink
+        # Seconds stop() waits for queued events to reach their handlers
+        self.event_drain_timeout = event_drain_timeout
         
         # Workflow registry
         self.registered_workflows: Dict[str, WorkflowEngine] = {}
         
         # Execution management
-        self.workflow_queue: List[WorkflowInstance] = []
+        # Heap of (-priority, scheduled_ts, seq, instance); cancelled
+        # entries are left in place and skipped when popped
+        self.workflow_queue: List[Tuple[int, float, int, WorkflowInstance]] = []
+        # Heap of (scheduled_ts, queue entry) for instances not yet due
+        self._delayed: List[Tuple[float, Tuple[int, float, int, WorkflowInstance]]] = []
+        self._queued: Dict[str, WorkflowInstance] = {}
+        # Every live or retained instance by id, whatever its status
+        self._instances: Dict[str, WorkflowInstance] = {}
+        # Reverse dependency edges: instance id -> ids waiting on it
+        self._dependents: Dict[str, List[str]] = defaultdict(list)
+        self._queue_seq = itertools.count()
         self.active_workflows: Dict[str, WorkflowInstance] = {}
-        self.completed_workflows: Dict[str, WorkflowInstance] = {}
+        # Most recently completed instances, oldest first
+        self.completed_workflows: "OrderedDict[str, WorkflowInstance]" = OrderedDict()
+        # Whether each finished instance succeeded, oldest first; kept well past
+        # completed_retention so evicted instances still resolve as dependencies
+        self._finished: "OrderedDict[str, bool]" = OrderedDict()
+        self.state_pool = WorkflowStatePool(max_size=max_queue_size)
         
         # Metrics
-        self.metrics = {
-            "total_executed": 0,
-            "total_completed": 0,
-            "total_failed": 0,
-            "average_duration": 0.0,
-            "by_workflow": defaultdict(lambda: {
-                "executed": 0,
-                "completed": 0,
-                "failed": 0,
-                "average_duration": 0.0
-            })
-        }
+        self.metrics = WorkflowMetrics()
         
-        # Event handlers
-        self.event_handlers: Dict[str, List[Callable]] = defaultdict(list)
+        # Event handlers as (is_coroutine, handler), dispatched by one consumer task
+        self.event_handlers: Dict[str, List[Tuple[bool, Callable]]] = defaultdict(list)
+        self._event_queue: asyncio.Queue = asyncio.Queue(maxsize=10_000)
+        self._event_task = None
+        self._dropped_events = 0
+        # Token bucket limiting handler error logs to _HANDLER_ERROR_LOG_RATE/s
+        self._error_log_tokens = float(_HANDLER_ERROR_LOG_RATE)
+        self._error_log_refill = time.monotonic()
         
         # Orchestrator state
         self.is_running = False
         self._executor_task = None
+        # Loop whose task factory start() replaced, restored by stop()
+        self._eager_loop: Optional[asyncio.AbstractEventLoop] = None
+        # Set whenever the executor loop has new work to look at
+        self._wake = asyncio.Event()
     
     def register_workflow(self, workflow: WorkflowEngine):
         """Register a workflow for execution"""
+        # Compile once here so scheduled instances share the compiled graph
+        if workflow.graph is not None and workflow.compiled_graph is None:
+            workflow.compile()
+        
         self.registered_workflows[workflow.name] = workflow
+        self.metrics.by_workflow.setdefault(workflow.name, PerWorkflowMetrics())
     
     def schedule_workflow(
         self,
@@ -114,17 +198,24 @@ class WorkflowOrchestrator:
             raise ValueError(f"Workflow '{workflow_name}' not registered")
         
         # Check queue size
-        if len(self.workflow_queue) >= self.max_queue_size:
+        if len(self._queued) >= self.max_queue_size:
             raise RuntimeError("Workflow queue is full")
         
+        # Dependencies must already be scheduled, which also rules out cycles
+        dependencies = dependencies or []
+        waiting_on = []
+        for dependency in dependencies:
+            succeeded = self._finished.get(dependency)
+            if succeeded is None:
+                if dependency not in self._instances:
+                    raise ValueError(f"Unknown dependency '{dependency}'")
+                waiting_on.append(dependency)
+            elif not succeeded:
+                raise ValueError(f"Dependency '{dependency}' did not complete")
+        
         # Create workflow instance
         instance_id = f"instance_{uuid.uuid4().hex}"
-        state = WorkflowState(
-            workflow_id=instance_id,
-            status=WorkflowStatus.PENDING,
-            current_node=None,
-            context=initial_context or {}
-        )
+        state = self.state_pool.get(instance_id, initial_context or {})
         
         instance = WorkflowInstance(
             id=instance_id,
@@ -133,13 +224,17 @@ class WorkflowOrchestrator:
             priority=priority,
             scheduled_time=scheduled_time,
             timeout=timeout,
-            dependencies=dependencies or [],
-            metadata=metadata or {}
+            dependencies=dependencies,
+            metadata=metadata or {},
+            waiting_on=len(waiting_on)
         )
+        for dependency in waiting_on:
+            self._dependents[dependency].append(instance_id)
         
         # Add to queue
-        self.workflow_queue.append(instance)
-        self._sort_queue()
+        self._instances[instance_id] = instance
+        self._push_queue(instance)
+        self._wake.set()
         
         # Emit event
         self._emit_event("workflow_scheduled", instance)
@@ -152,6 +247,20 @@ class WorkflowOrchestrator:
             return
         
         self.is_running = True
+        
+        # Opt-in: run tasks eagerly (Python 3.12+) so steps that finish
+        # without suspending skip a scheduler round-trip. This changes the
+        # factory for the whole loop until stop()
+        loop = asyncio.get_running_loop()
+        if (
+            self.eager_tasks
+            and hasattr(asyncio, "eager_task_factory")
+            and loop.get_task_factory() is None
+        ):
+            loop.set_task_factory(asyncio.eager_task_factory)
+            self._eager_loop = loop
+        
+        self._event_task = asyncio.create_task(self._event_consumer())
         self._executor_task = asyncio.create_task(self._executor_loop())
         self._emit_event("orchestrator_started", {})
     
@@ -167,49 +276,56 @@ class WorkflowOrchestrator:
                 pass
         
         self._emit_event("orchestrator_stopped", {})
+        
+        # Deliver pending events before stopping the consumer, but do not let
+        # a slow handler hang shutdown; undelivered events stay queued for
+        # the next start()
+        if self._event_task:
+            try:
+                await asyncio.wait_for(self._event_queue.join(), self.event_drain_timeout)
+            except asyncio.TimeoutError:
+                logger.warning("Event handlers did not finish within %.1fs; stopping anyway", self.event_drain_timeout)
+            self._event_task.cancel()
+            try:
+                await self._event_task
+            except asyncio.CancelledError:
+                pass
+        
+        # Hand the loop back with the task factory it had before start()
+        if self._eager_loop is not None:
+            if self._eager_loop.get_task_factory() is asyncio.eager_task_factory:
+                self._eager_loop.set_task_factory(None)
+            self._eager_loop = None
     
     def cancel_workflow(self, instance_id: str) -> bool:
         """Cancel a workflow"""
-        # Check if in queue
-        for i, instance in enumerate(self.workflow_queue):
-            if instance.id == instance_id:
-                self.workflow_queue.pop(i)
-                instance.state.status = WorkflowStatus.CANCELLED
-                self._emit_event("workflow_cancelled", instance)
-                return True
-        
-        # Check if active
-        if instance_id in self.active_workflows:
-            instance = self.active_workflows[instance_id]
+        instance = self._instances.get(instance_id)
+        if not instance:
+            return False
+        
+        if self._queued.pop(instance_id, None) is not None:
+            # Queued: its heap entry is now a tombstone skipped when popped
+            self._record_completed(instance)
+        elif instance_id in self.active_workflows:
             workflow = self.registered_workflows[instance.workflow_name]
             workflow.cancel(instance_id)
-            instance.state.status = WorkflowStatus.CANCELLED
-            self._emit_event("workflow_cancelled", instance)
-            return True
+        else:
+            return False
         
-        return False
+        instance.state.status = WorkflowStatus.CANCELLED
+        self._wake.set()
+        self._emit_event("workflow_cancelled", instance)
+        return True
     
     def get_status(self, instance_id: str) -> Optional[WorkflowStatus]:
         """Get workflow status"""
-        # Check queue
-        for instance in self.workflow_queue:
-            if instance.id == instance_id:
-                return instance.state.status
-        
-        # Check active
-        if instance_id in self.active_workflows:
-            return self.active_workflows[instance_id].state.status
-        
-        # Check completed
-        if instance_id in self.completed_workflows:
-            return self.completed_workflows[instance_id].state.status
-        
-        return None
+        instance = self._instances.get(instance_id)
+        return instance.state.status if instance else None
     
     def get_queue_status(self) -> Dict[str, Any]:
         """Get queue status"""
         return {
-            "queued": len(self.workflow_queue),
+            "queued": len(self._queued),
             "active": len(self.active_workflows),
             "completed": len(self.completed_workflows),
             "max_concurrent": self.max_concurrent_workflows,
@@ -218,42 +334,71 @@ class WorkflowOrchestrator:
     
     def on_event(self, event_type: str, handler: Callable):
         """Register an event handler"""
-        self.event_handlers[event_type].append(handler)
+        self.event_handlers[event_type].append(
+            (asyncio.iscoroutinefunction(handler), handler)
+        )
     
     async def _executor_loop(self):
         """Main executor loop"""
         while self.is_running:
             try:
+                self._wake.clear()
+                
                 # Check for workflows to execute
                 await self._process_queue()
                 
                 # Check for timeouts
                 await self._check_timeouts()
                 
-                # Small delay to prevent busy waiting
-                await asyncio.sleep(0.1)
+                # Sleep until new work, a freed slot, or the next deadline
+                try:
+                    await asyncio.wait_for(self._wake.wait(), timeout=self._next_deadline())
+                except asyncio.TimeoutError:
+                    pass
                 
             except Exception as e:
                 self._emit_event("orchestrator_error", {"error": str(e)})
     
     async def _process_queue(self):
         """Process workflow queue"""
-        # Check if we can execute more workflows
-        if len(self.active_workflows) >= self.max_concurrent_workflows:
-            return
+        # Promote scheduled instances that are now due
+        now = time.time()
+        while self._delayed and self._delayed[0][0] <= now:
+            _, entry = heapq.heappop(self._delayed)
+            heapq.heappush(self.workflow_queue, entry)
+        
+        # Start ready workflows, in priority order, while slots are free
+        blocked = []
+        while self.workflow_queue and len(self.active_workflows) < self.max_concurrent_workflows:
+            entry = heapq.heappop(self.workflow_queue)
+            instance = entry[-1]
+            if self._queued.get(instance.id) is not instance:
+                continue  # Cancelled
+            if not instance.is_ready:
+                blocked.append(entry)
+                continue
+            
+            # Execute workflow
+            await self._execute_workflow(self._queued.pop(instance.id))
+        
+        for entry in blocked:
+            heapq.heappush(self.workflow_queue, entry)
+    
+    def _next_deadline(self) -> Optional[float]:
+        """Seconds until the next scheduled start or active timeout, if any"""
+        waits = []
         
-        # Find next ready workflow
-        next_instance = None
-        for i, instance in enumerate(self.workflow_queue):
-            if instance.is_ready:
-                next_instance = self.workflow_queue.pop(i)
-                break
+        if self._delayed:
+            waits.append(self._delayed[0][0] - time.time())
         
-        if not next_instance:
-            return
+        now = time.monotonic()
+        for instance in self.active_workflows.values():
+            if instance.timeout:
+                waits.append(instance.created_mono + instance.timeout.total_seconds() - now)
         
-        # Execute workflow
-        await self._execute_workflow(next_instance)
+        if not waits:
+            return None
+        return max(0.0, min(waits))
     
     async def _execute_workflow(self, instance: WorkflowInstance):
         """Execute a workflow instance"""
@@ -261,7 +406,7 @@ class WorkflowOrchestrator:
         if not workflow:
             instance.state.status = WorkflowStatus.FAILED
             instance.state.add_error("orchestrator", f"Workflow '{instance.workflow_name}' not found")
-            self.completed_workflows[instance.id] = instance
+            self._record_completed(instance)
             return
         
         # Add to active workflows
@@ -269,8 +414,8 @@ class WorkflowOrchestrator:
         instance.state.status = WorkflowStatus.RUNNING
         
         # Update metrics
-        self.metrics["total_executed"] += 1
-        self.metrics["by_workflow"][instance.workflow_name]["executed"] += 1
+        self.metrics.executed += 1
+        self.metrics.by_workflow[instance.workflow_name].executed += 1
         
         # Emit event
         self._emit_event("workflow_started", instance)
@@ -280,42 +425,54 @@ class WorkflowOrchestrator:
     
     async def _run_workflow(self, workflow: WorkflowEngine, instance: WorkflowInstance):
         """Run workflow in background"""
-        start_time = datetime.now()
+        start_mono = time.monotonic()
+        scheduled_state = instance.state
         
         try:
             # Execute workflow
             final_state = await workflow.execute(
-                initial_context=instance.state.context,
+                initial_context=scheduled_state.context,
                 workflow_id=instance.id
             )
             
+            # Already recorded as timed out by _check_timeouts
+            if instance.id not in self.active_workflows:
+                return
+            
             # Update instance state
             instance.state = final_state
             
             # Update metrics
-            duration = (datetime.now() - start_time).total_seconds()
+            duration = time.monotonic() - start_mono
             self._update_metrics(instance.workflow_name, "completed", duration)
             
             # Emit event
             self._emit_event("workflow_completed", instance)
             
         except Exception as e:
+            if instance.id not in self.active_workflows:
+                return
+            
             # Handle failure
             instance.state.status = WorkflowStatus.FAILED
             instance.state.add_error("execution", str(e))
             
             # Update metrics
-            duration = (datetime.now() - start_time).total_seconds()
+            duration = time.monotonic() - start_mono
             self._update_metrics(instance.workflow_name, "failed", duration)
             
             # Emit event
             self._emit_event("workflow_failed", instance)
         
         finally:
-            # Move to completed
-            if instance.id in self.active_workflows:
-                del self.active_workflows[instance.id]
-            self.completed_workflows[instance.id] = instance
+            # Move to completed, unless a timeout already did
+            if self.active_workflows.pop(instance.id, None) is not None:
+                self._record_completed(instance)
+                self._wake.set()
+            
+            # Recycle the scheduling state once the result has replaced it
+            if instance.state is not scheduled_state:
+                self.state_pool.put(scheduled_state)
     
     async def _check_timeouts(self):
         """Check for workflow timeouts"""
@@ -331,63 +488,143 @@ class WorkflowOrchestrator:
                 
                 # Move to completed
                 del self.active_workflows[instance_id]
-                self.completed_workflows[instance_id] = instance
+                self._record_completed(instance)
                 
                 # Emit event
                 self._emit_event("workflow_timeout", instance)
     
-    def _sort_queue(self):
-        """Sort workflow queue by priority and scheduled time"""
-        self.workflow_queue.sort(
-            key=lambda x: (
-                -x.priority,  # Higher priority first
-                x.scheduled_time or datetime.min  # Earlier scheduled time first
-            )
+    def _record_completed(self, instance: WorkflowInstance):
+        """Keep a completed instance, evicting the oldest beyond retention"""
+        self._instances[instance.id] = instance
+        self._finished[instance.id] = instance.state.status == WorkflowStatus.COMPLETED
+        self._finished.move_to_end(instance.id)
+        self.completed_workflows[instance.id] = instance
+        self.completed_workflows.move_to_end(instance.id)
+        self._release_dependents(instance)
+        
+        # Older ids are unknown to schedule_workflow
+        while len(self._finished) > self.finished_retention:
+            self._finished.popitem(last=False)
+        
+        while len(self.completed_workflows) > self.completed_retention:
+            _, evicted = self.completed_workflows.popitem(last=False)
+            self._instances.pop(evicted.id, None)
+            if self.completion_sink:
+                try:
+                    self.completion_sink(evicted)
+                except Exception as e:
+                    self._emit_event("orchestrator_error", {"error": str(e)})
+    
+    def _release_dependents(self, instance: WorkflowInstance):
+        """Unblock instances waiting on a finished one, or fail them if it failed"""
+        succeeded = instance.state.status == WorkflowStatus.COMPLETED
+        
+        for child_id in self._dependents.pop(instance.id, ()):
+            child = self._queued.get(child_id)
+            if child is None:
+                continue  # Cancelled or already failed
+            
+            if succeeded:
+                child.waiting_on -= 1
+                if child.waiting_on == 0:
+                    self._push_queue(child)
+                    self._wake.set()
+            else:
+                del self._queued[child_id]
+                child.state.status = WorkflowStatus.FAILED
+                child.state.add_error("orchestrator", f"Dependency '{instance.id}' did not complete")
+                self._record_completed(child)
+                self._emit_event("workflow_failed", child)
+    
+    def _push_queue(self, instance: WorkflowInstance):
+        """Queue an instance by priority and scheduled time"""
+        self._queued[instance.id] = instance
+        if instance.waiting_on:
+            return  # Queued by _release_dependents once its dependencies finish
+        
+        entry = (
+            -instance.priority,  # Higher priority first
+            instance.scheduled_ts or 0.0,  # Earlier scheduled time first
+            next(self._queue_seq),  # FIFO among equals
+            instance
         )
+        
+        # Instances scheduled for later wait in the delayed heap until due
+        if instance.scheduled_ts and instance.scheduled_ts > time.time():
+            heapq.heappush(self._delayed, (instance.scheduled_ts, entry))
+        else:
+            heapq.heappush(self.workflow_queue, entry)
+    
+    def _queued_instances(self) -> List[WorkflowInstance]:
+        """Get live queued instances in execution order"""
+        entries = self.workflow_queue + [entry for _, entry in self._delayed]
+        queued = [
+            entry[-1] for entry in sorted(entries)
+            if self._queued.get(entry[-1].id) is entry[-1]
+        ]
+        return queued + [instance for instance in self._queued.values() if instance.waiting_on]
     
     def _update_metrics(self, workflow_name: str, status: str, duration: float):
         """Update execution metrics"""
+        workflow_metrics = self.metrics.by_workflow[workflow_name]
         if status == "completed":
-            self.metrics["total_completed"] += 1
-            self.metrics["by_workflow"][workflow_name]["completed"] += 1
+            self.metrics.completed += 1
+            workflow_metrics.completed += 1
         elif status == "failed":
-            self.metrics["total_failed"] += 1
-            self.metrics["by_workflow"][workflow_name]["failed"] += 1
+            self.metrics.failed += 1
+            workflow_metrics.failed += 1
         
-        # Update average duration
-        workflow_metrics = self.metrics["by_workflow"][workflow_name]
-        current_avg = workflow_metrics["average_duration"]
-        count = workflow_metrics["completed"] + workflow_metrics["failed"]
-        
-        if count > 0:
-            workflow_metrics["average_duration"] = (
-                (current_avg * (count - 1) + duration) / count
-            )
-        
-        # Update global average
-        total_count = self.metrics["total_completed"] + self.metrics["total_failed"]
-        if total_count > 0:
-            current_global_avg = self.metrics["average_duration"]
-            self.metrics["average_duration"] = (
-                (current_global_avg * (total_count - 1) + duration) / total_count
-            )
+        # Averages are derived from these totals when read
+        self.metrics.total_duration += duration
+        workflow_metrics.total_duration += duration
     
     def _emit_event(self, event_type: str, data: Any):
         """Emit an event to registered handlers"""
-        for handler in self.event_handlers[event_type]:
+        if event_type not in self.event_handlers:
+            return
+        
+        try:
+            self._event_queue.put_nowait((event_type, data))
+        except asyncio.QueueFull:
+            self._dropped_events += 1
+    
+    async def _event_consumer(self):
+        """Dispatch queued events to their handlers in order"""
+        while True:
+            event_type, data = await self._event_queue.get()
             try:
-                if asyncio.iscoroutinefunction(handler):
-                    asyncio.create_task(handler(event_type, data))
-                else:
-                    handler(event_type, data)
-            except Exception as e:
-                # Log error but don't fail
-                print(f"Error in event handler: {e}")
+                for is_coroutine, handler in self.event_handlers.get(event_type, ()):
+                    try:
+                        if is_coroutine:
+                            await handler(event_type, data)
+                        else:
+                            handler(event_type, data)
+                    except Exception:
+                        # Log error but don't fail
+                        self._handler_failed(event_type)
+            finally:
+                self._event_queue.task_done()
+    
+    def _handler_failed(self, event_type: str):
+        """Count a failed event handler and log it within the rate limit"""
+        self.metrics.handler_errors += 1
+        
+        now = time.monotonic()
+        self._error_log_tokens = min(
+            float(_HANDLER_ERROR_LOG_RATE),
+            self._error_log_tokens + (now - self._error_log_refill) * _HANDLER_ERROR_LOG_RATE
+        )
+        self._error_log_refill = now
+        
+        if self._error_log_tokens >= 1.0:
+            self._error_log_tokens -= 1.0
+            logger.warning("Event handler failed for %s", event_type, exc_info=True)
     
     def get_metrics(self) -> Dict[str, Any]:
         """Get orchestrator metrics"""
         return {
-            **self.metrics,
+            **self.metrics.to_dict(),
+            "dropped_events": self._dropped_events,
             "queue_status": self.get_queue_status()
         }
     
@@ -402,7 +639,7 @@ class WorkflowOrchestrator:
                     "status": inst.state.status.value,
                     "priority": inst.priority
                 }
-                for inst in self.workflow_queue
+                for inst in self._queued_instances()
             ],
             "active": [
                 {
@@ -1,20 +1,107 @@
 """Pre-built workflow templates for common patterns"""
 
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, ClassVar, Tuple
 from abc import ABC, abstractmethod
+import functools
+import textwrap
 
 from langchain_core.language_models import BaseChatModel
 from langchain.tools import BaseTool
 
-from .engine import WorkflowEngine, WorkflowBuilder, WorkflowState
+from .engine import WorkflowEngine, WorkflowBuilder, WorkflowState, ToolNode
+
+
+def _prompt(text: str) -> str:
+    """Canonical form of a prompt block so cached prefixes stay byte-identical"""
+    return textwrap.dedent(text).strip()
+
+
+# Static instructions, sent as system prompts ahead of the per-run data, and
+# the per-run templates; the engine compiles each template once per process
+PARSE_QUERY_PREFIX = _prompt("""
+    Parse the following research query and extract:
+    1. Main topic
+    2. Key questions
+    3. Search keywords
+    
+    Response format:
+    Topic: ...
+    Questions: ...
+    Keywords: ...
+""")
+PARSE_QUERY_TEMPLATE = "Query: {query}"
+
+ANALYZE_PREFIX = _prompt("""
+    Analyze the search results and identify:
+    1. Key findings
+    2. Relevant sources
+    3. Gaps in information
+""")
+ANALYZE_TEMPLATE = "Results: {search_results}\n\nAnalysis:"
+
+SUMMARY_PREFIX = _prompt("""
+    Create a comprehensive summary of the research findings.
+""")
+SUMMARY_TEMPLATE = "Topic: {topic}\nAnalysis: {analysis}\n\nSummary:"
+
+RESPONSE_PREFIX = _prompt("""
+    Generate a helpful response that takes into account the context and memories.
+""")
+RESPONSE_TEMPLATE = "Context from memory: {memories}\n\nUser message: {user_message}\n\nResponse:"
+
+PLAN_PREFIX = _prompt("""
+    Create a step-by-step execution plan:
+    1. Break down the task into subtasks
+    2. Identify which tools to use for each subtask
+    3. Define success criteria
+""")
+PLAN_TEMPLATE = "Task: {task_description}\nAvailable tools: {available_tools}\n\nPlan:"
+
+VERIFY_PREFIX = _prompt("""
+    Verify that the task has been completed successfully:
+    1. Check if all subtasks were completed
+    2. Validate the results
+    3. Identify any issues
+""")
+VERIFY_TEMPLATE = "Task: {task_description}\nExecution plan: {plan}\nResults: {execution_results}\n\nVerification:"
+
+REPORT_PREFIX = _prompt("""
+    Generate a completion report for the task.
+    
+    Report should include:
+    - Summary of what was accomplished
+    - Any issues encountered
+    - Recommendations for future
+""")
+REPORT_TEMPLATE = "Task: {task_description}\nVerification: {verification}\n\nReport:"
+
+VALIDATE_PREFIX = _prompt("""
+    Validate the data and identify:
+    1. Data quality issues
+    2. Missing values
+    3. Preprocessing needs
+""")
+VALIDATE_TEMPLATE = "Data summary: {data_summary}\n\nValidation report:"
+
+INSIGHTS_PREFIX = _prompt("""
+    Generate key insights:
+    1. Main findings
+    2. Patterns and trends
+    3. Anomalies or outliers
+    4. Recommendations
+""")
+INSIGHTS_TEMPLATE = "Analysis results: {analysis_results}\n\nInsights:"
 
 
 class WorkflowTemplate(ABC):
     """Abstract base class for workflow templates"""
     
-    def __init__(self, name: str, description: str = ""):
-        self.name = name
-        self.description = description
+    NAME: ClassVar[str] = ""
+    DESCRIPTION: ClassVar[str] = ""
+    
+    def __init__(self, name: Optional[str] = None, description: Optional[str] = None):
+        self.name = name or type(self).NAME
+        self.description = type(self).DESCRIPTION if description is None else description
     
     @abstractmethod
     def build(self, **kwargs) -> WorkflowEngine:
@@ -33,11 +120,8 @@ class ResearchWorkflowTemplate(WorkflowTemplate):
     4. Generate summary
     """
     
-    def __init__(self):
-        super().__init__(
-            "research_workflow",
-            "Research and analysis workflow"
-        )
+    NAME = "research_workflow"
+    DESCRIPTION = "Research and analysis workflow"
     
     def build(
         self,
@@ -52,19 +136,8 @@ class ResearchWorkflowTemplate(WorkflowTemplate):
         builder.add_llm_node(
             "parse_query",
             llm,
-            prompt_template="""
-            Parse the following research query and extract:
-            1. Main topic
-            2. Key questions
-            3. Search keywords
-            
-            Query: {query}
-            
-            Response format:
-            Topic: ...
-            Questions: ...
-            Keywords: ...
-            """
+            prompt_template=PARSE_QUERY_TEMPLATE,
+            system_prompt=PARSE_QUERY_PREFIX
         )
         
         # Step 2: Search
@@ -78,16 +151,8 @@ class ResearchWorkflowTemplate(WorkflowTemplate):
         builder.add_llm_node(
             "analyze",
             llm,
-            prompt_template="""
-            Analyze the search results and identify:
-            1. Key findings
-            2. Relevant sources
-            3. Gaps in information
-            
-            Results: {search_results}
-            
-            Analysis:
-            """
+            prompt_template=ANALYZE_TEMPLATE,
+            system_prompt=ANALYZE_PREFIX
         )
         
         # Step 4: Generate summary
@@ -101,19 +166,21 @@ class ResearchWorkflowTemplate(WorkflowTemplate):
             builder.add_llm_node(
                 "summarize",
                 llm,
-                prompt_template="""
-                Create a comprehensive summary of the research findings:
-                
-                Topic: {topic}
-                Analysis: {analysis}
-                
-                Summary:
-                """
+                prompt_template=SUMMARY_TEMPLATE,
+                system_prompt=SUMMARY_PREFIX
             )
         
         return builder.build()
 
 
+def should_store_memory(state: WorkflowState) -> str:
+    """Store the exchange only if the response is substantial"""
+    result = state.results.get("generate_response")
+    if result and len(result.get("response", "")) > 100:
+        return "store_memory"
+    return "end"
+
+
 class ConversationWorkflowTemplate(WorkflowTemplate):
     """
     Template for conversation workflows with memory
@@ -124,11 +191,8 @@ class ConversationWorkflowTemplate(WorkflowTemplate):
     3. Store important information
     """
     
-    def __init__(self):
-        super().__init__(
-            "conversation_workflow",
-            "Conversation workflow with memory integration"
-        )
+    NAME = "conversation_workflow"
+    DESCRIPTION = "Conversation workflow with memory integration"
     
     def build(
         self,
@@ -150,25 +214,12 @@ class ConversationWorkflowTemplate(WorkflowTemplate):
         builder.add_llm_node(
             "generate_response",
             llm,
-            prompt_template="""
-            Context from memory: {memories}
-            
-            User message: {user_message}
-            
-            Generate a helpful response that takes into account the context and memories.
-            
-            Response:
-            """
+            prompt_template=RESPONSE_TEMPLATE,
+            system_prompt=RESPONSE_PREFIX,
+            prompt_defaults={"memories": "None"}
         )
         
         # Step 3: Conditional memory storage
-        def should_store_memory(state: WorkflowState) -> str:
-            # Simple heuristic - store if response is substantial
-            response = state.results.get("generate_response", {}).get("response", "")
-            if len(response) > 100:
-                return "store_memory"
-            return "end"
-        
         builder.add_conditional(
             "check_storage",
             should_store_memory,
@@ -199,11 +250,8 @@ class TaskExecutionWorkflowTemplate(WorkflowTemplate):
     4. Report completion
     """
     
-    def __init__(self):
-        super().__init__(
-            "task_execution_workflow",
-            "Task planning and execution workflow"
-        )
+    NAME = "task_execution_workflow"
+    DESCRIPTION = "Task planning and execution workflow"
     
     def build(
         self,
@@ -218,26 +266,19 @@ class TaskExecutionWorkflowTemplate(WorkflowTemplate):
         builder.add_llm_node(
             "plan_execution",
             llm,
-            prompt_template="""
-            Task: {task_description}
-            Available tools: {available_tools}
-            
-            Create a step-by-step execution plan:
-            1. Break down the task into subtasks
-            2. Identify which tools to use for each subtask
-            3. Define success criteria
-            
-            Plan:
-            """
+            prompt_template=PLAN_TEMPLATE,
+            system_prompt=PLAN_PREFIX
         )
         
         # Step 2: Execute subtasks (simplified - in practice would be dynamic)
-        for i, tool in enumerate(task_tools[:3]):  # Limit to 3 tools for example
-            builder.add_tool_node(
-                f"execute_subtask_{i}",
-                tool,
-                tool.name
-            )
+        # Subtasks don't depend on each other, so they run concurrently
+        builder.add_parallel(
+            "execute_subtasks",
+            [
+                ToolNode(f"execute_subtask_{i}", tool, tool.name)
+                for i, tool in enumerate(task_tools[:3])  # Limit to 3 tools for example
+            ]
+        )
         
         # Step 3: Verify results
         if verification_tool:
@@ -250,37 +291,16 @@ class TaskExecutionWorkflowTemplate(WorkflowTemplate):
             builder.add_llm_node(
                 "verify_results",
                 llm,
-                prompt_template="""
-                Task: {task_description}
-                Execution plan: {plan}
-                Results: {execution_results}
-                
-                Verify that the task has been completed successfully:
-                1. Check if all subtasks were completed
-                2. Validate the results
-                3. Identify any issues
-                
-                Verification:
-                """
+                prompt_template=VERIFY_TEMPLATE,
+                system_prompt=VERIFY_PREFIX
             )
         
         # Step 4: Generate report
         builder.add_llm_node(
             "generate_report",
             llm,
-            prompt_template="""
-            Generate a completion report for the task:
-            
-            Task: {task_description}
-            Verification: {verification}
-            
-            Report should include:
-            - Summary of what was accomplished
-            - Any issues encountered
-            - Recommendations for future
-            
-            Report:
-            """
+            prompt_template=REPORT_TEMPLATE,
+            system_prompt=REPORT_PREFIX
         )
         
         return builder.build()
@@ -297,11 +317,8 @@ class AnalysisWorkflowTemplate(WorkflowTemplate):
     4. Create visualizations
     """
     
-    def __init__(self):
-        super().__init__(
-            "analysis_workflow",
-            "Data analysis and insight generation workflow"
-        )
+    NAME = "analysis_workflow"
+    DESCRIPTION = "Data analysis and insight generation workflow"
     
     def build(
         self,
@@ -324,16 +341,8 @@ class AnalysisWorkflowTemplate(WorkflowTemplate):
         builder.add_llm_node(
             "validate_data",
             llm,
-            prompt_template="""
-            Data summary: {data_summary}
-            
-            Validate the data and identify:
-            1. Data quality issues
-            2. Missing values
-            3. Preprocessing needs
-            
-            Validation report:
-            """
+            prompt_template=VALIDATE_TEMPLATE,
+            system_prompt=VALIDATE_PREFIX
         )
         
         # Step 3: Perform analysis
@@ -347,17 +356,8 @@ class AnalysisWorkflowTemplate(WorkflowTemplate):
         builder.add_llm_node(
             "generate_insights",
             llm,
-            prompt_template="""
-            Analysis results: {analysis_results}
-            
-            Generate key insights:
-            1. Main findings
-            2. Patterns and trends
-            3. Anomalies or outliers
-            4. Recommendations
-            
-            Insights:
-            """
+            prompt_template=INSIGHTS_TEMPLATE,
+            system_prompt=INSIGHTS_PREFIX
         )
         
         # Step 5: Create visualizations (optional)
@@ -390,10 +390,14 @@ def get_workflow_template(template_name: str) -> Optional[WorkflowTemplate]:
 
 def list_workflow_templates() -> List[Dict[str, str]]:
     """List all available workflow templates"""
-    return [
-        {
-            "name": name,
-            "description": template_class().description
-        }
+    # Copies, so callers can't mutate the cached entries
+    return [dict(entry) for entry in _template_listing()]
+
+
+@functools.cache
+def _template_listing() -> Tuple[Dict[str, str], ...]:
+    """Registry listing read from class attributes; the registry is static"""
+    return tuple(
+        {"name": name, "description": template_class.DESCRIPTION}
         for name, template_class in WORKFLOW_TEMPLATES.items()
-    ]
\ No newline at end of file
+    )
\ No newline at end of file
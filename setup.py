@@ -5,20 +5,60 @@ import subprocess
 import sys
 import os
 from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 
-def run_command(cmd, cwd=None):
-    """Run a shell command"""
-    print(f"Running: {' '.join(cmd)}")
-    result = subprocess.run(cmd, cwd=cwd, capture_output=True, text=True)
+# Backend .env
+BACKEND_ENV_TEMPLATE = """# Backend Environment Variables
+
+# AI Model API Keys (at least one required)
+ANTHROPIC_API_KEY=your_anthropic_api_key_here
+# OPENAI_API_KEY=your_openai_api_key_here
+
+# Model Provider (anthropic or openai)
+MODEL_PROVIDER=anthropic
+
+# Supadata API Key for YouTube transcripts
+SUPADATA_API_KEY=your_supadata_key_here
+
+# Optional: Redis URL for session storage
+# REDIS_URL=redis://localhost:6379
+
+# Optional: Vector Database Keys
+# PINECONE_API_KEY=your_pinecone_key_here
+# PINECONE_ENV=us-east-1
+"""
+
+# Frontend .env.local
+FRONTEND_ENV_TEMPLATE = """# Frontend Environment Variables
+
+# Backend API URL
+NEXT_PUBLIC_API_URL=http://localhost:8000
+"""
+
+
+def run_command(cmd, cwd=None, capture=True, prefix=""):
+    """Run a shell command; capture=False streams its output, each line tagged with prefix"""
+    print(f"{prefix}Running: {' '.join(cmd)}")
+    if not capture and prefix:
+        # Forward whole lines so concurrent commands do not interleave mid-line
+        with subprocess.Popen(
+            cmd, cwd=cwd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True
+        ) as proc:
+            for line in proc.stdout:
+                print(f"{prefix}{line}", end="", flush=True)
+        return proc.returncode == 0
+    
+    result = subprocess.run(cmd, cwd=cwd, capture_output=capture, text=True)
     if result.returncode != 0:
-        print(f"Error: {result.stderr}")
+        if capture:
+            print(f"Error: {result.stderr}")
         return False
     return True
 
 
-def setup_backend(install_optional=False):
-    """Setup backend dependencies"""
+def setup_backend(install_optional=False, prefix=""):
+    """Setup backend dependencies, streaming pip output with each line tagged with prefix"""
     print("\n=== Setting up Backend ===")
     
     backend_dir = Path(__file__).parent / "backend"
@@ -30,35 +70,40 @@ def setup_backend(install_optional=False):
         if not run_command([sys.executable, "-m", "venv", "venv"], cwd=backend_dir):
             return False
     
-    # Determine pip path
+    # Run pip through the venv's python; pip.exe cannot replace itself on Windows
     if sys.platform == "win32":
-        pip_path = venv_path / "Scripts" / "pip"
+        python_path = venv_path / "Scripts" / "python.exe"
     else:
-        pip_path = venv_path / "bin" / "pip"
+        python_path = venv_path / "bin" / "python"
+    pip = [str(python_path), "-m", "pip"]
+    
+    # Upgrade pip on its own so a failure here does not block the installs
+    if not run_command(pip + ["install", "--upgrade", "pip"], cwd=backend_dir):
+        print("Warning: Could not upgrade pip, continuing with the bundled version")
     
-    # Upgrade pip
-    print("Upgrading pip...")
-    run_command([str(pip_path), "install", "--upgrade", "pip"], cwd=backend_dir)
+    # One resolver pass over everything requested
+    pip_install = pip + ["install", "--disable-pip-version-check", "--no-input", "-r", "requirements-core.txt"]
+    if install_optional:
+        print("Installing core and optional dependencies...")
+        if run_command(pip_install + ["-r", "requirements-optional.txt"], cwd=backend_dir, capture=False, prefix=prefix):
+            print("✓ Backend setup complete!")
+            return True
+        
+        # A failed optional package only costs the optional features
+        print("Warning: Some optional dependencies failed to install")
+        print("The app will still work but some features may be unavailable")
     
-    # Install core requirements
     print("Installing core dependencies...")
-    if not run_command([str(pip_path), "install", "-r", "requirements-core.txt"], cwd=backend_dir):
+    if not run_command(pip_install, cwd=backend_dir, capture=False, prefix=prefix):
         print("Failed to install core dependencies!")
         return False
     
-    # Install optional requirements if requested
-    if install_optional:
-        print("Installing optional dependencies...")
-        if not run_command([str(pip_path), "install", "-r", "requirements-optional.txt"], cwd=backend_dir):
-            print("Warning: Some optional dependencies failed to install")
-            print("The app will still work but some features may be unavailable")
-    
     print("✓ Backend setup complete!")
     return True
 
 
-def setup_frontend():
-    """Setup frontend dependencies"""
+def setup_frontend(prefix=""):
+    """Setup frontend dependencies, streaming npm output with each line tagged with prefix"""
     print("\n=== Setting up Frontend ===")
     
     frontend_dir = Path(__file__).parent / "frontend"
@@ -71,7 +116,7 @@ def setup_frontend():
     
     # Install dependencies
     print("Installing frontend dependencies...")
-    if not run_command(["npm", "install"], cwd=frontend_dir):
+    if not run_command(["npm", "install"], cwd=frontend_dir, capture=False, prefix=prefix):
         return False
     
     print("✓ Frontend setup complete!")
@@ -82,37 +127,17 @@ def create_env_files():
     """Create example environment files"""
     print("\n=== Creating Environment Files ===")
     
-    # Backend .env
-    backend_env = Path(__file__).parent / "backend" / ".env.example"
-    backend_env.write_text("""# Backend Environment Variables
-
-# AI Model API Keys (at least one required)
-ANTHROPIC_API_KEY=your_anthropic_api_key_here
-# OPENAI_API_KEY=your_openai_api_key_here
-
-# Model Provider (anthropic or openai)
-MODEL_PROVIDER=anthropic
-
-# Supadata API Key for YouTube transcripts
-SUPADATA_API_KEY=your_supadata_key_here
-
-# Optional: Redis URL for session storage
-# REDIS_URL=redis://localhost:6379
-
-# Optional: Vector Database Keys
-# PINECONE_API_KEY=your_pinecone_key_here
-# PINECONE_ENV=us-east-1
-""")
-    print(f"✓ Created {backend_env}")
-    
-    # Frontend .env.local
-    frontend_env = Path(__file__).parent / "frontend" / ".env.local.example"
-    frontend_env.write_text("""# Frontend Environment Variables
-
-# Backend API URL
-NEXT_PUBLIC_API_URL=http://localhost:8000
-""")
-    print(f"✓ Created {frontend_env}")
+    root = Path(__file__).parent
+    for path, template in [
+        (root / "backend" / ".env.example", BACKEND_ENV_TEMPLATE),
+        (root / "frontend" / ".env.local.example", FRONTEND_ENV_TEMPLATE)
+    ]:
+        # Leave files that are already up to date untouched
+        if path.exists() and path.read_bytes() == template.encode("utf-8"):
+            print(f"✓ {path} is up to date")
+            continue
+        path.write_text(template, encoding="utf-8", newline="\n")
+        print(f"✓ Created {path}")
     
     print("\nIMPORTANT: Copy the .env.example files to .env and add your API keys!")
     return True
@@ -132,16 +157,14 @@ def main():
         print("Installing core dependencies only...")
         print("Use '--with-optional' to install all features")
     
-    # Setup steps
-    success = True
-    
-    # Backend setup
-    if not setup_backend(install_optional):
-        success = False
-    
-    # Frontend setup
-    if not setup_frontend():
-        success = False
+    # Backend and frontend installs are independent - run them side by side,
+    # streaming both with a per-installer tag on every line
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        steps = [
+            executor.submit(setup_backend, install_optional, prefix="[backend] "),
+            executor.submit(setup_frontend, prefix="[frontend] ")
+        ]
+        success = all([step.result() for step in as_completed(steps)])
     
     # Create env files
     create_env_files()
@@ -5,12 +5,15 @@ import json
 
 API_URL = "http://localhost:8000"
 
+# One keep-alive connection for all requests
+session = requests.Session()
+
 print("Testing Telly Chat API...")
 
 # Test 1: Health check
 print("\n1. Testing health endpoint...")
 try:
-    response = requests.get(f"{API_URL}/health")
+    response = session.get(f"{API_URL}/health")
     print(f"Status: {response.status_code}")
     print(f"Response: {response.json()}")
 except Exception as e:
@@ -19,7 +22,7 @@ except Exception as e:
 # Test 2: Root endpoint
 print("\n2. Testing root endpoint...")
 try:
-    response = requests.get(f"{API_URL}/")
+    response = session.get(f"{API_URL}/")
     print(f"Status: {response.status_code}")
     print(f"Response: {response.json()}")
 except Exception as e:
@@ -28,7 +31,7 @@ except Exception as e:
 # Test 3: Chat endpoint
 print("\n3. Testing chat endpoint...")
 try:
-    response = requests.post(
+    response = session.post(
         f"{API_URL}/chat",
         json={"message": "Hello, this is a test", "stream": False},
         headers={"Content-Type": "application/json"}
@@ -47,7 +50,7 @@ except Exception as e:
 print("\n4. Testing SSE endpoint...")
 try:
     # Just check if it connects
-    response = requests.get(
+    response = session.get(
         f"{API_URL}/chat/stream",
         params={"message": "test"},
         stream=True,
@@ -1,22 +1,29 @@
 #!/usr/bin/env python3
 """Test the direct transcript endpoint"""
 
+import re
 import requests
 import json
 
+# Body of the first fenced code block (the transcript)
+TRANSCRIPT_RE = re.compile(r'```\n(.*?)\n```', re.DOTALL)
+
 # Test URL
 test_url = "https://www.youtube.com/watch?v=dQw4w9WgXcQ"
 
 # API endpoint
 api_url = "http://localhost:8000/youtube/transcript"
 
+# One keep-alive connection for all requests
+session = requests.Session()
+
 print("Testing direct transcript endpoint...")
 print(f"URL: {test_url}")
 print("-" * 50)
 
 try:
     # Make request
-    response = requests.post(api_url, params={"url": test_url})
+    response = session.post(api_url, params={"url": test_url})
     
     print(f"Status Code: {response.status_code}")
     
@@ -36,8 +43,7 @@ try:
             if "### 📝 Full Transcript" in content:
                 print("\n✓ Found full transcript section")
                 # Extract transcript length
-                import re
-                transcript_match = re.search(r'```\n([\s\S]*?)\n```', content)
+                transcript_match = TRANSCRIPT_RE.search(content)
                 if transcript_match:
                     transcript = transcript_match.group(1)
                     print(f"✓ Full transcript length: {len(transcript)} characters")
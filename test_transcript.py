@@ -1,16 +1,28 @@
 #!/usr/bin/env python3
 """Test script to verify transcript display behavior"""
 
+import re
 import requests
 import json
 import time
 
+# Section headers and hidden markers checked in the streamed output
+TRANSCRIPT_MARKER = "### 📝 Transcript"
+ACTION_PLAN_MARKER = "### 📋 Action Plan"
+HIDDEN_MARKERS = ("TRANSCRIPT_FULL_START", "\u200b\u200b\u200b")
+MARKERS_RE = re.compile("|".join(
+    re.escape(marker) for marker in (TRANSCRIPT_MARKER, ACTION_PLAN_MARKER) + HIDDEN_MARKERS
+))
+
 # Test YouTube URL
 test_url = "https://www.youtube.com/watch?v=dQw4w9WgXcQ"
 
 # API endpoint
 api_url = "http://localhost:8000/chat/stream"
 
+# One keep-alive connection for all requests
+session = requests.Session()
+
 # Test message
 params = {
     "message": f"Please extract the transcript from this video: {test_url}",
@@ -24,34 +36,41 @@ print("-" * 50)
 
 try:
     # Make request
-    response = requests.get(api_url, params=params, stream=True)
+    response = session.get(api_url, params=params, stream=True)
     
-    # Process SSE stream
-    full_content = ""
+    # Process SSE stream; json.loads takes the bytes payload directly
+    content_parts = []
     for line in response.iter_lines():
-        if line:
-            line = line.decode('utf-8')
-            if line.startswith('data: '):
-                try:
-                    data = json.loads(line[6:])
-                    if 'content' in data:
-                        content = data['content']
-                        if isinstance(content, str):
-                            full_content += content
-                            print(content, end='', flush=True)
-                except json.JSONDecodeError:
-                    pass
+        if line.startswith(b'data: '):
+            try:
+                data = json.loads(line[6:])
+                if 'content' in data:
+                    content = data['content']
+                    if isinstance(content, str):
+                        content_parts.append(content)
+                        print(content, end='', flush=True)
+            except json.JSONDecodeError:
+                pass
+    full_content = "".join(content_parts)
     
     print("\n" + "-" * 50)
     print("\nChecking for duplicate transcript sections...")
     
+    # Find every marker in one scan
+    hits = {}
+    for match in MARKERS_RE.finditer(full_content):
+        hits.setdefault(match.group(), []).append(match)
+    
     # Check for duplicate transcript sections
-    transcript_count = full_content.count("### 📝 Transcript")
-    print(f"Number of '### 📝 Transcript' sections: {transcript_count}")
+    transcript_count = len(hits.get(TRANSCRIPT_MARKER, []))
+    print(f"Number of '{TRANSCRIPT_MARKER}' sections: {transcript_count}")
     
     # Check for unformatted transcript after action plan
-    if "### 📋 Action Plan" in full_content:
-        after_action_plan = full_content.split("### 📋 Action Plan")[1]
+    action_plans = hits.get(ACTION_PLAN_MARKER)
+    if action_plans:
+        # Text up to the next action plan header, if any
+        end = action_plans[1].start() if len(action_plans) > 1 else len(full_content)
+        after_action_plan = full_content[action_plans[0].end():end]
         # Look for signs of unformatted transcript
         if len(after_action_plan) > 5000 and "```" not in after_action_plan[:1000]:
             print("WARNING: Found large unformatted text after action plan!")
@@ -59,7 +78,7 @@ try:
             print("✓ No unformatted transcript found after action plan")
     
     # Check for hidden transcript markers
-    if "TRANSCRIPT_FULL_START" in full_content or "​​​" in full_content:
+    if any(marker in hits for marker in HIDDEN_MARKERS):
         print("WARNING: Found hidden transcript markers in output!")
     else:
         print("✓ No hidden transcript markers found")